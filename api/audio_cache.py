@@ -0,0 +1,99 @@
+import os
+import threading
+from collections import OrderedDict
+try:
+    from .cache import DEFAULT_CACHE_DIR, make_key
+except ImportError:
+    from cache import DEFAULT_CACHE_DIR, make_key
+
+# Content-addressed cache for synthesized speech.
+# Greetings, error prompts and common answers are otherwise re-synthesized on
+# every call. Audio lives in one file per (text, language, speaker, model) key;
+# the least recently used files are evicted once the byte budget is exceeded.
+
+class AudioCache:
+    def __init__(self, directory=None, max_bytes=256 * 1024 * 1024):
+        self.directory = directory or os.path.join(DEFAULT_CACHE_DIR, "tts")
+        self.max_bytes = max_bytes
+        self._index = OrderedDict()  # key -> size in bytes, least recently used first
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._load()
+
+    @staticmethod
+    def key(text, language, speaker, model):
+        return make_key(text.strip(), language, speaker, model)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.audio")
+
+    def _load(self):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            entries = []
+            for name in os.listdir(self.directory):
+                if name.endswith(".audio"):
+                    stat = os.stat(os.path.join(self.directory, name))
+                    entries.append((stat.st_mtime, name[:-len(".audio")], stat.st_size))
+            for _, key, size in sorted(entries):
+                self._index[key] = size
+                self._bytes += size
+        except Exception as e:
+            print(f"TTS cache load error: {e}")
+
+    def get(self, key):
+        """Returns the cached audio bytes, or None."""
+        with self._lock:
+            if key in self._index:
+                try:
+                    with open(self._path(key), "rb") as f:
+                        data = f.read()
+                    os.utime(self._path(key))  # mtime doubles as LRU order across restarts
+                    self._index.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return data
+                except FileNotFoundError:
+                    # Evicted by another worker process sharing the directory
+                    self._bytes -= self._index.pop(key)
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, key, data):
+        if not data or len(data) > self.max_bytes:
+            return
+        with self._lock:
+            try:
+                tmp_path = self._path(key) + f".{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, self._path(key))
+            except Exception as e:
+                print(f"TTS cache write error: {e}")
+                return
+            self._bytes -= self._index.pop(key, 0)
+            self._index[key] = len(data)
+            self._bytes += len(data)
+            self._counters["writes"] += 1
+            while self._bytes > self.max_bytes and self._index:
+                old_key, size = self._index.popitem(last=False)
+                self._bytes -= size
+                self._counters["evictions"] += 1
+                try:
+                    os.remove(self._path(old_key))
+                except FileNotFoundError:
+                    pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._index),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                **self._counters,
+            }
+
+tts_cache = AudioCache(
+    directory=os.getenv("TTS_CACHE_DIR"),
+    max_bytes=int(os.getenv("TTS_CACHE_MAX_BYTES", str(256 * 1024 * 1024))),
+)
@@ -0,0 +1,202 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import tempfile
+import threading
+import unicodedata
+from collections import OrderedDict
+
+# Two-tier (in-process LRU -> on-disk SQLite) cache for JSON-serializable values.
+# The cache is called from async handlers, so disk work per call is kept small:
+# the entry count is tracked instead of counted, eviction runs in batches once
+# the table overflows by EVICTION_SLACK, and access times of disk hits are
+# buffered and written with the next write (or every ACCESS_FLUSH_* hits/seconds).
+
+EVICTION_SLACK = 0.05
+ACCESS_FLUSH_ENTRIES = 256
+ACCESS_FLUSH_SECONDS = 30.0
+
+DEFAULT_CACHE_DIR = os.getenv("SATYA_CACHE_DIR", os.path.join(tempfile.gettempdir(), "satya_cache"))
+
+def normalize_text(text):
+    """
+    Folds a claim so trivially different copies share a key:
+    Unicode NFKC, case-folded, punctuation dropped, whitespace collapsed.
+    """
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    folded = "".join(
+        " " if ch.isspace() or unicodedata.category(ch)[0] in ("P", "Z") else ch
+        for ch in text
+    )
+    return " ".join(folded.split())
+
+def make_key(*parts):
+    """Stable SHA-256 key over the given string parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+def claim_key(text, language):
+    return make_key(normalize_text(text), (language or "en").lower())
+
+class TwoTierCache:
+    def __init__(self, name, path=None, ttl_seconds=7 * 24 * 3600, max_memory_entries=1024, max_disk_entries=100000):
+        self.name = name
+        self.path = path or os.path.join(DEFAULT_CACHE_DIR, f"{name}.sqlite3")
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_count = 0
+        self._pending_access = {}  # key -> access time not yet written to disk
+        self._access_flushed = time.time()
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "evictions": 0,
+            "expired": 0,
+            "purged": 0,
+        }
+
+        self._db = None
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+            self._db.commit()
+            (self._disk_count,) = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()
+        except Exception as e:
+            # Fall back to memory-only caching (e.g. read-only filesystem)
+            print(f"Cache '{name}' disk tier disabled: {e}")
+            self._db = None
+
+    def _expired(self, created, now):
+        return self.ttl_seconds is not None and now - created > self.ttl_seconds
+
+    def _remember(self, key, created, value):
+        self._memory[key] = (created, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, value = entry
+                if not self._expired(created, now):
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return value
+                self._memory.pop(key, None)
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value_json, created = row
+                    if self._expired(created, now):
+                        self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                        self._db.commit()
+                        self._pending_access.pop(key, None)
+                        self._disk_count -= 1
+                        self._counters["expired"] += 1
+                    else:
+                        self._pending_access[key] = now
+                        if len(self._pending_access) >= ACCESS_FLUSH_ENTRIES \
+                                or now - self._access_flushed > ACCESS_FLUSH_SECONDS:
+                            self._flush_access(now)
+                            self._db.commit()
+                        value = json.loads(value_json)
+                        self._remember(key, created, value)
+                        self._counters["disk_hits"] += 1
+                        return value
+
+            self._counters["misses"] += 1
+            return None
+
+    def _flush_access(self, now):
+        """Writes buffered access times (LRU order for eviction); the caller commits."""
+        if self._pending_access:
+            self._db.executemany(
+                "UPDATE entries SET accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._pending_access.items()],
+            )
+            self._pending_access.clear()
+        self._access_flushed = now
+
+    def _evict(self):
+        """Trims the table to max_disk_entries once it overflows by the slack; the caller commits."""
+        if self._disk_count <= self.max_disk_entries * (1 + EVICTION_SLACK):
+            return
+        # The tracked count drifts when other processes share the file; resync before trimming
+        (self._disk_count,) = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()
+        overflow = self._disk_count - self.max_disk_entries
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY accessed ASC LIMIT ?)",
+                (overflow,),
+            )
+            self._disk_count -= overflow
+            self._counters["evictions"] += overflow
+
+    def set(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, value)
+            self._counters["sets"] += 1
+            if self._db is None:
+                return
+            self._pending_access.pop(key, None)
+            self._flush_access(now)
+            exists = self._db.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone() is not None
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            if not exists:
+                self._disk_count += 1
+            self._evict()
+            self._db.commit()
+
+    def delete(self, key):
+        """Purges a single entry from both tiers. Returns True if anything was removed."""
+        with self._lock:
+            removed = self._memory.pop(key, None) is not None
+            if self._db is not None:
+                self._pending_access.pop(key, None)
+                cursor = self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._db.commit()
+                self._disk_count -= cursor.rowcount
+                removed = removed or cursor.rowcount > 0
+            if removed:
+                self._counters["purged"] += 1
+            return removed
+
+    def stats(self):
+        with self._lock:
+            disk_entries = self._disk_count if self._db is not None else None
+            hits = self._counters["memory_hits"] + self._counters["disk_hits"]
+            lookups = hits + self._counters["misses"]
+            return {
+                "name": self.name,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                **self._counters,
+            }
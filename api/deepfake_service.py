@@ -0,0 +1,88 @@
+import os
+import time
+import threading
+
+# One DeepfakeDetector per process, created on first use.
+# EfficientNet-B4 + MTCNN are loaded once and shared by every route; loading
+# is guarded by a lock so concurrent first requests do not build two models.
+# A warm-up inference right after loading pays the first-call allocation
+# costs so the first real request does not. Nothing heavy (torch, cv2,
+# facenet_pytorch, numpy) is imported until the detector is first needed.
+
+DEEPFAKE_WARMUP = os.getenv("DEEPFAKE_WARMUP", "1") == "1"
+# Load in the background at startup instead of on the first request (long-lived servers)
+DEEPFAKE_PRELOAD = os.getenv("DEEPFAKE_PRELOAD", "0") == "1"
+# After a failed load, further attempts are refused for this long
+DEEPFAKE_RETRY_SECONDS = float(os.getenv("DEEPFAKE_RETRY_SECONDS", "60"))
+
+_lock = threading.Lock()
+_detector = None
+_state = {
+    "status": "cold",  # cold -> loading -> warming -> ready | failed
+    "error": None,
+    "load_ms": None,
+    "warmup_ms": None,
+    "ready_at": None,
+    "failed_at": None,
+}
+
+def _import_detector():
+    try:
+        from .deepfake_detection import DeepfakeDetector
+    except ImportError:
+        try:
+            from deepfake_detection import DeepfakeDetector
+        except ImportError:
+            # Last ditch effort for some local setups where CWD is root
+            from api.deepfake_detection import DeepfakeDetector
+    return DeepfakeDetector
+
+def warmup(detector):
+    """Runs face detection and scoring once on synthetic input to allocate buffers and pick kernels."""
+    import numpy as np
+    frame = np.zeros((360, 640, 3), dtype=np.uint8)
+    detector.detect_faces([frame])
+    face = np.random.default_rng(0).integers(0, 255, (160, 160, 3), dtype=np.uint8)
+    detector.score_faces([face])
+
+def get_detector():
+    """Returns the shared detector, loading and warming it on first call. Raises RuntimeError if unavailable."""
+    global _detector
+    if _detector is not None:
+        return _detector
+    with _lock:
+        if _detector is not None:
+            return _detector
+        if _state["status"] == "failed" and time.time() - _state["failed_at"] < DEEPFAKE_RETRY_SECONDS:
+            raise RuntimeError(f"Deepfake Detector not initialized: {_state['error']}")
+        try:
+            _state.update(status="loading", error=None)
+            start = time.perf_counter()
+            detector = _import_detector()()
+            _state["load_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            if DEEPFAKE_WARMUP:
+                _state["status"] = "warming"
+                start = time.perf_counter()
+                warmup(detector)
+                _state["warmup_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        except Exception as e:
+            print(f"Failed to load DeepfakeDetector: {e}")
+            _state.update(status="failed", error=str(e), failed_at=time.time())
+            raise RuntimeError(f"Deepfake Detector not initialized: {e}")
+        _detector = detector
+        _state.update(status="ready", ready_at=time.time())
+        return _detector
+
+def start_background_load():
+    """Loads the detector in a daemon thread (e.g. on a warm-up ping) without blocking the caller."""
+    if _detector is None and not _lock.locked():
+        threading.Thread(target=_load_quietly, daemon=True).start()
+
+def _load_quietly():
+    try:
+        get_detector()
+    except RuntimeError:
+        pass
+
+def readiness():
+    return {"ready": _detector is not None, **_state}
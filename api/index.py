@@ -1,36 +1,65 @@
 import os
 import json
+import hmac
 import typing
 import typing
-import tempfile
 import base64
 import io
-from fastapi import FastAPI, HTTPException, File, UploadFile
-from fastapi.responses import JSONResponse
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, File, UploadFile, Header
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from gtts import gTTS
 from pydantic import BaseModel
 from typing import List, Optional
 import google.generativeai as genai
 from dotenv import load_dotenv
-import httpx
-try:
-    from .deepfake_detection import DeepfakeDetector
-except ImportError:
-    try:
-        from deepfake_detection import DeepfakeDetector
-    except ImportError:
-        try:
-             # Last ditch effort for some local setups where CWD is root
-             from api.deepfake_detection import DeepfakeDetector
-        except ImportError:
-            print("CRITICAL: DeepfakeDetector Module NOT FOUND. Deepfake features will fail.")
-            DeepfakeDetector = None
-import shutil
 
-load_dotenv() # Load environment variables from .env file
+load_dotenv() # Load environment variables from .env file (before the app modules, which read settings at import)
 
-app = FastAPI(title="Bhartiya-Election AI Backend")
+try:
+    from .cache import TwoTierCache, claim_key, make_key, normalize_text
+    from .rumor_index import RumorIndex
+    from .singleflight import SingleFlight
+    from .sse import SSE_HEADERS, sse_event, JsonFieldStream
+    from . import sarvam
+    from . import deepfake_service
+    from .video_index import VideoFingerprintIndex, video_fingerprint
+    from .deepfake_profiles import PROFILES, DEFAULT_PROFILE, DETECTOR_VERSION, get_profile
+    from .audio_cache import AudioCache, tts_cache
+    from .uploads import save_upload, read_upload, upload_suffix, UploadLimitMiddleware, MAX_AUDIO_UPLOAD_BYTES, MAX_VIDEO_UPLOAD_BYTES, MAX_IMAGE_UPLOAD_BYTES
+    from .voice_pipeline import sentences_from, synthesize_in_order
+except ImportError:
+    from cache import TwoTierCache, claim_key, make_key, normalize_text
+    from rumor_index import RumorIndex
+    from singleflight import SingleFlight
+    from sse import SSE_HEADERS, sse_event, JsonFieldStream
+    import sarvam
+    import deepfake_service
+    from video_index import VideoFingerprintIndex, video_fingerprint
+    from deepfake_profiles import PROFILES, DEFAULT_PROFILE, DETECTOR_VERSION, get_profile
+    from audio_cache import AudioCache, tts_cache
+    from uploads import save_upload, read_upload, upload_suffix, UploadLimitMiddleware, MAX_AUDIO_UPLOAD_BYTES, MAX_VIDEO_UPLOAD_BYTES, MAX_IMAGE_UPLOAD_BYTES
+    from voice_pipeline import sentences_from, synthesize_in_order
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if deepfake_service.DEEPFAKE_PRELOAD:
+        deepfake_service.start_background_load()
+    yield
+    await sarvam.close_client()
+
+app = FastAPI(title="Bhartiya-Election AI Backend", lifespan=lifespan)
+
+# Reject oversized media uploads by Content-Length before the body is read
+# (added before CORS so the 413 still carries CORS headers)
+app.add_middleware(UploadLimitMiddleware, limits={
+    "/chat-audio": MAX_AUDIO_UPLOAD_BYTES,
+    "/detect-deepfake": MAX_VIDEO_UPLOAD_BYTES,
+    "/detect-deepfake/fingerprints": MAX_VIDEO_UPLOAD_BYTES,
+    "/detect-deepfake-image": MAX_IMAGE_UPLOAD_BYTES,
+})
 
 # Enable CORS for frontend integration
 app.add_middleware(
@@ -60,6 +89,23 @@ class AnalyzeResponse(BaseModel):
     originalText: str
     explanation: Explanation
     contextLinks: List[ContextLink]
+    # Set when the verdict was served from the near-duplicate rumor index
+    matchedClaim: Optional[str] = None
+    similarity: Optional[float] = None
+
+class BatchAnalyzeRequest(BaseModel):
+    items: List[AnalyzeRequest]
+    concurrency: Optional[int] = None
+    stream: bool = False
+
+class BatchAnalyzeItem(BaseModel):
+    index: int
+    result: Optional[AnalyzeResponse] = None
+    error: Optional[str] = None
+    cached: bool = False
+
+class BatchAnalyzeResponse(BaseModel):
+    results: List[BatchAnalyzeItem]
 
 # --- Gemini Configuration ---
 API_KEY = os.getenv("GEMINI_API_KEY")
@@ -125,13 +171,76 @@ chat_model = genai.GenerativeModel(
     """
 )
 
-# Initialize Deepfake Detector (Lazy load to save startup time if needed, but here we do eager)
-deepfake_detector = None
-if DeepfakeDetector:
-    try:
-        deepfake_detector = DeepfakeDetector()
-    except Exception as e:
-        print(f"Failed to load DeepfakeDetector: {e}")
+# --- Verdict Cache (LRU in front of SQLite) ---
+verdict_cache = TwoTierCache(
+    "verdicts",
+    path=os.getenv("VERDICT_CACHE_PATH"),
+    ttl_seconds=float(os.getenv("VERDICT_CACHE_TTL_SECONDS", 7 * 24 * 3600)),
+    max_memory_entries=int(os.getenv("VERDICT_CACHE_MEMORY_ENTRIES", "2048")),
+    max_disk_entries=int(os.getenv("VERDICT_CACHE_DISK_ENTRIES", "200000")),
+)
+
+# Near-duplicate index over previously verified claims
+rumor_index = RumorIndex(
+    path=os.getenv("RUMOR_INDEX_PATH"),
+    threshold=float(os.getenv("RUMOR_MATCH_THRESHOLD", "0.8")),
+    max_entries=int(os.getenv("RUMOR_INDEX_MAX_ENTRIES", "50000")),
+)
+
+# Identical in-flight requests share one upstream LLM call
+verdict_flight = SingleFlight("analyze")
+constitutional_flight = SingleFlight("chat-constitutional")
+
+# Batch fact-checking limits
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "500"))
+BATCH_DEFAULT_CONCURRENCY = int(os.getenv("BATCH_DEFAULT_CONCURRENCY", "8"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "32"))
+
+# Shared secret for the cache/index administration endpoints; unset disables them
+CACHE_ADMIN_TOKEN = os.getenv("CACHE_ADMIN_TOKEN")
+
+def require_admin(token: Optional[str]):
+    """Fails closed: without a configured CACHE_ADMIN_TOKEN every admin request is refused."""
+    if not CACHE_ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (CACHE_ADMIN_TOKEN not set).")
+    if not hmac.compare_digest((token or "").encode(), CACHE_ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token.")
+
+# The deepfake model is loaded lazily, once per process, by deepfake_service
+
+# --- Deepfake Result Cache (keyed by the SHA-256 of the uploaded bytes) ---
+# Re-uploads of the same clip skip decoding and inference entirely
+deepfake_result_cache = TwoTierCache(
+    "deepfake_results",
+    path=os.getenv("DEEPFAKE_RESULT_CACHE_PATH"),
+    ttl_seconds=float(os.getenv("DEEPFAKE_RESULT_CACHE_TTL_SECONDS", 30 * 24 * 3600)),
+    max_memory_entries=int(os.getenv("DEEPFAKE_RESULT_CACHE_MEMORY_ENTRIES", "256")),
+    max_disk_entries=int(os.getenv("DEEPFAKE_RESULT_CACHE_DISK_ENTRIES", "20000")),
+)
+
+def deepfake_result_key(sha256, profile, kind="deepfake"):
+    """
+    Changing the detector version or the profile's settings yields new keys.
+    kind keeps the video and still-image routes apart for the same bytes.
+    """
+    return make_key(kind, DETECTOR_VERSION, profile, json.dumps(PROFILES[profile], sort_keys=True), sha256)
+
+# Perceptual fingerprints of analyzed clips and known deepfakes; catches
+# re-encoded copies whose bytes (and so SHA-256) differ
+video_index = VideoFingerprintIndex(
+    path=os.getenv("VIDEO_INDEX_PATH"),
+    max_distance=int(os.getenv("VIDEO_MATCH_MAX_DISTANCE", "10")),
+    threshold=float(os.getenv("VIDEO_MATCH_THRESHOLD", "0.6")),
+    max_entries=int(os.getenv("VIDEO_INDEX_MAX_ENTRIES", "5000")),
+    version=DETECTOR_VERSION,
+)
+
+def match_result(entry, similarity):
+    """The stored result of a perceptually matching clip, annotated with that reference."""
+    return {
+        **entry["result"],
+        "match": {"reference": entry["key"], "label": entry["label"], "note": entry["note"], "similarity": similarity},
+    }
 
 @app.get("/api")
 def read_root():
@@ -141,70 +250,283 @@ def read_root():
 def read_root_slash():
     return {"message": "Bhartiya-Election AI Backend is running"}
 
+def lookup_verdict(query_text: str, language: Optional[str]) -> Optional[AnalyzeResponse]:
+    """Serves a claim from the verdict cache or the near-duplicate index, if possible."""
+    cached = verdict_cache.get(claim_key(query_text, language))
+    if cached is not None:
+        return AnalyzeResponse(**{**cached, "originalText": query_text})
+
+    match = rumor_index.query(query_text, language)
+    if match is not None:
+        entry, score = match
+        print(f"Near-duplicate of: {entry['text']} ({score})")
+        return AnalyzeResponse(**{
+            **entry["response"],
+            "originalText": query_text,
+            "matchedClaim": entry["text"],
+            "similarity": score,
+        })
+    return None
+
+async def fetch_verdict(query_text: str, language: Optional[str]) -> AnalyzeResponse:
+    """Asks Gemini for a fresh verdict and stores it. Raises on upstream failure."""
+    # Prompting Gemini
+    # Note: Gemini 1.5 Flash has built-in grounding (browsing) capabilities if enabled, 
+    # but for API consistency we rely on the model's knowledge or tool use if we configured tools.
+    # For this prototype, we rely on the model's internal knowledge which is vast.
+    
+    response = await model.generate_content_async(f"Verify this claim: '{query_text}'")
+    
+    # Parse output
+    response_text = response.text
+    # Clean up code blocks if model adds them despite mime_type
+    if response_text.startswith("```json"):
+        response_text = response_text[7:-3]
+    elif response_text.startswith("```"):
+         response_text = response_text[3:-3]
+        
+    data = json.loads(response_text)
+    
+    result = build_verdict(query_text, data)
+    store_verdict(query_text, language, result)
+    return result
+
+def build_verdict(query_text: str, data: dict) -> AnalyzeResponse:
+    # Hydrate response object
+    return AnalyzeResponse(
+        isFake=data.get("isFake", False),
+        confidence=data.get("confidence", 0.0),
+        originalText=query_text,
+        explanation=Explanation(
+            highlightedWords=data.get("explanation", {}).get("highlightedWords", []),
+            reason=data.get("explanation", {}).get("reason", "No explanation provided.")
+        ),
+        contextLinks=[
+            ContextLink(
+                title=link.get("title", "Source"),
+                excerpt=link.get("excerpt", ""),
+                url=link.get("url", "#")
+            ) for link in data.get("contextLinks", [])
+        ]
+    )
+
+def store_verdict(query_text: str, language: Optional[str], result: AnalyzeResponse):
+    verdict_cache.set(claim_key(query_text, language), result.model_dump())
+    rumor_index.add(query_text, language, result.model_dump())
+
+async def stream_text(response):
+    """Yields the text of each chunk of a streamed Gemini response."""
+    async for chunk in response:
+        try:
+            text = chunk.text
+        except ValueError:
+            # Chunks without parts (e.g. the final finish_reason chunk) have no text
+            continue
+        if text:
+            yield text
+
+def fallback_verdict(query_text: str) -> AnalyzeResponse:
+    return AnalyzeResponse(
+        isFake=False,
+        confidence=0.0,
+        originalText=query_text,
+        explanation=Explanation(highlightedWords=[], reason="Error connecting to AI verification service."),
+        contextLinks=[]
+    )
+
 @app.post("/analyze", response_model=AnalyzeResponse)
 async def analyze_rumor(request: AnalyzeRequest):
     query_text = request.text
     print(f"Analyzing with Gemini: {query_text}")
 
+    cached = lookup_verdict(query_text, request.language)
+    if cached is not None:
+        return cached
+
     if not API_KEY:
          raise HTTPException(status_code=500, detail="Server Error: Gemini API Key not configured.")
 
     try:
-        # Prompting Gemini
-        # Note: Gemini 1.5 Flash has built-in grounding (browsing) capabilities if enabled, 
-        # but for API consistency we rely on the model's knowledge or tool use if we configured tools.
-        # For this prototype, we rely on the model's internal knowledge which is vast.
-        
-        response = model.generate_content(f"Verify this claim: '{query_text}'")
-        
-        # Parse output
-        response_text = response.text
-        # Clean up code blocks if model adds them despite mime_type
-        if response_text.startswith("```json"):
-            response_text = response_text[7:-3]
-        elif response_text.startswith("```"):
-             response_text = response_text[3:-3]
-            
-        data = json.loads(response_text)
-        
-        # Hydrate response object
-        return AnalyzeResponse(
-            isFake=data.get("isFake", False),
-            confidence=data.get("confidence", 0.0),
-            originalText=query_text,
-            explanation=Explanation(
-                highlightedWords=data.get("explanation", {}).get("highlightedWords", []),
-                reason=data.get("explanation", {}).get("reason", "No explanation provided.")
-            ),
-            contextLinks=[
-                ContextLink(
-                    title=link.get("title", "Source"),
-                    excerpt=link.get("excerpt", ""),
-                    url=link.get("url", "#")
-                ) for link in data.get("contextLinks", [])
-            ]
+        result = await verdict_flight.do(
+            claim_key(query_text, request.language),
+            lambda: fetch_verdict(query_text, request.language),
         )
-
+        return result.model_copy(update={"originalText": query_text})
     except Exception as e:
         print(f"Gemini Error: {e}")
         # Graceful fallback
-        return AnalyzeResponse(
-            isFake=False,
-            confidence=0.0,
-            originalText=query_text,
-            explanation=Explanation(highlightedWords=[], reason="Error connecting to AI verification service."),
-            contextLinks=[]
-        )
+        return fallback_verdict(query_text)
+
+REQUIRED_VERDICT_FIELDS = ("isFake", "confidence", "explanation")
+
+def verdict_events(key: str, fields: dict):
+    """Maps a completed top-level field of the verdict JSON to the SSE events it unlocks."""
+    if key in ("isFake", "confidence") and "isFake" in fields and "confidence" in fields:
+        yield sse_event("verdict", {"isFake": fields["isFake"], "confidence": fields["confidence"]})
+    elif key == "explanation":
+        yield sse_event("explanation", fields["explanation"])
+    elif key == "contextLinks":
+        yield sse_event("links", fields["contextLinks"])
+
+@app.post("/analyze/stream")
+async def analyze_rumor_stream(request: AnalyzeRequest):
+    """
+    Server-Sent Events variant of /analyze.
+    Emits `verdict`, `explanation` and `links` as soon as the model has produced
+    each field, then a final `result` event carrying the usual AnalyzeResponse.
+    """
+    query_text = request.text
+    print(f"Analyzing with Gemini (stream): {query_text}")
+
+    async def events():
+        cached = lookup_verdict(query_text, request.language)
+        if cached is not None:
+            data = cached.model_dump()
+            for key in ("confidence", "explanation", "contextLinks"):
+                for event in verdict_events(key, data):
+                    yield event
+            yield sse_event("result", data)
+            return
+
+        if not API_KEY:
+            yield sse_event("error", {"detail": "Server Error: Gemini API Key not configured."})
+            return
+
+        try:
+            response = await model.generate_content_async(f"Verify this claim: '{query_text}'", stream=True)
+            parser = JsonFieldStream()
+            async for text in stream_text(response):
+                for key, _ in parser.feed(text):
+                    for event in verdict_events(key, parser.fields):
+                        yield event
+
+            # A cut-off or unparseable stream must not be filled with defaults and cached
+            missing = [key for key in REQUIRED_VERDICT_FIELDS if key not in parser.fields]
+            if missing:
+                raise ValueError(f"Incomplete verdict stream, missing {', '.join(missing)}")
+            result = build_verdict(query_text, parser.fields)
+            store_verdict(query_text, request.language, result)
+            yield sse_event("result", result.model_dump())
+        except Exception as e:
+            print(f"Gemini Stream Error: {e}")
+            yield sse_event("error", {"detail": "Error connecting to AI verification service."})
+            yield sse_event("result", fallback_verdict(query_text).model_dump())
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@app.post("/analyze-batch")
+async def analyze_batch(request: BatchAnalyzeRequest):
+    """
+    Verifies many claims in one call.
+    Duplicate claims are verified once, cache hits are answered immediately and
+    the remaining claims fan out to the LLM under a concurrency limit.
+    With stream=true, items are written as NDJSON in completion order.
+    """
+    if len(request.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {BATCH_MAX_ITEMS} items).")
+
+    concurrency = max(1, min(request.concurrency or BATCH_DEFAULT_CONCURRENCY, BATCH_MAX_CONCURRENCY))
+    print(f"Batch Analyze: {len(request.items)} items (concurrency {concurrency})")
+
+    # Group item indices by normalized claim so each distinct claim is verified once
+    groups = {}
+    for index, item in enumerate(request.items):
+        groups.setdefault(claim_key(item.text, item.language), []).append(index)
+
+    def expand(indices, result=None, error=None, cached=False):
+        return [
+            BatchAnalyzeItem(
+                index=i,
+                result=result.model_copy(update={"originalText": request.items[i].text}) if result else None,
+                error=error,
+                cached=cached,
+            )
+            for i in indices
+        ]
+
+    immediate, pending = [], []
+    for indices in groups.values():
+        first = request.items[indices[0]]
+        cached = lookup_verdict(first.text, first.language)
+        if cached is not None:
+            immediate.extend(expand(indices, result=cached, cached=True))
+        else:
+            pending.append(indices)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def verify(indices):
+        first = request.items[indices[0]]
+        if not API_KEY:
+            return expand(indices, error="Gemini API Key not configured.")
+        async with semaphore:
+            try:
+                result = await verdict_flight.do(
+                    claim_key(first.text, first.language),
+                    lambda: fetch_verdict(first.text, first.language),
+                )
+                return expand(indices, result=result)
+            except Exception as e:
+                print(f"Batch Gemini Error: {e}")
+                return expand(indices, error=str(e))
+
+    tasks = [asyncio.ensure_future(verify(indices)) for indices in pending]
+
+    if request.stream:
+        async def ndjson():
+            try:
+                for item in immediate:
+                    yield item.model_dump_json() + "\n"
+                for next_done in asyncio.as_completed(tasks):
+                    for item in await next_done:
+                        yield item.model_dump_json() + "\n"
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    results = list(immediate)
+    for items in await asyncio.gather(*tasks):
+        results.extend(items)
+    results.sort(key=lambda item: item.index)
+    return BatchAnalyzeResponse(results=results)
+
+@app.get("/analyze/cache/stats")
+def verdict_cache_stats():
+    return {"verdicts": verdict_cache.stats(), "rumor_index": rumor_index.stats()}
+
+@app.post("/analyze/cache/purge")
+def purge_verdict(request: AnalyzeRequest, x_admin_token: Optional[str] = Header(None)):
+    """Drops the cached verdict for a claim, e.g. after a fact-check correction."""
+    require_admin(x_admin_token)
+    purged = verdict_cache.delete(claim_key(request.text, request.language))
+    unindexed = rumor_index.remove(request.text, request.language)
+    return {"purged": purged or unindexed}
+
+@app.get("/coalescing/stats")
+def coalescing_stats():
+    return {"analyze": verdict_flight.stats(), "chat_constitutional": constitutional_flight.stats()}
+
+def _gtts_base64(text, lang):
+    """Blocking gTTS synthesis (served from the TTS audio cache when possible); always run via asyncio.to_thread."""
+    cache_key = AudioCache.key(text, lang, "default", "gtts")
+    audio = tts_cache.get(cache_key)
+    if audio is None:
+        from gtts import gTTS  # imported on first use to keep cold starts fast
+        tts = gTTS(text=text, lang=lang)
+        mp3_fp = io.BytesIO()
+        tts.write_to_fp(mp3_fp)
+        audio = mp3_fp.getvalue()
+        tts_cache.put(cache_key, audio)
+    return base64.b64encode(audio).decode("utf-8")
 
 @app.post("/chat-audio")
 async def chat_audio(file: UploadFile = File(...)):
     print(f"Received audio file: {file.filename}")
     
     # Save temp file
-    suffix = f".{file.filename.split('.')[-1]}" if "." in file.filename else ".wav"
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        tmp.write(await file.read())
-        tmp_path = tmp.name
+    tmp_path, _, _ = await save_upload(file, MAX_AUDIO_UPLOAD_BYTES, suffix=upload_suffix(file.filename, ".wav"))
 
     try:
         if not API_KEY:
@@ -212,11 +534,11 @@ async def chat_audio(file: UploadFile = File(...)):
 
         # Upload to Gemini
         print("Uploading audio to Gemini...")
-        gemini_file = genai.upload_file(tmp_path, mime_type=file.content_type or "audio/wav")
+        gemini_file = await asyncio.to_thread(genai.upload_file, tmp_path, mime_type=file.content_type or "audio/wav")
         
         # Generator
         print("Generating response...")
-        result = chat_model.generate_content(["Listen to this audio and respond appropriately.", gemini_file])
+        result = await chat_model.generate_content_async(["Listen to this audio and respond appropriately.", gemini_file])
         
         # Parse JSON
         response_text = result.text.strip()
@@ -233,35 +555,16 @@ async def chat_audio(file: UploadFile = File(...)):
         
         # Text to Speech via Sarvam AI
         try:
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "api-subscription-key": os.getenv("SARVAM_AI_API_KEY"),
-                    "Content-Type": "application/json"
-                }
-                payload = {
-                    "inputs": [text_resp],
-                    "target_language_code": lang + "-IN" if "-" not in lang else lang,
-                    "speaker": "anushka",
-                    "model": "bulbul:v2"
-                }
-                tts_res = await client.post("https://api.sarvam.ai/text-to-speech", headers=headers, json=payload)
-                if tts_res.status_code == 200:
-                    base64_audio = tts_res.json()["audios"][0]
-                else:
-                    print(f"Sarvam TTS Error: {tts_res.text}")
-                    # Keep gTTS as emergency fallback but log it
-                    tts = gTTS(text=text_resp, lang=lang)
-                    mp3_fp = io.BytesIO()
-                    tts.write_to_fp(mp3_fp)
-                    mp3_fp.seek(0)
-                    base64_audio = base64.b64encode(mp3_fp.read()).decode("utf-8")
+            base64_audio = await sarvam.text_to_speech(
+                text_resp, lang + "-IN" if "-" not in lang else lang
+            )
+        except sarvam.SarvamError as e:
+            print(f"Sarvam TTS Error: {e.text}")
+            # Keep gTTS as emergency fallback but log it
+            base64_audio = await asyncio.to_thread(_gtts_base64, text_resp, lang)
         except Exception as e:
              print(f"Sarvam Error: {e}")
-             tts = gTTS(text=text_resp, lang='hi') # Default to Hindi for fallback if possible
-             mp3_fp = io.BytesIO()
-             tts.write_to_fp(mp3_fp)
-             mp3_fp.seek(0)
-             base64_audio = base64.b64encode(mp3_fp.read()).decode("utf-8")
+             base64_audio = await asyncio.to_thread(_gtts_base64, text_resp, 'hi') # Default to Hindi for fallback if possible
         
         return {"text": text_resp, "audio": base64_audio}
 
@@ -277,25 +580,40 @@ async def chat_audio(file: UploadFile = File(...)):
 
 
 @app.post("/detect-deepfake")
-async def detect_deepfake(file: UploadFile = File(...)):
-    print(f"Deepfake Analysis Request: {file.filename}")
+async def detect_deepfake(file: UploadFile = File(...), profile: Optional[str] = None):
+    """profile: fast | balanced | thorough (query parameter); see /detect-deepfake/profiles."""
+    try:
+        profile = get_profile(profile)[0]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    print(f"Deepfake Analysis Request: {file.filename} (profile: {profile})")
     
-    suffix = f".{file.filename.split('.')[-1]}" if "." in file.filename else ".mp4"
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        tmp.write(await file.read())
-        tmp_path = tmp.name
+    tmp_path, sha256, _ = await save_upload(file, MAX_VIDEO_UPLOAD_BYTES, suffix=upload_suffix(file.filename, ".mp4"))
         
     try:
-        if not deepfake_detector:
-             raise HTTPException(status_code=500, detail="Deepfake Detector not initialized.")
-
-        result = deepfake_detector.detect(tmp_path)
+        cache_key = deepfake_result_key(sha256, profile)
+        result = deepfake_result_cache.get(cache_key)
+        if result is None:
+            # Re-encoded copies of a known clip are answered from the fingerprint index
+            fingerprint = await asyncio.to_thread(video_fingerprint, tmp_path)
+            match = await asyncio.to_thread(video_index.query, fingerprint)
+            if match is not None:
+                result = match_result(*match)
+            else:
+                # Off the event loop; serverless functions cannot host a process pool
+                deepfake_detector = await asyncio.to_thread(deepfake_service.get_detector)
+                result = await asyncio.to_thread(deepfake_detector.detect, tmp_path, profile=profile)
+                if "error" not in result:
+                    video_index.add(sha256, fingerprint, result)
+            deepfake_result_cache.set(cache_key, result)
         
         if "error" in result:
              raise HTTPException(status_code=400, detail=result["error"])
              
         return result
 
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Deepfake Error: {e}")
         return JSONResponse(status_code=500, content={"detail": str(e)})
@@ -304,6 +622,31 @@ async def detect_deepfake(file: UploadFile = File(...)):
         if os.path.exists(tmp_path):
             os.remove(tmp_path)
 
+@app.post("/detect-deepfake-image")
+async def detect_deepfake_image(file: UploadFile = File(...), profile: Optional[str] = None):
+    """Still-image deepfake check; the upload is decoded in memory, never written to disk."""
+    try:
+        profile = get_profile(profile)[0]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    print(f"Deepfake Image Request: {file.filename} (profile: {profile})")
+
+    image_bytes, sha256 = await read_upload(file, MAX_IMAGE_UPLOAD_BYTES)
+    cache_key = deepfake_result_key(sha256, profile, kind="deepfake-image")
+    try:
+        result = deepfake_result_cache.get(cache_key)
+        if result is None:
+            deepfake_detector = await asyncio.to_thread(deepfake_service.get_detector)
+            result = await asyncio.to_thread(deepfake_detector.detect_image, image_bytes, profile=profile)
+            deepfake_result_cache.set(cache_key, result)
+    except Exception as e:
+        print(f"Deepfake Image Error: {e}")
+        return JSONResponse(status_code=500, content={"detail": str(e)})
+
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+    return result
+
 # --- Constitutional Logic Layer ---
 
 class ConstitutionalRequest(BaseModel):
@@ -342,60 +685,106 @@ constitutional_model = genai.GenerativeModel(
     """
 )
 
-@app.post("/chat-constitutional", response_model=ConstitutionalResponse)
-async def chat_constitutional(request: ConstitutionalRequest):
-    # Map codes to full names for better AI prompting
-    LANG_MAP = {
-        'en': 'English',
-        'hi': 'Hindi',
-        'bn': 'Bengali',
-        'te': 'Telugu',
-        'ta': 'Tamil',
-        'mr': 'Marathi',
-        'gu': 'Gujarati',
-        'kn': 'Kannada',
-        'ml': 'Malayalam',
-        'pa': 'Punjabi',
-        'or': 'Odia',
-        'as': 'Assamese'
-    }
-    target_lang = LANG_MAP.get(request.language, request.language)
-    
-    print(f"Constitutional Query: {request.query} (Lang Code: {request.language} -> {target_lang})")
-    
-    prompt = f"Analyze this topic: '{request.query}'."
+# Map codes to full names for better AI prompting
+LANG_MAP = {
+    'en': 'English',
+    'hi': 'Hindi',
+    'bn': 'Bengali',
+    'te': 'Telugu',
+    'ta': 'Tamil',
+    'mr': 'Marathi',
+    'gu': 'Gujarati',
+    'kn': 'Kannada',
+    'ml': 'Malayalam',
+    'pa': 'Punjabi',
+    'or': 'Odia',
+    'as': 'Assamese'
+}
+
+def constitutional_prompt(query: str, target_lang: str) -> str:
+    prompt = f"Analyze this topic: '{query}'."
     if target_lang.lower() != "english":
          prompt += f" Target Language: {target_lang}. Force output in {target_lang}."
     else:
          prompt += " Respond in the same language as the query."
     
     prompt += " Output strict JSON."
+    return prompt
+
+async def fetch_constitutional(query: str, target_lang: str) -> ConstitutionalResponse:
+    response = await constitutional_model.generate_content_async(constitutional_prompt(query, target_lang))
+    
+    text = response.text.strip()
+    print(f"Raw AI Response: {text}")
+    if text.startswith("```json"): text = text[7:-3]
+    elif text.startswith("```"): text = text[3:-3]
+    
+    data = json.loads(text)
+    if isinstance(data, list):
+        data = data[0]
+    return build_constitutional(data)
+
+def build_constitutional(data: dict) -> ConstitutionalResponse:
+    return ConstitutionalResponse(
+        pro_argument=data.get("pro_argument", ""),
+        con_argument=data.get("con_argument", ""),
+        neutral_summation=data.get("neutral_summation", ""),
+        citations=data.get("citations", [])
+    )
+
+def fallback_constitutional() -> ConstitutionalResponse:
+    return ConstitutionalResponse(
+        pro_argument="Error generating analysis.",
+        con_argument="Error generating analysis.",
+        neutral_summation="Please try again.",
+        citations=[]
+    )
+
+@app.post("/chat-constitutional", response_model=ConstitutionalResponse)
+async def chat_constitutional(request: ConstitutionalRequest):
+    target_lang = LANG_MAP.get(request.language, request.language)
+    
+    print(f"Constitutional Query: {request.query} (Lang Code: {request.language} -> {target_lang})")
 
     try:
-        response = constitutional_model.generate_content(prompt)
-        
-        text = response.text.strip()
-        print(f"Raw AI Response: {text}")
-        if text.startswith("```json"): text = text[7:-3]
-        elif text.startswith("```"): text = text[3:-3]
-        
-        data = json.loads(text)
-        if isinstance(data, list):
-            data = data[0]
-        return ConstitutionalResponse(
-            pro_argument=data.get("pro_argument", ""),
-            con_argument=data.get("con_argument", ""),
-            neutral_summation=data.get("neutral_summation", ""),
-            citations=data.get("citations", [])
+        return await constitutional_flight.do(
+            make_key(normalize_text(request.query), target_lang),
+            lambda: fetch_constitutional(request.query, target_lang),
         )
     except Exception as e:
         print(f"Constitutional Error: {e}")
-        return ConstitutionalResponse(
-            pro_argument="Error generating analysis.",
-            con_argument="Error generating analysis.",
-            neutral_summation="Please try again.",
-            citations=[]
-        )
+        return fallback_constitutional()
+
+@app.post("/chat-constitutional/stream")
+async def chat_constitutional_stream(request: ConstitutionalRequest):
+    """
+    Server-Sent Events variant of /chat-constitutional.
+    Emits one event per field (pro_argument, con_argument, neutral_summation,
+    citations) as it completes, then a final `result` ConstitutionalResponse.
+    """
+    target_lang = LANG_MAP.get(request.language, request.language)
+    print(f"Constitutional Query (stream): {request.query} (Lang Code: {request.language} -> {target_lang})")
+
+    async def events():
+        try:
+            response = await constitutional_model.generate_content_async(
+                constitutional_prompt(request.query, target_lang), stream=True
+            )
+            parser = JsonFieldStream()
+            async for text in stream_text(response):
+                for key, value in parser.feed(text):
+                    if key in ConstitutionalResponse.model_fields:
+                        yield sse_event(key, value)
+
+            if not any(key in parser.fields for key in ConstitutionalResponse.model_fields):
+                raise ValueError("Unparseable constitutional stream")
+            yield sse_event("result", build_constitutional(parser.fields).model_dump())
+        except Exception as e:
+            print(f"Constitutional Stream Error: {e}")
+            yield sse_event("error", {"detail": "Error generating analysis."})
+            yield sse_event("result", fallback_constitutional().model_dump())
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
 
 # --- Translation Logic (BharatGen) ---
 
@@ -406,6 +795,15 @@ class TranslateRequest(BaseModel):
 class TranslateResponse(BaseModel):
     translated_text: str
 
+class TranslateBatchRequest(BaseModel):
+    texts: List[str]
+    target_language: str
+
+class TranslateBatchResponse(BaseModel):
+    translations: List[str]
+    cached: int
+    llm_calls: int
+
 translate_model = genai.GenerativeModel(
     model_name="gemini-2.0-flash",
     generation_config={"response_mime_type": "application/json"},
@@ -415,27 +813,138 @@ translate_model = genai.GenerativeModel(
     """
 )
 
+translate_batch_model = genai.GenerativeModel(
+    model_name="gemini-2.0-flash",
+    generation_config={"response_mime_type": "application/json"},
+    system_instruction="""You are 'BharatGen', India's sovereign AI translator.
+    You receive a JSON array of UI strings. Translate every string into the target Indian language accurately, preserving nuance, placeholders and punctuation.
+    Return JSON: { "translations": ["...", "..."] } with exactly one translation per input string, in the same order.
+    """
+)
+
+# Persistent translation memory: UI strings repeat on every page load, so each
+# (source text, target language) pair should only ever be translated once.
+translation_memory = TwoTierCache(
+    "translations",
+    path=os.getenv("TRANSLATION_MEMORY_PATH"),
+    ttl_seconds=float(os.getenv("TRANSLATION_MEMORY_TTL_SECONDS", 90 * 24 * 3600)),
+    max_memory_entries=int(os.getenv("TRANSLATION_MEMORY_ENTRIES", "20000")),
+    max_disk_entries=int(os.getenv("TRANSLATION_MEMORY_DISK_ENTRIES", "500000")),
+)
+
+# Limits for packing cache misses into one Gemini call
+TRANSLATE_BATCH_MAX_TEXTS = int(os.getenv("TRANSLATE_BATCH_MAX_TEXTS", "500"))
+TRANSLATE_CHUNK_MAX_ITEMS = int(os.getenv("TRANSLATE_CHUNK_MAX_ITEMS", "60"))
+TRANSLATE_CHUNK_MAX_CHARS = int(os.getenv("TRANSLATE_CHUNK_MAX_CHARS", "6000"))
+
+def is_english(target_language):
+    return target_language.lower() in ("en", "english")
+
+def translation_key(text, target_language):
+    return make_key(text, target_language.lower())
+
+def strip_json_fence(text):
+    text = text.strip()
+    if text.startswith("```json"): text = text[7:-3]
+    elif text.startswith("```"): text = text[3:-3]
+    return text
+
+def translation_chunks(texts):
+    """Splits texts into chunks bounded by item count and total characters."""
+    chunk, size = [], 0
+    for text in texts:
+        if chunk and (len(chunk) >= TRANSLATE_CHUNK_MAX_ITEMS or size + len(text) > TRANSLATE_CHUNK_MAX_CHARS):
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(text)
+        size += len(text)
+    if chunk:
+        yield chunk
+
+async def translate_chunk(texts, target_language):
+    """Translates a list of strings in one Gemini call. Returns None if the reply does not line up."""
+    try:
+        response = await translate_batch_model.generate_content_async(
+            f"Target language: {target_language}\n"
+            f"Strings: {json.dumps(texts, ensure_ascii=False)}"
+        )
+        translations = json.loads(strip_json_fence(response.text)).get("translations")
+        if isinstance(translations, list) and len(translations) == len(texts) \
+                and all(isinstance(t, str) for t in translations):
+            return translations
+        print(f"Translation batch mismatch: sent {len(texts)}, got {len(translations or [])}")
+    except Exception as e:
+        print(f"Translation Batch Error: {e}")
+    return None
+
 @app.post("/translate", response_model=TranslateResponse)
 async def translate_text(request: TranslateRequest):
     try:
-        if request.target_language.lower() == "en" or request.target_language.lower() == "english":
+        if is_english(request.target_language):
              return TranslateResponse(translated_text=request.text)
 
-        response = translate_model.generate_content(
+        key = translation_key(request.text, request.target_language)
+        cached = translation_memory.get(key)
+        if cached is not None:
+            return TranslateResponse(translated_text=cached)
+
+        response = await translate_model.generate_content_async(
             f"Translate this text to {request.target_language}: '{request.text}'"
         )
         
-        text = response.text.strip()
-        if text.startswith("```json"): text = text[7:-3]
-        elif text.startswith("```"): text = text[3:-3]
-        
-        data = json.loads(text)
-        return TranslateResponse(translated_text=data.get("translated_text", request.text))
+        data = json.loads(strip_json_fence(response.text))
+        translated = data.get("translated_text")
+        if not isinstance(translated, str) or not translated.strip():
+            # Fall back to the source text, but do not remember it as a translation
+            return TranslateResponse(translated_text=request.text)
+        translation_memory.set(key, translated)
+        return TranslateResponse(translated_text=translated)
 
     except Exception as e:
         print(f"Translation Error: {e}")
         return TranslateResponse(translated_text=request.text) 
 
+@app.post("/translate-batch", response_model=TranslateBatchResponse)
+async def translate_batch(request: TranslateBatchRequest):
+    """
+    Translates many strings into one target language.
+    Hits come from the translation memory; the distinct misses are packed into
+    as few Gemini calls as the chunk limits allow. Strings that fail to
+    translate come back unchanged and are not remembered.
+    """
+    if len(request.texts) > TRANSLATE_BATCH_MAX_TEXTS:
+        raise HTTPException(status_code=413, detail=f"At most {TRANSLATE_BATCH_MAX_TEXTS} texts per batch")
+    if is_english(request.target_language):
+        return TranslateBatchResponse(translations=request.texts, cached=0, llm_calls=0)
+
+    translated = {}
+    misses = []
+    for text in dict.fromkeys(request.texts):
+        cached = translation_memory.get(translation_key(text, request.target_language)) if text.strip() else text
+        if cached is not None:
+            translated[text] = cached
+        else:
+            misses.append(text)
+
+    missed = set(misses)
+    chunks = list(translation_chunks(misses))
+    results = await asyncio.gather(*(translate_chunk(chunk, request.target_language) for chunk in chunks))
+    for chunk, translations in zip(chunks, results):
+        for text, translation in zip(chunk, translations or chunk):
+            translated[text] = translation
+            if translations is not None:
+                translation_memory.set(translation_key(text, request.target_language), translation)
+
+    return TranslateBatchResponse(
+        translations=[translated[text] for text in request.texts],
+        cached=sum(1 for text in request.texts if text not in missed),
+        llm_calls=len(chunks),
+    )
+
+@app.get("/translate/memory/stats")
+def translation_memory_stats():
+    return translation_memory.stats()
+
 # --- News Endpoint (Crash Fix) ---
 
 class NewsRequest(BaseModel):
@@ -496,53 +1005,69 @@ async def get_latest_news(request: NewsRequest):
 
 # --- Deepfake Detective ---
 
-# Global Detector Instance
-# Global Detector Instance
-detector = None
-try:
-    from .deepfake_detection import DeepfakeDetector
-    detector = DeepfakeDetector()
-except ImportError:
-    try:
-        from deepfake_detection import DeepfakeDetector
-        detector = DeepfakeDetector()
-    except ImportError:
-        try:
-            from api.deepfake_detection import DeepfakeDetector
-            detector = DeepfakeDetector()
-        except ImportError:
-            print("Deepfake Module not found. Feature disabled.")
-except Exception as e:
-    print(f"Deepfake Model Load Error: {e}")
+@app.get("/detect-deepfake/profiles")
+def deepfake_profiles():
+    return {"default": DEFAULT_PROFILE, "profiles": PROFILES}
 
-@app.post("/detect-deepfake")
-async def detect_deepfake(file: UploadFile = File(...)):
-    if not detector:
-        return JSONResponse({"error": "Deepfake module unavailable"}, status_code=500)
-    
-    # Save temp file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as tmp:
-        shutil.copyfileobj(file.file, tmp)
-        tmp_path = tmp.name
-    
+@app.get("/detect-deepfake/cache/stats")
+def deepfake_cache_stats():
+    return deepfake_result_cache.stats()
+
+@app.post("/detect-deepfake/cache/purge")
+def purge_deepfake_result(sha256: str, profile: Optional[str] = None, x_admin_token: Optional[str] = Header(None)):
+    """Drops cached results for an upload's SHA-256 (all profiles unless one is given)."""
+    require_admin(x_admin_token)
     try:
-        # Run detection
-        result = detector.detect(tmp_path)
-        if "error" in result:
-             return JSONResponse(result, status_code=400)
-        return result
-    except Exception as e:
-        print(f"Detection Error: {e}")
-        return JSONResponse({"error": f"Analysis failed: {str(e)}"}, status_code=500)
+        profiles = [get_profile(profile)[0]] if profile else list(PROFILES)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    purged = [
+        name for name in profiles
+        # | rather than "or": both the video and the image result are dropped
+        if deepfake_result_cache.delete(deepfake_result_key(sha256.lower(), name))
+        | deepfake_result_cache.delete(deepfake_result_key(sha256.lower(), name, kind="deepfake-image"))
+    ]
+    return {"purged": purged}
+
+@app.post("/detect-deepfake/fingerprints")
+async def register_known_deepfake(
+    file: UploadFile = File(...), note: Optional[str] = None, x_admin_token: Optional[str] = Header(None)
+):
+    """Adds a known deepfake to the fingerprint index; re-encoded copies of it are then flagged without analysis."""
+    require_admin(x_admin_token)
+    tmp_path, sha256, _ = await save_upload(file, MAX_VIDEO_UPLOAD_BYTES, suffix=upload_suffix(file.filename, ".mp4"))
+    try:
+        fingerprint = await asyncio.to_thread(video_fingerprint, tmp_path)
     finally:
-        if os.path.exists(tmp_path):
-            os.remove(tmp_path) 
+        os.remove(tmp_path)
+    result = {"isFake": True, "confidence": 1.0, "heatmap": None, "processed_frames": 0}
+    if not video_index.add(sha256, fingerprint, result, label="known_deepfake", note=note or file.filename):
+        raise HTTPException(status_code=400, detail="Too few distinct frames to fingerprint this video.")
+    return {"key": sha256, "frames": len(fingerprint)}
+
+@app.delete("/detect-deepfake/fingerprints/{key}")
+def remove_fingerprint(key: str, x_admin_token: Optional[str] = Header(None)):
+    require_admin(x_admin_token)
+    return {"removed": video_index.remove(key)}
+
+@app.get("/detect-deepfake/fingerprints/stats")
+def fingerprint_stats():
+    return video_index.stats()
+
+@app.get("/detect-deepfake/ready")
+def deepfake_ready():
+    """200 once the shared detector is loaded and warmed up, 503 before that."""
+    state = deepfake_service.readiness()
+    return JSONResponse(state, status_code=200 if state["ready"] else 503)
+
+@app.post("/detect-deepfake/warmup", status_code=202)
+def deepfake_warmup():
+    """Starts loading the detector in the background (e.g. from a warm-up ping) and returns immediately."""
+    deepfake_service.start_background_load()
+    return deepfake_service.readiness()
 
 # --- Voice Assistant ---
-# Sarvam AI Configuration
-SARVAM_API_KEY = os.getenv("SARVAM_AI_API_KEY")
-SARVAM_STT_URL = "https://api.sarvam.ai/speech-to-text"
-SARVAM_TTS_URL = "https://api.sarvam.ai/text-to-speech"
+# Sarvam AI requests go through the pooled client in sarvam.py, which reads SARVAM_AI_API_KEY per call
 
 # Voice Model Configuration
 voice_model = genai.GenerativeModel(
@@ -589,45 +1114,68 @@ class VoiceChatResponse(BaseModel):
     audio_base64: str
     detected_language: str
 
+@app.get("/voice/pool-stats")
+def voice_pool_stats():
+    return sarvam.pool_stats()
+
+@app.get("/voice/tts-cache/stats")
+def voice_tts_cache_stats():
+    return tts_cache.stats()
+
+# Sentences synthesized concurrently in the streaming voice mode
+VOICE_TTS_CONCURRENCY = int(os.getenv("VOICE_TTS_CONCURRENCY", "4"))
+
+async def speech_to_text(audio_content: bytes):
+    """Transcribes audio with Sarvam STT (saaras fallback). Returns (text, language_code); raises SarvamError."""
+    files = {"file": ("audio.webm", audio_content, "audio/webm")}
+    headers = {"api-subscription-key": sarvam.get_api_key()}
+    
+    stt_response = await sarvam.post(
+        sarvam.endpoint("speech-to-text"),
+        headers=headers,
+        files=files,
+        data={
+            "model": "saarika:v2.5",
+            "language_code": "unknown"
+        }
+    )
+    
+    if stt_response.status_code != 200:
+        print(f"Sarvam STT Error: {stt_response.text}")
+        # Try saaras:v1 as fallback on the -translate endpoint
+        stt_response = await sarvam.post(
+            sarvam.endpoint("speech-to-text-translate"),
+            headers=headers,
+            files=files,
+            data={"model": "saaras:v1"}
+        )
+        if stt_response.status_code != 200:
+            raise sarvam.SarvamError(stt_response.status_code, stt_response.text)
+    
+    stt_data = stt_response.json()
+    return stt_data.get("transcript", ""), stt_data.get("language_code", "en-IN")
+
+def voice_prompt(request: VoiceChatRequest, detected_text: str) -> str:
+    conversation_context = ""
+    for msg in request.conversation_history[-5:]:
+        role = "User" if msg.get("role") == "user" else "Assistant"
+        conversation_context += f"{role}: {msg.get('content', '')}\n"
+    
+    return f"{conversation_context}\nUser: {detected_text}\nAssistant:"
+
 @app.post("/voice/chat", response_model=VoiceChatResponse)
 async def voice_chat(request: VoiceChatRequest):
     """Complete voice interaction: Sarvam STT -> Gemini Response -> Sarvam TTS"""
     try:
-        if not SARVAM_API_KEY:
+        if not sarvam.get_api_key():
              return JSONResponse({"error": "Sarvam API Key not configured"}, status_code=500)
 
         # 1. Speech-to-Text via Sarvam AI
         audio_content = base64.b64decode(request.audio_base64)
-        
-        async with httpx.AsyncClient() as client:
-            files = {"file": ("audio.webm", audio_content, "audio/webm")}
-            headers = {"api-subscription-key": SARVAM_API_KEY}
-            
-            stt_response = await client.post(
-                "https://api.sarvam.ai/speech-to-text",
-                headers=headers,
-                files=files,
-                data={
-                    "model": "saarika:v2.5",
-                    "language_code": "unknown"
-                }
-            )
-            
-            if stt_response.status_code != 200:
-                print(f"Sarvam STT Error: {stt_response.text}")
-                # Try saaras:v1 as fallback on the -translate endpoint
-                stt_response = await client.post(
-                    "https://api.sarvam.ai/speech-to-text-translate",
-                    headers=headers,
-                    files=files,
-                    data={"model": "saaras:v1"}
-                )
-                if stt_response.status_code != 200:
-                    return JSONResponse({"error": f"STT failed: {stt_response.status_code} - {stt_response.text[:100]}"}, status_code=500)
-            
-            stt_data = stt_response.json()
-            detected_text = stt_data.get("transcript", "")
-            detected_lang = stt_data.get("language_code", "en-IN")
+        try:
+            detected_text, detected_lang = await speech_to_text(audio_content)
+        except sarvam.SarvamError as e:
+            return JSONResponse({"error": f"STT failed: {e.status_code} - {e.text[:100]}"}, status_code=500)
 
         if not detected_text:
             return JSONResponse({"error": "No speech detected"}, status_code=400)
@@ -635,40 +1183,15 @@ async def voice_chat(request: VoiceChatRequest):
         print(f"Voice: '{detected_text}' ({detected_lang})")
         
         # 2. Gemini Response
-        conversation_context = ""
-        for msg in request.conversation_history[-5:]:
-            role = "User" if msg.get("role") == "user" else "Assistant"
-            conversation_context += f"{role}: {msg.get('content', '')}\n"
-        
-        prompt = f"{conversation_context}\nUser: {detected_text}\nAssistant:"
-        ai_response = voice_model.generate_content(prompt)
+        ai_response = await voice_model.generate_content_async(voice_prompt(request, detected_text))
         response_text = ai_response.text.strip()
         
         # 3. Text-to-Speech via Sarvam AI
-        async with httpx.AsyncClient() as client:
-            tts_payload = {
-                "inputs": [response_text],
-                "target_language_code": detected_lang,
-                "speaker": "anushka",
-                "model": "bulbul:v2"
-            }
-            
-            headers = {
-                "api-subscription-key": SARVAM_API_KEY,
-                "Content-Type": "application/json"
-            }
-            
-            tts_response = await client.post(
-                "https://api.sarvam.ai/text-to-speech",
-                headers=headers,
-                json=tts_payload
-            )
-            
-            if tts_response.status_code != 200:
-                print(f"Sarvam TTS Error: {tts_response.text}")
-                return JSONResponse({"error": "Text-to-Speech failed"}, status_code=500)
-            
-            audio_base64 = tts_response.json().get("audios", [""])[0]
+        try:
+            audio_base64 = await sarvam.text_to_speech(response_text, detected_lang)
+        except sarvam.SarvamError as e:
+            print(f"Sarvam TTS Error: {e.text}")
+            return JSONResponse({"error": "Text-to-Speech failed"}, status_code=500)
 
         return VoiceChatResponse(
             text_query=detected_text,
@@ -680,6 +1203,67 @@ async def voice_chat(request: VoiceChatRequest):
     except Exception as e:
         print(f"Voice Error: {e}")
         return JSONResponse({"error": str(e)}, status_code=500)
+
+@app.post("/voice/chat-stream")
+async def voice_chat_stream(request: VoiceChatRequest):
+    """
+    Pipelined voice interaction over Server-Sent Events.
+    The Gemini reply is streamed and cut at sentence boundaries; every sentence
+    goes to Sarvam TTS as soon as it is complete, and `audio` events are sent
+    in sentence order as each clip is ready. A final `metrics` event reports
+    stt_ms, first_token_ms and first_audio_ms (from request start).
+    """
+    if not sarvam.get_api_key():
+        return JSONResponse({"error": "Sarvam API Key not configured"}, status_code=500)
+
+    started = time.perf_counter()
+
+    def elapsed_ms():
+        return round((time.perf_counter() - started) * 1000, 1)
+
+    async def events():
+        metrics = {}
+        try:
+            audio_content = base64.b64decode(request.audio_base64)
+            try:
+                detected_text, detected_lang = await speech_to_text(audio_content)
+            except sarvam.SarvamError as e:
+                yield sse_event("error", {"error": f"STT failed: {e.status_code} - {e.text[:100]}"})
+                return
+            metrics["stt_ms"] = elapsed_ms()
+
+            if not detected_text:
+                yield sse_event("error", {"error": "No speech detected"})
+                return
+            yield sse_event("transcript", {"text_query": detected_text, "detected_language": detected_lang})
+
+            response = await voice_model.generate_content_async(voice_prompt(request, detected_text), stream=True)
+
+            async def llm_text():
+                async for text in stream_text(response):
+                    metrics.setdefault("first_token_ms", elapsed_ms())
+                    yield text
+
+            async def synthesize(sentence):
+                return await sarvam.text_to_speech(sentence, detected_lang)
+
+            spoken = []
+            pipeline = synthesize_in_order(sentences_from(llm_text()), synthesize, VOICE_TTS_CONCURRENCY)
+            async for sentence, audio_base64 in pipeline:
+                metrics.setdefault("first_audio_ms", elapsed_ms())
+                yield sse_event("audio", {"index": len(spoken), "text": sentence, "audio_base64": audio_base64})
+                spoken.append(sentence)
+
+            metrics["total_ms"] = elapsed_ms()
+            print(f"Voice stream metrics: {metrics}")
+            yield sse_event("metrics", metrics)
+            yield sse_event("done", {"text_response": " ".join(spoken)})
+
+        except Exception as e:
+            print(f"Voice Stream Error: {e}")
+            yield sse_event("error", {"error": str(e)})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
  
 
 
@@ -0,0 +1,179 @@
+import os
+import json
+import zlib
+import threading
+import numpy as np
+try:
+    from .cache import DEFAULT_CACHE_DIR, normalize_text, make_key
+except ImportError:
+    from cache import DEFAULT_CACHE_DIR, normalize_text, make_key
+
+# Near-duplicate rumor index (MinHash + LSH banding).
+# Viral forwards mutate (an emoji added, a name swapped, lines reordered), so
+# exact-text caching misses them. Claims are shingled into character n-grams,
+# reduced to a MinHash signature, and bucketed by band so lookups only compare
+# against a handful of candidates.
+
+# Universal hashing (a*x + b) mod p; with p = 2^31 - 1 and x < p the products fit in uint64
+_MERSENNE_PRIME = (1 << 31) - 1
+
+class RumorIndex:
+    def __init__(self, path=None, num_perm=64, bands=16, shingle_size=4, threshold=0.8, max_entries=50000):
+        assert num_perm % bands == 0, "num_perm must be divisible by bands"
+        self.path = path or os.path.join(DEFAULT_CACHE_DIR, "rumor_index.jsonl")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        self.max_entries = max_entries
+
+        # Fixed seed so signatures stay comparable across restarts
+        rng = np.random.RandomState(1)
+        self._a = rng.randint(1, _MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, _MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+
+        self._entries = {}  # key -> entry dict (insertion ordered, oldest first)
+        self._buckets = [dict() for _ in range(bands)]
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "added": 0}
+        self._load()
+
+    def _shingles(self, normalized):
+        k = self.shingle_size
+        if len(normalized) <= k:
+            return {normalized}
+        return {normalized[i:i + k] for i in range(len(normalized) - k + 1)}
+
+    def signature(self, text):
+        normalized = normalize_text(text)
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) % _MERSENNE_PRIME for s in self._shingles(normalized)),
+            dtype=np.uint64,
+        )
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % np.uint64(_MERSENNE_PRIME)
+        return permuted.min(axis=1)
+
+    def _band_keys(self, signature):
+        return [
+            signature[i * self.rows:(i + 1) * self.rows].tobytes()
+            for i in range(self.bands)
+        ]
+
+    def _insert(self, entry):
+        key = entry["key"]
+        if key in self._entries:
+            self._remove(key)
+        entry["signature"] = np.asarray(entry["signature"], dtype=np.uint64)
+        self._entries[key] = entry
+        for band, band_key in zip(self._buckets, self._band_keys(entry["signature"])):
+            band.setdefault(band_key, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        for band, band_key in zip(self._buckets, self._band_keys(entry["signature"])):
+            members = band.get(band_key)
+            if members:
+                members.discard(key)
+                if not members:
+                    del band[band_key]
+        return True
+
+    def query(self, text, language):
+        """Returns (entry, similarity) for the closest stored claim above threshold, else None."""
+        signature = self.signature(text)
+        language = (language or "en").lower()
+        with self._lock:
+            candidates = set()
+            for band, band_key in zip(self._buckets, self._band_keys(signature)):
+                candidates.update(band.get(band_key, ()))
+
+            best, best_score = None, 0.0
+            for key in candidates:
+                entry = self._entries[key]
+                if entry["language"] != language:
+                    continue
+                score = float(np.mean(entry["signature"] == signature))
+                if score > best_score:
+                    best, best_score = entry, score
+
+            if best is not None and best_score >= self.threshold:
+                self._counters["hits"] += 1
+                return best, round(best_score, 4)
+            self._counters["misses"] += 1
+            return None
+
+    def add(self, text, language, response):
+        language = (language or "en").lower()
+        entry = {
+            "key": make_key(normalize_text(text), language),
+            "text": text,
+            "language": language,
+            "response": response,
+            "signature": self.signature(text),
+        }
+        with self._lock:
+            self._insert(entry)
+            self._counters["added"] += 1
+            self._append({**entry, "signature": entry["signature"].tolist()})
+
+    def remove(self, text, language):
+        key = make_key(normalize_text(text), (language or "en").lower())
+        with self._lock:
+            removed = self._remove(key)
+            if removed:
+                self._append({"key": key, "removed": True})
+            return removed
+
+    def _append(self, record):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f"Rumor index persist error: {e}")
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        lines = 0
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    lines += 1
+                    record = json.loads(line)
+                    if record.get("removed"):
+                        self._remove(record["key"])
+                        continue
+                    if len(record.get("signature", [])) != self.num_perm:
+                        record["signature"] = self.signature(record["text"])
+                    self._insert(record)
+            print(f"Rumor index loaded {len(self._entries)} claims from {self.path}")
+        except Exception as e:
+            print(f"Rumor index load error: {e}")
+            return
+
+        # The log only ever grows; rewrite it once evictions/removals dominate
+        if lines > 2 * len(self._entries) + 1000:
+            self._compact()
+
+    def _compact(self):
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for entry in self._entries.values():
+                    record = {**entry, "signature": entry["signature"].tolist()}
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Rumor index compaction error: {e}")
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "threshold": self.threshold, **self._counters}
@@ -0,0 +1,190 @@
+import os
+import time
+import base64
+import asyncio
+import httpx
+try:
+    from .audio_cache import AudioCache, tts_cache
+except ImportError:
+    from audio_cache import AudioCache, tts_cache
+
+# Process-wide pooled HTTP client for Sarvam AI (STT/TTS).
+# One keep-alive client per process avoids a fresh TCP + TLS handshake to
+# api.sarvam.ai on every voice turn. The base URL can be pointed at a local
+# stub server for testing.
+# Settings are read from the environment when used, not at import: the apps
+# import this module before load_dotenv() has run.
+
+def settings():
+    return {
+        "api_key": os.getenv("SARVAM_AI_API_KEY"),
+        "base_url": os.getenv("SARVAM_BASE_URL", "https://api.sarvam.ai").rstrip("/"),
+        "max_connections": int(os.getenv("SARVAM_MAX_CONNECTIONS", "100")),
+        "max_keepalive": int(os.getenv("SARVAM_MAX_KEEPALIVE", "20")),
+        "keepalive_expiry": float(os.getenv("SARVAM_KEEPALIVE_EXPIRY", "60")),
+        "connect_timeout": float(os.getenv("SARVAM_CONNECT_TIMEOUT", "5")),
+        "read_timeout": float(os.getenv("SARVAM_READ_TIMEOUT", "30")),
+        "write_timeout": float(os.getenv("SARVAM_WRITE_TIMEOUT", "30")),
+        "pool_timeout": float(os.getenv("SARVAM_POOL_TIMEOUT", "5")),
+    }
+
+def get_api_key():
+    return settings()["api_key"]
+
+def endpoint(name):
+    """URL of a Sarvam API route, e.g. endpoint("speech-to-text")."""
+    return f"{settings()['base_url']}/{name}"
+
+try:
+    import h2  # noqa: F401 (HTTP/2 support for httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+class SarvamError(Exception):
+    def __init__(self, status_code, text):
+        super().__init__(f"Sarvam API error {status_code}: {text[:200]}")
+        self.status_code = status_code
+        self.text = text
+
+_client = None
+_stats = {
+    "requests": 0,
+    "errors": 0,
+    "in_flight": 0,
+    "max_in_flight": 0,
+    "total_latency_ms": 0.0,
+}
+
+def get_client() -> httpx.AsyncClient:
+    """Returns the shared client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        config = settings()
+        _client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=config["max_connections"],
+                max_keepalive_connections=config["max_keepalive"],
+                keepalive_expiry=config["keepalive_expiry"],
+            ),
+            timeout=httpx.Timeout(
+                connect=config["connect_timeout"],
+                read=config["read_timeout"],
+                write=config["write_timeout"],
+                pool=config["pool_timeout"],
+            ),
+        )
+    return _client
+
+async def close_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+async def post(url, **kwargs) -> httpx.Response:
+    """POSTs through the shared client, recording pool usage statistics."""
+    _stats["requests"] += 1
+    _stats["in_flight"] += 1
+    _stats["max_in_flight"] = max(_stats["max_in_flight"], _stats["in_flight"])
+    start = time.perf_counter()
+    try:
+        return await get_client().post(url, **kwargs)
+    except Exception:
+        _stats["errors"] += 1
+        raise
+    finally:
+        _stats["in_flight"] -= 1
+        _stats["total_latency_ms"] += (time.perf_counter() - start) * 1000
+
+async def text_to_speech(text, target_language_code, speaker="anushka", model="bulbul:v2", api_key=None) -> str:
+    """
+    Synthesizes text with Sarvam Bulbul and returns base64 audio. Raises SarvamError on failure.
+    Results are served from the TTS audio cache when the same text was synthesized before.
+    """
+    cache_key = AudioCache.key(text, target_language_code, speaker, model)
+    cached = await asyncio.to_thread(tts_cache.get, cache_key)
+    if cached is not None:
+        return base64.b64encode(cached).decode("ascii")
+    headers = {
+        "api-subscription-key": api_key or get_api_key(),
+        "Content-Type": "application/json"
+    }
+    payload = {
+        "inputs": [text],
+        "target_language_code": target_language_code,
+        "speaker": speaker,
+        "model": model
+    }
+    response = await post(endpoint("text-to-speech"), headers=headers, json=payload)
+    if response.status_code != 200:
+        raise SarvamError(response.status_code, response.text)
+    audio = response.json().get("audios", [""])[0]
+    if audio:
+        await asyncio.to_thread(tts_cache.put, cache_key, base64.b64decode(audio))
+    return audio
+
+# Fixed phrases worth synthesizing ahead of time, at deploy time (pregenerate_tts.py
+# writes them into TTS_CACHE_DIR), so the first user to hear them does not pay the
+# synthesis latency. Never run on the request path.
+COMMON_PHRASES = {
+    "en-IN": [
+        "Namaste! I am Satya, your election assistant. How can I help you today?",
+        "Sorry, I could not understand the audio. Please try again.",
+        "Sorry, I am having trouble answering right now. Please try again in a moment.",
+        "You can check your name in the electoral roll at electoralsearch.eci.gov.in.",
+    ],
+    "hi-IN": [
+        "नमस्ते! मैं सत्य हूँ, आपका चुनाव सहायक। मैं आपकी क्या मदद कर सकता हूँ?",
+        "क्षमा करें, मैं ऑडियो समझ नहीं पाया। कृपया फिर से प्रयास करें।",
+        "क्षमा करें, अभी उत्तर देने में समस्या हो रही है। कृपया थोड़ी देर बाद प्रयास करें।",
+        "आप अपना नाम मतदाता सूची में electoralsearch.eci.gov.in पर देख सकते हैं।",
+    ],
+}
+
+async def pregenerate(phrases=None, concurrency=4):
+    """Warms the TTS audio cache with {language_code: [text, ...]}; returns counts."""
+    phrases = phrases or COMMON_PHRASES
+    semaphore = asyncio.Semaphore(concurrency)
+    counts = {"cached": 0, "synthesized": 0, "failed": 0}
+
+    async def warm(text, language_code):
+        cache_key = AudioCache.key(text, language_code, "anushka", "bulbul:v2")
+        if await asyncio.to_thread(tts_cache.get, cache_key) is not None:
+            counts["cached"] += 1
+            return
+        async with semaphore:
+            try:
+                await text_to_speech(text, language_code)
+                counts["synthesized"] += 1
+            except Exception as e:
+                print(f"TTS pregenerate failed for {language_code} '{text[:40]}': {e}")
+                counts["failed"] += 1
+
+    await asyncio.gather(*(warm(text, lang) for lang, texts in phrases.items() for text in texts))
+    return counts
+
+def pool_stats():
+    """Client-side counters plus a snapshot of the connection pool, for sizing it."""
+    connections = []
+    if _client is not None:
+        # httpx does not expose pool state publicly; read it defensively
+        pool = getattr(getattr(_client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+    idle = sum(1 for conn in connections if getattr(conn, "is_idle", lambda: False)())
+    requests = _stats["requests"]
+    config = settings()
+    return {
+        "http2": HTTP2_AVAILABLE,
+        "max_connections": config["max_connections"],
+        "max_keepalive_connections": config["max_keepalive"],
+        "open_connections": len(connections),
+        "idle_connections": idle,
+        "active_connections": len(connections) - idle,
+        "requests": requests,
+        "errors": _stats["errors"],
+        "in_flight": _stats["in_flight"],
+        "max_in_flight": _stats["max_in_flight"],
+        "avg_latency_ms": round(_stats["total_latency_ms"] / requests, 2) if requests else 0.0,
+    }
@@ -0,0 +1,70 @@
+import json
+
+# Server-Sent Events helpers for the streaming endpoint variants.
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # keep reverse proxies from buffering the stream
+}
+
+def sse_event(event, data):
+    """Formats one SSE frame with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+class JsonFieldStream:
+    """
+    Incrementally scans a streamed JSON object and reports each top-level
+    member as soon as its value is complete, so callers can forward fields
+    before the whole object has arrived. Anything before the opening brace
+    (e.g. a ```json fence) is ignored.
+    """
+
+    def __init__(self):
+        self.fields = {}
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = None
+
+    def feed(self, chunk):
+        """Consumes a chunk of model output and returns the (key, value) pairs completed by it."""
+        self._buffer += chunk
+        completed = []
+        while self._pos < len(self._buffer):
+            ch = self._buffer[self._pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                if self._depth > 0:
+                    self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._member_start = self._pos + 1
+            elif ch in "}]":
+                if self._depth == 1:
+                    self._complete_member(completed)
+                self._depth = max(0, self._depth - 1)
+            elif ch == "," and self._depth == 1:
+                self._complete_member(completed)
+                self._member_start = self._pos + 1
+            self._pos += 1
+        return completed
+
+    def _complete_member(self, completed):
+        member = self._buffer[self._member_start:self._pos].strip()
+        if not member:
+            return
+        try:
+            ((key, value),) = json.loads("{" + member + "}").items()
+        except (ValueError, TypeError):
+            return
+        self.fields[key] = value
+        completed.append((key, value))
@@ -0,0 +1,105 @@
+import os
+import asyncio
+import hashlib
+import tempfile
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+# Streaming, size-bounded handling of media uploads.
+# Uploads are copied to disk in fixed-size chunks and hashed on the way, so a
+# request never holds the whole file in memory; oversized requests are turned
+# away by Content-Length before the multipart body is even parsed, and cut off
+# once the bytes actually received pass the limit (chunked or mislabelled bodies).
+
+MB = 1024 * 1024
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(MB)))
+MAX_VIDEO_UPLOAD_BYTES = int(float(os.getenv("MAX_VIDEO_UPLOAD_MB", "200")) * MB)
+MAX_AUDIO_UPLOAD_BYTES = int(float(os.getenv("MAX_AUDIO_UPLOAD_MB", "25")) * MB)
+MAX_IMAGE_UPLOAD_BYTES = int(float(os.getenv("MAX_IMAGE_UPLOAD_MB", "20")) * MB)
+# Slack for multipart boundaries and headers on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+def too_large_detail(max_bytes):
+    return f"Upload exceeds the {max_bytes / MB:g} MB limit."
+
+def upload_suffix(filename, default):
+    return f".{filename.split('.')[-1]}" if filename and "." in filename else default
+
+async def save_upload(file, max_bytes, suffix=None, dir=None):
+    """
+    Streams an UploadFile to a temp file in UPLOAD_CHUNK_BYTES chunks.
+    Returns (path, sha256 hex digest, size). Raises HTTPException(413) and
+    removes the partial file once the upload exceeds max_bytes.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    if dir:
+        os.makedirs(dir, exist_ok=True)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix, dir=dir) as tmp:
+        try:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(status_code=413, detail=too_large_detail(max_bytes))
+                digest.update(chunk)
+                await asyncio.to_thread(tmp.write, chunk)
+        except BaseException:
+            tmp.close()
+            os.remove(tmp.name)
+            raise
+    return tmp.name, digest.hexdigest(), size
+
+async def read_upload(file, max_bytes):
+    """
+    Reads a small UploadFile (e.g. an image) into memory in UPLOAD_CHUNK_BYTES
+    chunks. Returns (bytes, sha256 hex digest). Raises HTTPException(413) once
+    the upload exceeds max_bytes.
+    """
+    digest = hashlib.sha256()
+    data = bytearray()
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            break
+        if len(data) + len(chunk) > max_bytes:
+            raise HTTPException(status_code=413, detail=too_large_detail(max_bytes))
+        digest.update(chunk)
+        data.extend(chunk)
+    return bytes(data), digest.hexdigest()
+
+class UploadLimitMiddleware:
+    """Rejects requests to the given paths whose body exceeds the path's limit, with 413."""
+
+    def __init__(self, app, limits):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        max_bytes = self.limits.get(scope["path"].rstrip("/")) if scope["type"] == "http" else None
+        if max_bytes is None:
+            await self.app(scope, receive, send)
+            return
+        limit = max_bytes + MULTIPART_OVERHEAD_BYTES
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > limit:
+            response = JSONResponse(status_code=413, content={"detail": too_large_detail(max_bytes)})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            # Content-Length may be missing (chunked) or understated; count what actually arrives
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised inside the body parser; FastAPI passes HTTPException through as the 413 response
+                    raise HTTPException(status_code=413, detail=too_large_detail(max_bytes))
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,219 @@
+import os
+import json
+import time
+import threading
+import numpy as np
+try:
+    from .cache import DEFAULT_CACHE_DIR
+except ImportError:
+    from cache import DEFAULT_CACHE_DIR
+
+# Perceptual fingerprint index for re-encoded duplicate videos.
+# WhatsApp/Instagram re-encode every forward, so byte hashes of the same clip
+# never match. A clip is instead fingerprinted by the 64-bit dHash of frames
+# sampled at fixed time intervals (so frame-rate changes do not shift them);
+# dHash survives re-compression and rescaling with only a few flipped bits.
+# Two clips match when most of the query's frames have a stored frame within
+# a small Hamming distance.
+
+FINGERPRINT_INTERVAL_SECONDS = float(os.getenv("FINGERPRINT_INTERVAL_SECONDS", "0.5"))
+FINGERPRINT_MAX_FRAMES = int(os.getenv("FINGERPRINT_MAX_FRAMES", "24"))
+# Frames flatter than this (grayscale std) hash to ~0 and would match anything
+FINGERPRINT_MIN_CONTRAST = 8.0
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+def dhash(gray):
+    """64-bit difference hash of a grayscale frame: is each pixel brighter than its right neighbour, on a 9x8 thumbnail."""
+    import cv2
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int(np.packbits(bits).view(">u8")[0])
+
+def video_fingerprint(video_path, interval_seconds=None, max_frames=None):
+    """
+    dHashes of up to max_frames frames, one every interval_seconds from the
+    start of the video. Only sampled frames are decoded, so this costs a
+    fraction of a detection pass.
+    """
+    import cv2
+    interval_seconds = interval_seconds or FINGERPRINT_INTERVAL_SECONDS
+    max_frames = max_frames or FINGERPRINT_MAX_FRAMES
+    cap = cv2.VideoCapture(video_path)
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        stride = max(1, int(round((fps if 0 < fps < 240 else 30) * interval_seconds)))
+        hashes = []
+        i = 0
+        while len(hashes) < max_frames and cap.grab():
+            if i % stride == 0:
+                ret, frame = cap.retrieve()
+                if ret:
+                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                    if gray.std() >= FINGERPRINT_MIN_CONTRAST:
+                        hashes.append(dhash(gray))
+            i += 1
+        return hashes
+    finally:
+        cap.release()
+
+def hamming_distances(a, b):
+    """Pairwise bit distances between two uint64 hash arrays, shape (len(a), len(b))."""
+    x = np.bitwise_xor(a[:, None], b[None, :])
+    if hasattr(np, "bitwise_count"):  # numpy >= 2.0
+        return np.bitwise_count(x)
+    return _POPCOUNT[x.view(np.uint8)].reshape(x.shape + (8,)).sum(axis=-1)
+
+class VideoFingerprintIndex:
+    def __init__(self, path=None, max_distance=10, threshold=0.6, min_frames=4, max_entries=5000, version=None):
+        """
+        max_distance: largest Hamming distance (of 64 bits) at which two frames count as the same.
+        threshold: fraction of the query's frames that must find such a frame in one stored clip.
+        version: detector version stamped on new entries; "analyzed" entries of
+            another version are dropped on load (curated labels are kept).
+        """
+        self.path = path or os.path.join(DEFAULT_CACHE_DIR, "video_index.jsonl")
+        self.max_distance = max_distance
+        self.threshold = threshold
+        self.min_frames = min_frames
+        self.max_entries = max_entries
+        self.version = version
+
+        self._entries = {}  # key -> entry dict (insertion ordered, oldest first)
+        self._hashes = None  # all stored frame hashes, rebuilt lazily after changes
+        self._owners = None  # entry position per row of _hashes
+        self._owner_keys = []
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "added": 0}
+        self._load()
+
+    def _insert(self, entry):
+        self._entries.pop(entry["key"], None)
+        entry["fingerprint"] = np.asarray(entry["fingerprint"], dtype=np.uint64)
+        self._entries[entry["key"]] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._hashes = None
+
+    def _remove(self, key):
+        if self._entries.pop(key, None) is None:
+            return False
+        self._hashes = None
+        return True
+
+    def _arrays(self):
+        if self._hashes is None:
+            entries = list(self._entries.values())
+            self._hashes = np.concatenate(
+                [entry["fingerprint"] for entry in entries] or [np.zeros(0, dtype=np.uint64)]
+            )
+            self._owners = np.array(
+                [i for i, entry in enumerate(entries) for _ in range(len(entry["fingerprint"]))], dtype=np.int64
+            )
+            self._owner_keys = [entry["key"] for entry in entries]
+        return self._hashes, self._owners
+
+    def query(self, fingerprint):
+        """Returns (entry, similarity) for the stored clip matching most of fingerprint's frames, else None."""
+        query = np.asarray(fingerprint, dtype=np.uint64)
+        if len(query) < self.min_frames:
+            return None
+        with self._lock:
+            hashes, owners = self._arrays()
+            best, best_score = None, 0.0
+            if len(hashes):
+                close = hamming_distances(query, hashes) <= self.max_distance
+                for owner in np.unique(owners[close.any(axis=0)]):
+                    score = float(close[:, owners == owner].any(axis=1).mean())
+                    if score > best_score:
+                        best, best_score = self._entries[self._owner_keys[owner]], score
+
+            if best is not None and best_score >= self.threshold:
+                self._counters["hits"] += 1
+                return best, round(best_score, 4)
+            self._counters["misses"] += 1
+            return None
+
+    def add(self, key, fingerprint, result, label="analyzed", note=None):
+        """Stores a clip's fingerprint with the result to answer its duplicates with. Returns False if too short."""
+        if len(fingerprint) < self.min_frames:
+            return False
+        entry = {
+            "key": key,
+            "label": label,
+            "note": note,
+            "result": result,
+            "version": self.version,
+            "fingerprint": fingerprint,
+            "added": time.time(),
+        }
+        with self._lock:
+            self._insert(entry)
+            self._counters["added"] += 1
+            self._append({**entry, "fingerprint": [int(h) for h in entry["fingerprint"]]})
+        return True
+
+    def remove(self, key):
+        with self._lock:
+            removed = self._remove(key)
+            if removed:
+                self._append({"key": key, "removed": True})
+            return removed
+
+    def _append(self, record):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f"Video index persist error: {e}")
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        lines = 0
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    lines += 1
+                    record = json.loads(line)
+                    if record.get("removed"):
+                        self._remove(record["key"])
+                    elif record.get("label") == "analyzed" and record.get("version") != self.version:
+                        self._remove(record["key"])  # scored by an older detector
+                    else:
+                        self._insert(record)
+            print(f"Video index loaded {len(self._entries)} clips from {self.path}")
+        except Exception as e:
+            print(f"Video index load error: {e}")
+            return
+
+        # The log only ever grows; rewrite it once evictions/removals dominate
+        if lines > 2 * len(self._entries) + 1000:
+            self._compact()
+
+    def _compact(self):
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for entry in self._entries.values():
+                    record = {**entry, "fingerprint": [int(h) for h in entry["fingerprint"]]}
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Video index compaction error: {e}")
+
+    def stats(self):
+        with self._lock:
+            labels = {}
+            for entry in self._entries.values():
+                labels[entry["label"]] = labels.get(entry["label"], 0) + 1
+            return {
+                "entries": len(self._entries),
+                "labels": labels,
+                "max_distance": self.max_distance,
+                "threshold": self.threshold,
+                **self._counters,
+            }
@@ -0,0 +1,81 @@
+import re
+import asyncio
+
+# Pipelined voice turn helpers: cut streamed LLM text at sentence boundaries
+# and synthesize each sentence concurrently, delivering audio in order.
+
+# Sentence terminators incl. Devanagari danda; requiring whitespace after
+# '.' keeps URLs and numbers like "eci.gov.in" / "2.5" intact.
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?।॥])\s+|\n+")
+
+class SentenceChunker:
+    def __init__(self, min_chars=12):
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, text):
+        """Adds streamed text and returns the sentences completed by it."""
+        self._buffer += text
+        sentences = []
+        start = 0
+        for match in _SENTENCE_BOUNDARY.finditer(self._buffer):
+            sentence = self._buffer[start:match.start()].strip()
+            # Very short fragments ("Yes.") are merged into the next sentence
+            if len(sentence) < self.min_chars:
+                continue
+            sentences.append(sentence)
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self):
+        sentence = self._buffer.strip()
+        self._buffer = ""
+        return [sentence] if sentence else []
+
+async def sentences_from(text_stream, chunker=None):
+    """Turns an async iterator of text deltas into an async iterator of sentences."""
+    chunker = chunker or SentenceChunker()
+    async for text in text_stream:
+        for sentence in chunker.feed(text):
+            yield sentence
+    for sentence in chunker.flush():
+        yield sentence
+
+async def synthesize_in_order(sentences, synthesize, concurrency=4):
+    """
+    Starts synthesize(sentence) for every sentence as soon as it arrives (up to
+    `concurrency` at once) and yields (sentence, audio) pairs in sentence order,
+    each as soon as it and all earlier ones are ready.
+    Errors from the sentence source or from synthesis propagate to the caller.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    queue = asyncio.Queue()
+    tasks = []
+
+    async def run(sentence):
+        async with semaphore:
+            return await synthesize(sentence)
+
+    async def produce():
+        try:
+            async for sentence in sentences:
+                task = asyncio.ensure_future(run(sentence))
+                tasks.append(task)
+                await queue.put((sentence, task))
+        finally:
+            await queue.put(None)
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            sentence, task = item
+            yield sentence, await task
+        await producer
+    finally:
+        producer.cancel()
+        for task in tasks:
+            task.cancel()
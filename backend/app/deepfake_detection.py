@@ -1,3 +1,4 @@
+import os
 import cv2
 import torch
 import torch.nn as nn
@@ -8,28 +9,260 @@ from PIL import Image
 import base64
 import io
 import ssl
+import hashlib
+import tempfile
+import threading
+try:
+    from .deepfake_profiles import get_profile
+except ImportError:
+    from deepfake_profiles import get_profile
 
 # Bypass SSL verification for model downloads (common issue on Mac)
 ssl._create_default_https_context = ssl._create_unverified_context
 
+# How sampled frames are decoded:
+#   "sequential" - grab() every frame, retrieve() only the sampled ones. No
+#                  seeking, so each frame is decoded once; also works when the
+#                  container reports no frame count.
+#   "seek"       - set CAP_PROP_POS_FRAMES before each sampled frame. Every seek
+#                  re-decodes from the previous keyframe, so this only wins for
+#                  very sparse sampling of long videos.
+FRAME_SAMPLER = os.getenv("DEEPFAKE_FRAME_SAMPLER", "sequential")
+
+def sample_frames(video_path, stride, strategy=None):
+    """Yields (frame_index, BGR frame) for every `stride`-th frame of the video."""
+    strategy = strategy or FRAME_SAMPLER
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if strategy == "seek":
+            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            if frame_count > 0:
+                for i in range(0, frame_count, stride):
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, i)
+                    ret, frame = cap.read()
+                    if not ret:
+                        return
+                    yield i, frame
+                return
+            # No frame count in the header: seeking blindly is meaningless, decode in order
+        elif strategy != "sequential":
+            raise ValueError(f"Unknown frame sampler: {strategy}")
+
+        i = 0
+        while cap.grab():
+            if i % stride == 0:
+                ret, frame = cap.retrieve()
+                if ret:
+                    yield i, frame
+            i += 1
+    finally:
+        cap.release()
+
+# Frames per MTCNN forward pass; all sampled frames of a video share one size
+MTCNN_BATCH_SIZE = int(os.getenv("DEEPFAKE_MTCNN_BATCH_SIZE", "8"))
+
+def crop_box(image, box):
+    """
+    Crops an HxWxC array to a float (x1, y1, x2, y2) box exactly like
+    PIL.Image.crop: coordinates are rounded and out-of-bounds areas are zero.
+    """
+    x1, y1, x2, y2 = (int(round(float(v))) for v in box)
+    h, w = image.shape[:2]
+    face = np.zeros((max(0, y2 - y1), max(0, x2 - x1)) + image.shape[2:], dtype=image.dtype)
+    src_x1, src_y1 = max(x1, 0), max(y1, 0)
+    src_x2, src_y2 = min(x2, w), min(y2, h)
+    if src_x2 > src_x1 and src_y2 > src_y1:
+        face[src_y1 - y1:src_y2 - y1, src_x1 - x1:src_x2 - x1] = image[src_y1:src_y2, src_x1:src_x2]
+    return face
+
+def fit_width(frame, width):
+    """Downscales a frame to at most `width` pixels wide, keeping the aspect ratio."""
+    if not width or frame.shape[1] <= width:
+        return frame
+    height = int(round(frame.shape[0] * width / frame.shape[1]))
+    return cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+
+# Face crops per EfficientNet forward pass, derived from a memory budget.
+# ~100 MB of activations per 380x380 crop is a conservative fp32 estimate;
+# activations grow with the crop area, so smaller inputs batch more faces.
+VISUAL_BATCH_MEMORY_MB = int(os.getenv("DEEPFAKE_BATCH_MEMORY_MB", "1024"))
+VISUAL_MB_PER_FACE = 100
+
+def visual_batch_size(input_size):
+    return max(1, int(VISUAL_BATCH_MEMORY_MB // (VISUAL_MB_PER_FACE * (input_size / 380) ** 2)))
+
+# Stacking faces only pays off when torch can spread the larger matmuls over
+# several threads; on a single thread one pass per face measured faster
+# (benchmarks/visual_batch.py: 1418 ms per-face vs 1739 ms batched for 5 faces).
+VISUAL_BATCH_MIN_THREADS = int(os.getenv("DEEPFAKE_BATCH_MIN_THREADS", "2"))
+
+def visual_chunk_size(batch_size):
+    """Faces per forward pass at the current torch thread count."""
+    return batch_size if torch.get_num_threads() >= VISUAL_BATCH_MIN_THREADS else 1
+
+# Visual stream backbones: constructor and the pretrained weights to start from
+BACKBONES = {
+    "efficientnet_b0": (models.efficientnet_b0, models.EfficientNet_B0_Weights.IMAGENET1K_V1),
+    "efficientnet_b4": (models.efficientnet_b4, models.EfficientNet_B4_Weights.IMAGENET1K_V1),
+}
+
+# The classifier heads have no trained weights yet. They are initialised from a
+# fixed seed so every worker process, and every restart, gives a face the same
+# score; the result caches and the ONNX export key rely on that.
+HEAD_SEED = int(os.getenv("DEEPFAKE_HEAD_SEED", "0"))
+
+def seeded(build, seed=HEAD_SEED):
+    """Calls build() with torch's RNG seeded, leaving the global RNG state untouched."""
+    with torch.random.fork_rng(devices=[]):
+        torch.manual_seed(seed)
+        return build()
+
+# Runtime for the EfficientNet forward pass:
+#   "torch"     - the PyTorch module itself
+#   "onnx"      - the same weights exported to ONNX and run with ONNX Runtime
+#   "onnx-int8" - that graph with dynamically quantized int8 weights
+# onnxruntime and onnx are optional; without them (or on GPU) torch is used.
+VISUAL_BACKEND = os.getenv("DEEPFAKE_VISUAL_BACKEND", "torch")
+VISUAL_BACKENDS = ("torch", "onnx", "onnx-int8")
+# Keeps exported graphs across restarts (keyed by the weights); unset -> temp dir per process
+ONNX_DIR = os.getenv("DEEPFAKE_ONNX_DIR")
+
+def weights_fingerprint(model):
+    digest = hashlib.sha256()
+    for name, tensor in model.state_dict().items():
+        digest.update(name.encode())
+        digest.update(tensor.detach().cpu().numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+def export_onnx(model, input_size, directory, quantize=False):
+    """
+    Exports model (NCHW float input, dynamic batch) to directory and returns the
+    .onnx path; an existing export of the same weights is reused.
+    """
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, f"visual-{weights_fingerprint(model)}")
+    path = f"{base}.onnx"
+    if not os.path.exists(path):
+        dummy = torch.zeros(1, 3, input_size, input_size)
+        torch.onnx.export(
+            model, dummy, f"{path}.tmp",
+            input_names=["input"], output_names=["logits"],
+            dynamic_axes={"input": {0: "batch"}, "logits": {0: "batch"}},
+            opset_version=17, dynamo=False,
+        )
+        os.replace(f"{path}.tmp", path)
+    if not quantize:
+        return path
+    int8_path = f"{base}-int8.onnx"
+    if not os.path.exists(int8_path):
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        quantize_dynamic(path, f"{int8_path}.tmp", weight_type=QuantType.QUInt8)
+        os.replace(f"{int8_path}.tmp", int8_path)
+    return int8_path
+
+class OnnxVisualModel:
+    """ONNX Runtime session for a visual model; called like the module, on a batch tensor, returning logits."""
+
+    def __init__(self, model, input_size, quantize=False, directory=None):
+        import onnxruntime as ort
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = torch.get_num_threads()
+        if directory:
+            path = export_onnx(model, input_size, directory, quantize)
+            self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        else:
+            # The session keeps its own copy of the graph, so the files can go right away
+            with tempfile.TemporaryDirectory() as tmp:
+                path = export_onnx(model, input_size, tmp, quantize)
+                self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def __call__(self, input_tensor):
+        logits = self.session.run(None, {self.input_name: input_tensor.cpu().numpy()})[0]
+        return torch.from_numpy(logits)
+
+def heuristic_scores(face_variances):
+    """
+    Maps Laplacian variances to fake probabilities: lower var -> higher fake prob.
+    Normal sharp face ~ 300-500. Blurry/Smooth AI face < 100.
+    Sigmoid-ish mapping: var < 150 (Smooth) -> high fake score, var > 300 (Sharp) -> low fake score.
+    """
+    return 1.0 / (1.0 + np.exp((np.asarray(face_variances, dtype=np.float64) - 150) / 50))
+
+class VisualStream:
+    """One visual backbone at one input resolution: model, preprocessing and inference runtime."""
+
+    def __init__(self, backbone, input_size, device, backend=None):
+        self.backbone = backbone
+        self.input_size = input_size
+        self.device = device
+        self.batch_size = visual_batch_size(input_size)
+
+        # Using pretrained weights for feature extraction foundation
+        build, weights = BACKBONES[backbone]
+        self.model = build(weights=weights)
+
+        # Modify classifier for 2 classes (Real vs Fake)
+        num_ftrs = self.model.classifier[1].in_features
+        self.model.classifier[1] = seeded(lambda: nn.Linear(num_ftrs, 1)) # Sigmoid output later
+        self.model = self.model.to(device)
+        self.model.eval()
+        self.backend, self.onnx = self._load_backend(backend or VISUAL_BACKEND)
+
+        self.transform = transforms.Compose([
+            transforms.Resize((input_size, input_size)),
+            transforms.ToTensor(),
+            transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]),
+        ])
+
+    def _load_backend(self, backend):
+        """Returns (backend actually used, OnnxVisualModel or None)."""
+        if backend not in VISUAL_BACKENDS:
+            raise ValueError(f"Unknown visual backend: {backend}")
+        if backend == "torch":
+            return "torch", None
+        if self.device.type != "cpu":
+            print(f"Visual backend {backend} is CPU-only; using torch on {self.device}.")
+            return "torch", None
+        try:
+            onnx_model = OnnxVisualModel(
+                self.model, self.input_size, quantize=backend == "onnx-int8", directory=ONNX_DIR
+            )
+        except Exception as e:
+            print(f"Visual backend {backend} unavailable for {self.backbone} ({e}); using torch.")
+            return "torch", None
+        print(f"Visual backend for {self.backbone}: {backend}")
+        return backend, onnx_model
+
+    def probs(self, input_tensor):
+        """Fake probabilities for a stacked batch, in chunks of visual_chunk_size, on the configured backend."""
+        probs = []
+        with torch.no_grad():
+            for chunk in torch.split(input_tensor, visual_chunk_size(self.batch_size)):
+                if self.onnx is not None:
+                    visual_logits = self.onnx(chunk)
+                else:
+                    visual_logits = self.model(chunk.to(self.device))
+                probs.append(torch.sigmoid(visual_logits).flatten().cpu())
+        return torch.cat(probs).numpy().astype(np.float64)
+
 class DeepfakeDetector:
-    def __init__(self, device='cpu'):
+    def __init__(self, device='cpu', visual_backend=None, profile=None):
         self.device = torch.device('cuda' if torch.cuda.is_available() else device)
         print(f"DeepfakeDetector initializing on {self.device}...")
 
         # 1. The Cleaner: Face Extractor
         self.mtcnn = MTCNN(keep_all=False, select_largest=True, device=self.device)
 
-        # 2. Stream A: Visual Artifacts (EfficientNet-B4)
-        # Using pretrained weights for feature extraction foundation
-        weights = models.EfficientNet_B4_Weights.IMAGENET1K_V1
-        self.visual_model = models.efficientnet_b4(weights=weights)
-        
-        # Modify classifier for 2 classes (Real vs Fake)
-        num_ftrs = self.visual_model.classifier[1].in_features
-        self.visual_model.classifier[1] = nn.Linear(num_ftrs, 1) # Sigmoid output later
-        self.visual_model = self.visual_model.to(self.device)
-        self.visual_model.eval()
+        # 2. Stream A: Visual Artifacts (EfficientNet), one stream per backbone/resolution.
+        # The default profile's stream is loaded now, the others on first use.
+        self.visual_backend = visual_backend or VISUAL_BACKEND
+        self.visual_streams = {}
+        self._streams_lock = threading.Lock()
+        self.profile = get_profile(profile)[0]
+        default_stream = self.visual_stream(self.profile)
+        self.visual_model = default_stream.model
+        self.transform = default_stream.transform
 
         # 3. Stream B: Audio-Visual Sync (SyncNet Placeholder)
         # In a full production system, we would load 'wav2lip' or 'syncnet' weights here.
@@ -37,56 +270,78 @@ class DeepfakeDetector:
         self.sync_model = self._build_sync_stream().to(self.device)
         self.sync_model.eval()
 
-        self.transform = transforms.Compose([
-            transforms.Resize((380, 380)), # EfficientNet-B4 input size
-            transforms.ToTensor(),
-            transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]),
-        ])
+    def visual_stream(self, profile=None):
+        """The VisualStream used by a profile, loading it on first use."""
+        settings = get_profile(profile or self.profile)[1]
+        key = (settings["backbone"], settings["input_size"])
+        stream = self.visual_streams.get(key)
+        if stream is None:
+            with self._streams_lock:
+                stream = self.visual_streams.get(key)
+                if stream is None:
+                    stream = VisualStream(*key, self.device, self.visual_backend)
+                    self.visual_streams[key] = stream
+        return stream
 
     def _build_sync_stream(self):
         """Builds a lightweight placeholder for the SyncNet stream."""
-        model = nn.Sequential(
+        return seeded(lambda: nn.Sequential(
             nn.Linear(1024, 512),
             nn.ReLU(),
             nn.Linear(512, 1),
             nn.Sigmoid()
-        )
-        return model
+        ))
+
+    def detect_faces(self, rgb_frames):
+        """Runs MTCNN over a batch of equally sized RGB frames; returns the first face crop (or None) per frame."""
+        # mtcnn returns boxes, probs. We just check if a face exists.
+        batch_boxes, _ = self.mtcnn.detect(np.stack(rgb_frames))
+        return [
+            crop_box(frame, boxes[0]) if boxes is not None else None
+            for frame, boxes in zip(rgb_frames, batch_boxes)
+        ]
 
-    def preprocess_video(self, video_path):
-        """Extracts frames where faces are clearly visible."""
-        cap = cv2.VideoCapture(video_path)
+    def _report(self, progress, stage, frames_decoded, faces, max_faces=5):
+        """Sends a progress snapshot; the score so far is the cheap sharpness heuristic alone."""
+        if progress is None:
+            return
+        faces = faces[:max_faces]
+        progress({
+            "stage": stage,
+            "frames_decoded": frames_decoded,
+            "faces_found": len(faces),
+            "score_so_far": round(float(heuristic_scores(self.face_variances(faces)).mean()), 4) if faces else None,
+        })
+
+    def preprocess_video(self, video_path, batch_size=None, progress=None, stride=10, max_faces=5, frame_width=None):
+        """
+        Extracts frames where faces are clearly visible, as RGB face crops.
+        progress: optional fn(dict) called after each detection batch.
+        stride/max_faces/frame_width: see deepfake_profiles.
+        """
+        batch_size = batch_size or MTCNN_BATCH_SIZE
         frames = []
-        frame_indices = []
-        
-        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        if frame_count == 0: return []
-
-        # Strategy: Sample every 10th frame to save compute
-        for i in range(0, frame_count, 10):
-            cap.set(cv2.CAP_PROP_POS_FRAMES, i)
-            ret, frame = cap.read()
-            if not ret: break
-            
+        batch = []
+        frames_decoded = 0
+
+        # Strategy: Sample every 10th frame (by default) to save compute
+        for i, frame in sample_frames(video_path, stride=stride):
             # Convert BGR to RGB
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            pil_img = Image.fromarray(rgb_frame)
-            
-            # Detect face
-            # mtcnn returns boxes, probs. We just check if a face exists.
-            boxes, _ = self.mtcnn.detect(pil_img)
-            
-            if boxes is not None:
-                # Crop the first face
-                box = boxes[0]
-                face = pil_img.crop(box)
-                frames.append(face)
-            
-            if len(frames) >= 5: # Limit to 5 frames for prototype speed
+            batch.append(cv2.cvtColor(fit_width(frame, frame_width), cv2.COLOR_BGR2RGB))
+            frames_decoded += 1
+            if len(batch) < batch_size:
+                continue
+
+            frames.extend(face for face in self.detect_faces(batch) if face is not None)
+            batch = []
+            self._report(progress, "detecting_faces", frames_decoded, frames, max_faces)
+            if len(frames) >= max_faces: # Limit the face count for speed
                 break
-        
-        cap.release()
-        return frames
+
+        if batch and len(frames) < max_faces:
+            frames.extend(face for face in self.detect_faces(batch) if face is not None)
+            self._report(progress, "detecting_faces", frames_decoded, frames, max_faces)
+        return frames[:max_faces]
 
     def generate_heatmap(self, tensor_img):
         """
@@ -120,59 +375,93 @@ class DeepfakeDetector:
         _, buffer = cv2.imencode('.jpg', overlay)
         return base64.b64encode(buffer).decode('utf-8')
 
-    def detect(self, video_path):
+    def face_variances(self, faces):
+        """
+        Face sharpness (Laplacian variance) per crop. Crops differ in size, so
+        this runs per face; the mapping to scores is vectorized.
+        AI faces are often "smoother" (low frequency) than the background.
+        """
+        return [
+            cv2.Laplacian(cv2.cvtColor(face, cv2.COLOR_RGB2GRAY), cv2.CV_64F).var()
+            for face in faces
+        ]
+
+    def visual_probs(self, input_tensor, profile=None):
+        """EfficientNet fake probabilities for a stacked batch, from the profile's visual stream."""
+        return self.visual_stream(profile).probs(input_tensor)
+
+    def score_faces(self, faces, profile=None):
+        """Fake score per RGB face crop, plus the stacked input tensor."""
+        stream = self.visual_stream(profile)
+        input_tensor = torch.stack([stream.transform(Image.fromarray(face)) for face in faces])
+
+        # Stream A: Visual artifacts (Heuristic: Blur/Smoothness Mismatch)
+        heuristic = heuristic_scores(self.face_variances(faces))
+
+        # Stream B: NN (Still random/untrained, so we reduce its weight)
+        visual = stream.probs(input_tensor)
+
+        # Fusion: 80% Heuristic, 20% NN (Noise)
+        return heuristic * 0.8 + visual * 0.2, input_tensor
+
+    def detect(self, video_path, progress=None, profile=None):
         """
         Main inference pipeline.
-        Returns: { 'isFake': bool, 'confidence': float, 'heatmap': base64_str }
+        Returns: { 'isFake': bool, 'confidence': float, 'heatmap': base64_str, 'profile': str }
+        progress: optional fn(dict) receiving frames decoded, faces found and the score so far.
+        profile: name from deepfake_profiles.PROFILES; defaults to the detector's profile.
         """
-        frames = self.preprocess_video(video_path)
+        profile, settings = get_profile(profile or self.profile)
+        frames = self.preprocess_video(
+            video_path, progress=progress, stride=settings["stride"],
+            max_faces=settings["max_faces"], frame_width=settings["frame_width"],
+        )
         if not frames:
             return {"error": "No faces detected in video."}
 
-        # Run Inference on gathered frames
-        fake_scores = []
-        heatmaps = []
-
-        with torch.no_grad():
-            for face in frames:
-                # Preprocess
-                input_tensor = self.transform(face).unsqueeze(0).to(self.device)
-                
-                # Stream A: Visual artifacts (Heuristic: Blur/Smoothness Mismatch)
-                # AI faces are often "smoother" (low frequency) than the background.
-                
-                # 1. Calculate Face Sharpness (Laplacian Variance)
-                face_cv = np.array(face) 
-                face_cv = cv2.cvtColor(face_cv, cv2.COLOR_RGB2GRAY)
-                face_var = cv2.Laplacian(face_cv, cv2.CV_64F).var()
-                
-                # 2. Heuristic Score
-                # Normal sharp face ~ 300-500. Blurry/Smooth AI face < 100.
-                # We map variance to a probability: Lower var -> Higher Fake Prob.
-                
-                # Sigmoid-ish mapping: 
-                # If var < 150 (Smooth) -> High fake score.
-                # If var > 300 (Sharp) -> Low fake score.
-                
-                heuristic_score = 1.0 / (1.0 + np.exp((face_var - 150) / 50))
-                
-                # Stream B: NN (Still random/untrained, so we reduce its weight)
-                visual_logits = self.visual_model(input_tensor)
-                visual_prob = torch.sigmoid(visual_logits).item()
-                
-                # Fusion: 80% Heuristic, 20% NN (Noise)
-                score = (heuristic_score * 0.8) + (visual_prob * 0.2)
-                fake_scores.append(score)
-                
-                # Generate heatmap for the first frame only
-                if not heatmaps:
-                    heatmaps.append(self.generate_heatmap(input_tensor))
-
-        avg_score = sum(fake_scores) / len(fake_scores) if fake_scores else 0
+        fake_scores, input_tensor = self.score_faces(frames, profile)
+        avg_score = float(fake_scores.mean())
+        if progress is not None:
+            progress({"stage": "scored", "faces_found": len(frames), "score_so_far": round(avg_score, 4)})
         
         return {
             "isFake": bool(avg_score > 0.65), # Ensure native python bool
             "confidence": float(round(avg_score, 4)),
-            "heatmap": heatmaps[0] if heatmaps else None,
-            "processed_frames": len(frames)
+            "heatmap": self.generate_heatmap(input_tensor[:1]),
+            "processed_frames": len(frames),
+            "profile": profile,
+        }
+
+    def detect_image(self, image_bytes, profile=None):
+        """
+        Still-image inference, straight from the encoded bytes (JPEG/PNG/WebP...).
+        Every face MTCNN finds is scored in one batch; the image counts as fake
+        if its most suspicious face does.
+        Returns: { 'isFake': bool, 'confidence': float, 'heatmap': base64_str, 'face_scores': [float], ... }
+        """
+        profile, settings = get_profile(profile or self.profile)
+        image = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            return {"error": "Could not decode the image."}
+        rgb = cv2.cvtColor(fit_width(image, settings["frame_width"]), cv2.COLOR_BGR2RGB)
+
+        # keep_all only affects MTCNN.forward; detect() returns every box, largest first
+        boxes, _ = self.mtcnn.detect(rgb)
+        if boxes is None:
+            return {"error": "No faces detected in image."}
+        faces = [crop_box(rgb, box) for box in boxes[:settings["max_faces"]]]
+        faces = [face for face in faces if face.size]
+        if not faces:
+            return {"error": "No faces detected in image."}
+
+        fake_scores, input_tensor = self.score_faces(faces, profile)
+        worst = int(fake_scores.argmax())
+        score = float(fake_scores[worst])
+        return {
+            "isFake": bool(score > 0.65),
+            "confidence": float(round(score, 4)),
+            "heatmap": self.generate_heatmap(input_tensor[worst:worst + 1]),
+            "face_scores": [float(round(s, 4)) for s in fake_scores],
+            "processed_faces": len(faces),
+            "profile": profile,
         }
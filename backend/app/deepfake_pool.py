@@ -0,0 +1,292 @@
+import os
+import time
+import asyncio
+import itertools
+import weakref
+import threading
+import multiprocessing
+import concurrent.futures
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Deepfake inference in a dedicated process pool.
+# detect() is CPU-bound for seconds at a time; running it in the API process
+# would stall the event loop (and /analyze, voice, ...) for the whole video.
+# Each worker loads its own DeepfakeDetector once, in the pool initializer.
+# The per-job timeout starts when a worker picks the job up (reported over the
+# progress queue), so neither queueing nor a cold worker's model load counts.
+
+DEEPFAKE_WORKERS = int(os.getenv("DEEPFAKE_WORKERS", "1"))
+DEEPFAKE_TIMEOUT_SECONDS = float(os.getenv("DEEPFAKE_TIMEOUT_SECONDS", "180"))
+# Jobs allowed to wait for a free worker before new ones are rejected
+DEEPFAKE_MAX_QUEUE = int(os.getenv("DEEPFAKE_MAX_QUEUE", "8"))
+DEEPFAKE_PRELOAD = os.getenv("DEEPFAKE_PRELOAD", "1") == "1"
+
+class PoolBusyError(Exception):
+    pass
+
+class DetectionTimeoutError(Exception):
+    pass
+
+class WorkerCrashedError(Exception):
+    pass
+
+# --- Worker process side ---
+
+_detector = None
+_init_error = None
+_progress_queue = None
+
+def _init_worker(torch_threads, progress_queue):
+    global _detector, _init_error, _progress_queue
+    _progress_queue = progress_queue
+    try:
+        import torch
+        torch.set_num_threads(torch_threads)
+        try:
+            from .deepfake_detection import DeepfakeDetector
+        except ImportError:
+            from deepfake_detection import DeepfakeDetector
+        _detector = DeepfakeDetector()
+    except Exception as e:
+        # Keep the worker alive so jobs fail with a clear error instead of breaking the pool
+        print(f"Failed to load DeepfakeDetector in worker {os.getpid()}: {e}")
+        _init_error = str(e)
+
+def _ready():
+    return _detector is not None
+
+def _detect(video_path, job_id=None, profile=None):
+    if _detector is None:
+        raise RuntimeError(f"Deepfake Detector not initialized: {_init_error}")
+    progress = None
+    if job_id is not None and _progress_queue is not None:
+        progress = lambda update: _progress_queue.put(("progress", job_id, update))
+        progress({"stage": "started"})
+    return _detector.detect(video_path, progress=progress, profile=profile)
+
+def _detect_image(image_bytes, profile=None):
+    if _detector is None:
+        raise RuntimeError(f"Deepfake Detector not initialized: {_init_error}")
+    return _detector.detect_image(image_bytes, profile=profile)
+
+def _job(token, fn, *args):
+    """Runs fn(*args), first telling the API process that the job has left the queue."""
+    if _progress_queue is not None:
+        _progress_queue.put(("started", token, None))
+    return fn(*args)
+
+# --- API process side ---
+
+class DetectorPool:
+    def __init__(self, workers=DEEPFAKE_WORKERS, timeout_seconds=DEEPFAKE_TIMEOUT_SECONDS, max_queue=DEEPFAKE_MAX_QUEUE,
+                 on_progress=None):
+        """on_progress: optional fn(job_id, dict), called from a background thread for jobs run with a job_id."""
+        self.workers = max(1, workers)
+        self.timeout_seconds = timeout_seconds
+        self.max_queue = max_queue
+        self.on_progress = on_progress
+        self._context = multiprocessing.get_context("spawn")
+        self._progress_queue = None
+        self._progress_thread = None
+        self._executor = None
+        self._futures = {}  # executor -> its unfinished job futures
+        self._retired = weakref.WeakSet()  # pools replaced after a timeout, still draining
+        self._moved = set()  # futures cancelled before starting so they can run on the fresh pool
+        self._tokens = itertools.count()
+        self._starts = {}  # job token -> (loop, asyncio.Event) set once a worker picks the job up
+        self._in_flight = 0
+        self._counters = {
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "timeouts": 0,
+            "crashes": 0,
+            "restarts": 0,
+            "total_latency_ms": 0.0,
+            "max_in_flight": 0,
+        }
+
+    def _create_executor(self):
+        # spawn: forking a process that already holds torch/OpenMP threads is unsafe
+        torch_threads = max(1, (os.cpu_count() or 1) // self.workers)
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=self._context,
+            initializer=_init_worker,
+            initargs=(torch_threads, self._progress_queue),
+        )
+
+    def _drain_progress(self, queue):
+        while True:
+            item = queue.get()
+            if item is None:
+                return
+            kind, key, update = item
+            if kind == "started":
+                waiter = self._starts.get(key)
+                if waiter is not None:
+                    loop, started = waiter
+                    loop.call_soon_threadsafe(started.set)
+                continue
+            if self.on_progress is None:
+                continue
+            try:
+                self.on_progress(key, update)
+            except Exception as e:
+                print(f"Deepfake progress callback error: {e}")
+
+    def start(self, preload=DEEPFAKE_PRELOAD):
+        if self._progress_queue is None:
+            self._progress_queue = self._context.Queue()
+            self._progress_thread = threading.Thread(
+                target=self._drain_progress, args=(self._progress_queue,), daemon=True
+            )
+            self._progress_thread.start()
+        if self._executor is None:
+            self._executor = self._create_executor()
+            if preload:
+                # One no-op per worker makes every process start and load its model now
+                for _ in range(self.workers):
+                    self._executor.submit(_ready)
+
+    @staticmethod
+    def _terminate(executor):
+        # Forget the jobs cancelled by _retire first: once the processes die the pool's
+        # management thread fails every pending job, and a cancelled future cannot be failed
+        pending = getattr(executor, "_pending_work_items", None) or {}
+        for work_id, item in list(pending.items()):
+            if item.future.cancelled():
+                pending.pop(work_id, None)
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            process.terminate()
+        # The remaining jobs fail with BrokenProcessPool and are resubmitted or reported by _run
+        executor.shutdown(wait=False)
+
+    def _restart(self):
+        """Replaces a broken pool (a worker died, so all of its jobs already failed) with a fresh one."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            self._futures.pop(executor, None)
+            self._terminate(executor)
+        self._counters["restarts"] += 1
+        self.start()
+
+    def _retire(self, stuck):
+        """
+        Swaps out the pool holding a stuck job without killing the other jobs in it.
+        New and not yet started jobs go to a fresh pool; jobs already running on
+        healthy workers get up to timeout_seconds to finish, then the old pool's
+        processes, the stuck one included, are terminated.
+        """
+        executor, self._executor = self._executor, None
+        self._retired.add(executor)
+        self._counters["restarts"] += 1
+        self.start()
+        running = []
+        for future in self._futures.pop(executor, set()) - {stuck}:
+            self._moved.add(future)
+            if not future.cancel():
+                self._moved.discard(future)
+                running.append(future)
+        # With one worker nothing else can be executing: whatever is left is queued
+        # behind the stuck job and gets resubmitted once the old pool is terminated
+        wait_seconds = self.timeout_seconds if self.workers > 1 else 0
+        threading.Thread(
+            target=self._drain_and_terminate, args=(executor, running, wait_seconds), daemon=True
+        ).start()
+
+    def _drain_and_terminate(self, executor, futures, wait_seconds):
+        if futures and wait_seconds:
+            concurrent.futures.wait(futures, timeout=wait_seconds)
+        self._terminate(executor)
+
+    def is_full(self):
+        return self._in_flight >= self.workers + self.max_queue
+
+    async def detect(self, video_path, job_id=None, profile=None):
+        """Runs DeepfakeDetector.detect(video_path, profile=profile) in a worker process, reporting progress for job_id."""
+        return await self._run(_detect, video_path, job_id, profile)
+
+    async def detect_image(self, image_bytes, profile=None):
+        """Runs DeepfakeDetector.detect_image(image_bytes, profile=profile) in a worker process."""
+        return await self._run(_detect_image, image_bytes, profile)
+
+    async def _run(self, fn, *args):
+        if self.is_full():
+            self._counters["rejected"] += 1
+            raise PoolBusyError("Deepfake analysis queue is full. Please retry shortly.")
+        self._in_flight += 1
+        self._counters["max_in_flight"] = max(self._counters["max_in_flight"], self._in_flight)
+        start = time.perf_counter()
+        resubmitted = False
+        try:
+            while True:
+                self.start()
+                executor = self._executor
+                token = next(self._tokens)
+                started = asyncio.Event()
+                self._starts[token] = (asyncio.get_running_loop(), started)
+                future = executor.submit(_job, token, fn, *args)
+                self._futures.setdefault(executor, set()).add(future)
+                job = asyncio.wrap_future(future)
+                started_wait = asyncio.ensure_future(started.wait())
+                try:
+                    # No deadline while queued or while a cold worker loads its model
+                    await asyncio.wait({job, started_wait}, return_when=asyncio.FIRST_COMPLETED)
+                    result = await asyncio.wait_for(job, self.timeout_seconds)
+                    self._counters["completed"] += 1
+                    return result
+                except asyncio.CancelledError:
+                    if future in self._moved:
+                        # Queued in a pool retired by another job's timeout; run it on the fresh pool
+                        self._moved.discard(future)
+                        continue
+                    job.cancel()  # the caller gave up; drop the job if it has not started yet
+                    raise
+                except asyncio.TimeoutError:
+                    self._counters["timeouts"] += 1
+                    # This job itself ran past the deadline and cannot be cancelled; its worker has to go
+                    if self._executor is executor:
+                        self._retire(future)
+                    raise DetectionTimeoutError(f"Deepfake analysis exceeded {self.timeout_seconds:g}s.")
+                except BrokenProcessPool:
+                    if executor in self._retired and not resubmitted:
+                        # Was waiting behind the stuck worker when its pool was terminated
+                        resubmitted = True
+                        continue
+                    self._counters["crashes"] += 1
+                    if self._executor is executor:
+                        self._restart()
+                    raise WorkerCrashedError("Deepfake worker crashed during the analysis.")
+                except Exception:
+                    self._counters["failed"] += 1
+                    raise
+                finally:
+                    started_wait.cancel()
+                    self._starts.pop(token, None)
+                    self._futures.get(executor, set()).discard(future)
+        finally:
+            self._in_flight -= 1
+            self._counters["total_latency_ms"] += (time.perf_counter() - start) * 1000
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._progress_queue is not None:
+            self._progress_queue.put(None)
+            self._progress_queue = None
+
+    def stats(self):
+        finished = self._counters["completed"] + self._counters["failed"] + self._counters["timeouts"] + self._counters["crashes"]
+        return {
+            "workers": self.workers,
+            "timeout_seconds": self.timeout_seconds,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "running": min(self._in_flight, self.workers),
+            "queued": max(0, self._in_flight - self.workers),
+            **{k: v for k, v in self._counters.items() if k != "total_latency_ms"},
+            "avg_latency_ms": round(self._counters["total_latency_ms"] / finished, 1) if finished else 0.0,
+        }
@@ -0,0 +1,47 @@
+import os
+
+# Named speed/accuracy trade-offs for DeepfakeDetector, selectable per request.
+#   stride      - analyze every n-th decoded frame
+#   max_faces   - stop sampling once this many face crops were found
+#   frame_width - frames wider than this are downscaled before MTCNN (None: full size)
+#   backbone    - EfficientNet variant of the visual stream
+#   input_size  - face crop resolution fed to the backbone
+# "balanced" is the original configuration. Kept free of torch/cv2 imports so
+# the API process can validate profile names without loading the models.
+
+PROFILES = {
+    "fast": {
+        "stride": 15,
+        "max_faces": 3,
+        "frame_width": 640,
+        "backbone": "efficientnet_b0",
+        "input_size": 224,
+    },
+    "balanced": {
+        "stride": 10,
+        "max_faces": 5,
+        "frame_width": None,
+        "backbone": "efficientnet_b4",
+        "input_size": 380,
+    },
+    "thorough": {
+        "stride": 3,
+        "max_faces": 15,
+        "frame_width": None,
+        "backbone": "efficientnet_b4",
+        "input_size": 380,
+    },
+}
+
+DEFAULT_PROFILE = os.getenv("DEEPFAKE_PROFILE", "balanced")
+
+def get_profile(name=None):
+    """Returns (name, settings); raises ValueError for unknown profile names."""
+    name = name or DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Unknown deepfake profile '{name}'. Choose one of: {', '.join(PROFILES)}.")
+    return name, PROFILES[name]
+
+# Identifies the detector's models and scoring; bump it whenever they change so
+# results cached under the old version are no longer served.
+DETECTOR_VERSION = "efficientnet-heuristic-2"
@@ -0,0 +1,120 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+try:
+    from .cache import DEFAULT_CACHE_DIR
+except ImportError:
+    from cache import DEFAULT_CACHE_DIR
+
+# Local store for asynchronous deepfake analysis jobs.
+# Clients submit a video, get a job id back immediately and poll for progress
+# and the result, so no HTTP connection stays open for the whole analysis.
+# Jobs (and their results) are removed once they are older than the TTL.
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+class JobStore:
+    def __init__(self, path=None, ttl_seconds=24 * 3600):
+        self.path = path or os.path.join(DEFAULT_CACHE_DIR, "jobs.sqlite3")
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, status TEXT NOT NULL, progress TEXT NOT NULL, result TEXT, "
+            "error TEXT, error_status INTEGER, meta TEXT NOT NULL, created REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_created ON jobs (created)")
+        self._db.commit()
+
+    def create(self, **meta):
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, status, progress, meta, created, updated) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, "{}", json.dumps(meta), now, now),
+            )
+            self._db.commit()
+        return job_id
+
+    def update(self, job_id, status=None, progress=None, result=None, error=None, error_status=None):
+        """Updates a job; progress is merged into the stored progress dict."""
+        with self._lock:
+            row = self._db.execute("SELECT progress FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return False
+            merged = {**json.loads(row[0]), **(progress or {})}
+            self._db.execute(
+                "UPDATE jobs SET status = COALESCE(?, status), progress = ?, result = COALESCE(?, result), "
+                "error = COALESCE(?, error), error_status = COALESCE(?, error_status), updated = ? WHERE id = ?",
+                (status, json.dumps(merged), json.dumps(result) if result is not None else None,
+                 error, error_status, time.time(), job_id),
+            )
+            self._db.commit()
+            return True
+
+    def record_progress(self, job_id, progress):
+        """Merges worker progress; the first report moves a queued job to running."""
+        with self._lock:
+            row = self._db.execute("SELECT progress FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return
+            self._db.execute(
+                "UPDATE jobs SET status = CASE WHEN status = ? THEN ? ELSE status END, progress = ?, updated = ? "
+                "WHERE id = ?",
+                (QUEUED, RUNNING, json.dumps({**json.loads(row[0]), **progress}), time.time(), job_id),
+            )
+            self._db.commit()
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, status, progress, result, error, error_status, meta, created, updated FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None or time.time() - row[7] > self.ttl_seconds:
+            return None
+        return {
+            "id": row[0],
+            "status": row[1],
+            "progress": json.loads(row[2]),
+            "result": json.loads(row[3]) if row[3] is not None else None,
+            "error": row[4],
+            "error_status": row[5],
+            "meta": json.loads(row[6]),
+            "created": row[7],
+            "updated": row[8],
+        }
+
+    def purge_expired(self):
+        """Deletes jobs older than the TTL; returns their metadata (e.g. to remove leftover files)."""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            rows = self._db.execute("SELECT meta FROM jobs WHERE created < ?", (cutoff,)).fetchall()
+            self._db.execute("DELETE FROM jobs WHERE created < ?", (cutoff,))
+            self._db.commit()
+        return [json.loads(meta) for (meta,) in rows]
+
+    def fail_unfinished(self, error):
+        """Marks queued/running jobs as failed, e.g. after a restart lost their workers."""
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET status = ?, error = ?, error_status = 500, updated = ? WHERE status IN (?, ?)",
+                (FAILED, error, time.time(), QUEUED, RUNNING),
+            )
+            self._db.commit()
+            return cursor.rowcount
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {"ttl_seconds": self.ttl_seconds, **{s: counts.get(s, 0) for s in (QUEUED, RUNNING, DONE, FAILED)}}
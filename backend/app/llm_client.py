@@ -0,0 +1,35 @@
+import os
+import httpx
+from groq import AsyncGroq
+
+# Async LLM client layer.
+# Every handler awaits these clients instead of calling the blocking Groq SDK,
+# so a single uvicorn worker can keep many completions in flight at once.
+
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "500"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "100"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+
+_clients = []
+
+def create_groq_client(api_key):
+    """Builds an AsyncGroq client on top of a pooled httpx.AsyncClient."""
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE,
+        ),
+        timeout=httpx.Timeout(LLM_TIMEOUT_SECONDS, connect=10.0),
+    )
+    client = AsyncGroq(api_key=api_key, http_client=http_client)
+    _clients.append(client)
+    return client
+
+async def close_clients():
+    """Closes every client created by this module (called on app shutdown)."""
+    while _clients:
+        client = _clients.pop()
+        try:
+            await client.close()
+        except Exception as e:
+            print(f"LLM client close error: {e}")
@@ -1,26 +1,80 @@
 import os
 import json
+import hmac
 import tempfile
 import base64
 import io
-import httpx
-from fastapi import FastAPI, HTTPException, File, UploadFile
-from fastapi.responses import JSONResponse
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, File, UploadFile, Header
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from gtts import gTTS
 from pydantic import BaseModel
 from typing import List, Optional
-from groq import Groq
 from dotenv import load_dotenv
+
+# Load environment variables from .env file (before the app modules, which read settings at import)
+load_dotenv(override=True)
+
 try:
-    from deepfake_detection import DeepfakeDetector
+    from deepfake_pool import DetectorPool, PoolBusyError, DetectionTimeoutError, WorkerCrashedError
+    from jobs import JobStore, DONE, FAILED
+    from video_index import VideoFingerprintIndex, video_fingerprint
+    from youtube import YouTubeFetcher, YouTubeFetchError, youtube_video_id
+    from deepfake_profiles import PROFILES, DEFAULT_PROFILE, DETECTOR_VERSION, get_profile
+    from uploads import save_upload, read_upload, upload_suffix, UploadLimitMiddleware, MAX_VIDEO_UPLOAD_BYTES, MAX_IMAGE_UPLOAD_BYTES
+    from llm_client import create_groq_client, close_clients
+    from cache import TwoTierCache, claim_key, make_key, normalize_text
+    from rumor_index import RumorIndex
+    from singleflight import SingleFlight
+    from refresher import BackgroundRefresher
+    from sse import SSE_HEADERS, sse_event, JsonFieldStream
+    import sarvam
+    from voice_pipeline import sentences_from, synthesize_in_order
 except ImportError:
-    from .deepfake_detection import DeepfakeDetector
+    from .deepfake_pool import DetectorPool, PoolBusyError, DetectionTimeoutError, WorkerCrashedError
+    from .jobs import JobStore, DONE, FAILED
+    from .video_index import VideoFingerprintIndex, video_fingerprint
+    from .youtube import YouTubeFetcher, YouTubeFetchError, youtube_video_id
+    from .deepfake_profiles import PROFILES, DEFAULT_PROFILE, DETECTOR_VERSION, get_profile
+    from .uploads import save_upload, read_upload, upload_suffix, UploadLimitMiddleware, MAX_VIDEO_UPLOAD_BYTES, MAX_IMAGE_UPLOAD_BYTES
+    from .llm_client import create_groq_client, close_clients
+    from .cache import TwoTierCache, claim_key, make_key, normalize_text
+    from .rumor_index import RumorIndex
+    from .singleflight import SingleFlight
+    from .refresher import BackgroundRefresher
+    from .sse import SSE_HEADERS, sse_event, JsonFieldStream
+    from . import sarvam
+    from .voice_pipeline import sentences_from, synthesize_in_order
 
-# Load environment variables from .env file
-load_dotenv(override=True)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if NEWS_REFRESH_ENABLED:
+        news_refresher.start()
+    deepfake_pool.start()
+    job_store.fail_unfinished("Server restarted before the job finished.")
+    purge_task = asyncio.create_task(purge_deepfake_jobs())
+    yield
+    purge_task.cancel()
+    for task in list(deepfake_jobs):
+        task.cancel()
+    deepfake_pool.shutdown()
+    await news_refresher.stop()
+    await close_clients()
+    await sarvam.close_client()
+
+app = FastAPI(title="Bhartiya-Election AI Backend", lifespan=lifespan)
 
-app = FastAPI(title="Bhartiya-Election AI Backend")
+# Reject oversized media uploads by Content-Length before the body is read
+# (added before CORS so the 413 still carries CORS headers)
+app.add_middleware(UploadLimitMiddleware, limits={
+    "/detect-deepfake": MAX_VIDEO_UPLOAD_BYTES,
+    "/detect-deepfake/jobs": MAX_VIDEO_UPLOAD_BYTES,
+    "/detect-deepfake/fingerprints": MAX_VIDEO_UPLOAD_BYTES,
+    "/detect-deepfake-image": MAX_IMAGE_UPLOAD_BYTES,
+})
 
 # Enable CORS
 app.add_middleware(
@@ -50,6 +104,23 @@ class AnalyzeResponse(BaseModel):
     originalText: str
     explanation: Explanation
     contextLinks: List[ContextLink]
+    # Set when the verdict was served from the near-duplicate rumor index
+    matchedClaim: Optional[str] = None
+    similarity: Optional[float] = None
+
+class BatchAnalyzeRequest(BaseModel):
+    items: List[AnalyzeRequest]
+    concurrency: Optional[int] = None
+    stream: bool = False
+
+class BatchAnalyzeItem(BaseModel):
+    index: int
+    result: Optional[AnalyzeResponse] = None
+    error: Optional[str] = None
+    cached: bool = False
+
+class BatchAnalyzeResponse(BaseModel):
+    results: List[BatchAnalyzeItem]
 
 class ConstitutionalRequest(BaseModel):
     query: str
@@ -61,6 +132,15 @@ class ConstitutionalResponse(BaseModel):
     neutral_summation: str
     citations: List[str]
 
+class TranslateBatchRequest(BaseModel):
+    texts: List[str]
+    target_language: str
+
+class TranslateBatchResponse(BaseModel):
+    translations: List[str]
+    cached: int
+    llm_calls: int
+
 class NewsRequest(BaseModel):
     language: str
 
@@ -79,7 +159,7 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 if not GROQ_API_KEY:
     print("WARNING: GROQ_API_KEY not found in environment variables.")
 
-groq_client = Groq(api_key=GROQ_API_KEY)
+groq_client = create_groq_client(GROQ_API_KEY)
 
 # Separate Groq Client for Voice AI
 VOICE_GROQ_API_KEY = os.getenv("VOICE_GROQ_API_KEY")
@@ -87,34 +167,114 @@ if not VOICE_GROQ_API_KEY:
     print("WARNING: VOICE_GROQ_API_KEY not found, falling back to GROQ_API_KEY")
     VOICE_GROQ_API_KEY = GROQ_API_KEY
 
-voice_groq_client = Groq(api_key=VOICE_GROQ_API_KEY)
+voice_groq_client = create_groq_client(VOICE_GROQ_API_KEY)
 
 # --- Sarvam AI Configuration (for Voice) ---
-SARVAM_API_KEY = os.getenv("SARVAM_AI_API_KEY")
-SARVAM_STT_URL = "https://api.sarvam.ai/speech-to-text"
-SARVAM_TTS_URL = "https://api.sarvam.ai/text-to-speech"
+# Requests go through the process-wide pooled client in sarvam.py, which reads SARVAM_AI_API_KEY per call
 
-# Initialize Deepfake Detector
-deepfake_detector = None
-try:
-    deepfake_detector = DeepfakeDetector()
-except Exception as e:
-    print(f"Failed to load DeepfakeDetector: {e}")
+# --- Verdict Cache (LRU in front of SQLite) ---
+verdict_cache = TwoTierCache(
+    "verdicts",
+    path=os.getenv("VERDICT_CACHE_PATH"),
+    ttl_seconds=float(os.getenv("VERDICT_CACHE_TTL_SECONDS", 7 * 24 * 3600)),
+    max_memory_entries=int(os.getenv("VERDICT_CACHE_MEMORY_ENTRIES", "2048")),
+    max_disk_entries=int(os.getenv("VERDICT_CACHE_DISK_ENTRIES", "200000")),
+)
+
+# Near-duplicate index over previously verified claims
+rumor_index = RumorIndex(
+    path=os.getenv("RUMOR_INDEX_PATH"),
+    threshold=float(os.getenv("RUMOR_MATCH_THRESHOLD", "0.8")),
+    max_entries=int(os.getenv("RUMOR_INDEX_MAX_ENTRIES", "50000")),
+)
+
+# Identical in-flight requests share one upstream LLM call
+verdict_flight = SingleFlight("analyze")
+constitutional_flight = SingleFlight("chat-constitutional")
+
+# Batch fact-checking limits
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "500"))
+BATCH_DEFAULT_CONCURRENCY = int(os.getenv("BATCH_DEFAULT_CONCURRENCY", "8"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "32"))
+
+# Shared secret for the cache/index administration endpoints; unset disables them
+CACHE_ADMIN_TOKEN = os.getenv("CACHE_ADMIN_TOKEN")
+
+def require_admin(token: Optional[str]):
+    """Fails closed: without a configured CACHE_ADMIN_TOKEN every admin request is refused."""
+    if not CACHE_ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (CACHE_ADMIN_TOKEN not set).")
+    if not hmac.compare_digest((token or "").encode(), CACHE_ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token.")
+
+# --- Deepfake Result Cache (keyed by the SHA-256 of the uploaded bytes) ---
+# Re-uploads of the same clip skip decoding and inference entirely
+deepfake_result_cache = TwoTierCache(
+    "deepfake_results",
+    path=os.getenv("DEEPFAKE_RESULT_CACHE_PATH"),
+    ttl_seconds=float(os.getenv("DEEPFAKE_RESULT_CACHE_TTL_SECONDS", 30 * 24 * 3600)),
+    max_memory_entries=int(os.getenv("DEEPFAKE_RESULT_CACHE_MEMORY_ENTRIES", "256")),
+    max_disk_entries=int(os.getenv("DEEPFAKE_RESULT_CACHE_DISK_ENTRIES", "20000")),
+)
+
+def deepfake_result_key(sha256, profile, kind="deepfake"):
+    """
+    Changing the detector version or the profile's settings yields new keys.
+    kind keeps the video and still-image routes apart for the same bytes.
+    """
+    return make_key(kind, DETECTOR_VERSION, profile, json.dumps(PROFILES[profile], sort_keys=True), sha256)
+
+# Perceptual fingerprints of analyzed clips and known deepfakes; catches
+# re-encoded copies whose bytes (and so SHA-256) differ
+video_index = VideoFingerprintIndex(
+    path=os.getenv("VIDEO_INDEX_PATH"),
+    max_distance=int(os.getenv("VIDEO_MATCH_MAX_DISTANCE", "10")),
+    threshold=float(os.getenv("VIDEO_MATCH_THRESHOLD", "0.6")),
+    max_entries=int(os.getenv("VIDEO_INDEX_MAX_ENTRIES", "5000")),
+    version=DETECTOR_VERSION,
+)
+
+def match_result(entry, similarity):
+    """The stored result of a perceptually matching clip, annotated with that reference."""
+    return {
+        **entry["result"],
+        "match": {"reference": entry["key"], "label": entry["label"], "note": entry["note"], "similarity": similarity},
+    }
+
+async def analyze_upload(video_path, sha256, profile, job_id=None):
+    """
+    Result for an upload missing from the result cache: a fingerprint match if
+    the clip (or a re-encode of it) was seen before, else a fresh detection.
+    The outcome is cached under the upload's hash either way.
+    """
+    fingerprint = await asyncio.to_thread(video_fingerprint, video_path)
+    match = await asyncio.to_thread(video_index.query, fingerprint)
+    if match is not None:
+        result = match_result(*match)
+    else:
+        result = await deepfake_pool.detect(video_path, job_id=job_id, profile=profile)
+        if "error" not in result:
+            video_index.add(sha256, fingerprint, result)
+    deepfake_result_cache.set(deepfake_result_key(sha256, profile), result)
+    return result
+
+# Asynchronous deepfake jobs: uploads wait in DEEPFAKE_JOB_DIR until analyzed
+job_store = JobStore(
+    path=os.getenv("DEEPFAKE_JOBS_PATH"),
+    ttl_seconds=float(os.getenv("DEEPFAKE_JOB_TTL_SECONDS", 24 * 3600)),
+)
+DEEPFAKE_JOB_DIR = os.getenv("DEEPFAKE_JOB_DIR", os.path.join(tempfile.gettempdir(), "satya_jobs"))
+DEEPFAKE_JOB_PURGE_SECONDS = float(os.getenv("DEEPFAKE_JOB_PURGE_SECONDS", 600))
+deepfake_jobs = set()
+
+# Deepfake detection runs in worker processes, each with its own DeepfakeDetector
+deepfake_pool = DetectorPool(on_progress=job_store.record_progress)
 
 @app.get("/")
 def read_root():
     return {"message": "Bhartiya-Election AI Backend (Groq Powered) is running"}
 
-@app.post("/analyze", response_model=AnalyzeResponse)
-async def analyze_rumor(request: AnalyzeRequest):
-    query_text = request.text
-    print(f"Analyzing with Groq: {query_text}")
-
-    if not GROQ_API_KEY:
-        raise HTTPException(status_code=500, detail="Server Error: Groq API Key not configured.")
-
-    try:
-        system_prompt = """You are an expert Fact Checker and Rumor Buster for the Indian Election context. 
+ANALYZE_SYSTEM_PROMPT = """You are an expert Fact Checker and Rumor Buster for the Indian Election context. 
 Your task is to verify rumors and misinformation with high precision.
 
 CRITICAL: You MUST output ONLY valid JSON. Do NOT include markdown code blocks, explanations, or any text outside the JSON object.
@@ -139,52 +299,262 @@ Output must be a strictly valid JSON object with the following schema:
 IMPORTANT: All text fields (reason, title, excerpt) MUST be in ENGLISH to ensure valid JSON encoding.
 If the claim is VAGUE or OPINION, treat it as 'isFake': false but low confidence."""
 
-        response = groq_client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Verify this claim in English: '{query_text}'"}
-            ],
-            temperature=0.2,
-            max_tokens=2048,
-            response_format={"type": "json_object"}
-        )
-        
-        response_text = response.choices[0].message.content
-        data = json.loads(response_text)
-        
-        return AnalyzeResponse(
-            isFake=data.get("isFake", False),
-            confidence=data.get("confidence", 0.0),
-            originalText=query_text,
-            explanation=Explanation(
-                highlightedWords=data.get("explanation", {}).get("highlightedWords", []),
-                reason=data.get("explanation", {}).get("reason", "No explanation provided.")
-            ),
-            contextLinks=[
-                ContextLink(
-                    title=link.get("title", "Source"),
-                    excerpt=link.get("excerpt", ""),
-                    url=link.get("url", "#")
-                ) for link in data.get("contextLinks", [])
-            ]
-        )
+def lookup_verdict(query_text: str, language: Optional[str]) -> Optional[AnalyzeResponse]:
+    """Serves a claim from the verdict cache or the near-duplicate index, if possible."""
+    cached = verdict_cache.get(claim_key(query_text, language))
+    if cached is not None:
+        return AnalyzeResponse(**{**cached, "originalText": query_text})
+
+    match = rumor_index.query(query_text, language)
+    if match is not None:
+        entry, score = match
+        print(f"Near-duplicate of: {entry['text']} ({score})")
+        return AnalyzeResponse(**{
+            **entry["response"],
+            "originalText": query_text,
+            "matchedClaim": entry["text"],
+            "similarity": score,
+        })
+    return None
+
+def analyze_messages(query_text: str) -> List[dict]:
+    return [
+        {"role": "system", "content": ANALYZE_SYSTEM_PROMPT},
+        {"role": "user", "content": f"Verify this claim in English: '{query_text}'"}
+    ]
+
+def build_verdict(query_text: str, data: dict) -> AnalyzeResponse:
+    return AnalyzeResponse(
+        isFake=data.get("isFake", False),
+        confidence=data.get("confidence", 0.0),
+        originalText=query_text,
+        explanation=Explanation(
+            highlightedWords=data.get("explanation", {}).get("highlightedWords", []),
+            reason=data.get("explanation", {}).get("reason", "No explanation provided.")
+        ),
+        contextLinks=[
+            ContextLink(
+                title=link.get("title", "Source"),
+                excerpt=link.get("excerpt", ""),
+                url=link.get("url", "#")
+            ) for link in data.get("contextLinks", [])
+        ]
+    )
+
+def store_verdict(query_text: str, language: Optional[str], result: AnalyzeResponse):
+    verdict_cache.set(claim_key(query_text, language), result.model_dump())
+    rumor_index.add(query_text, language, result.model_dump())
+
+async def fetch_verdict(query_text: str, language: Optional[str]) -> AnalyzeResponse:
+    """Asks the LLM for a fresh verdict and stores it. Raises on upstream failure."""
+    response = await groq_client.chat.completions.create(
+        model="llama-3.3-70b-versatile",
+        messages=analyze_messages(query_text),
+        temperature=0.2,
+        max_tokens=2048,
+        response_format={"type": "json_object"}
+    )
+    
+    response_text = response.choices[0].message.content
+    data = json.loads(response_text)
+    
+    result = build_verdict(query_text, data)
+    store_verdict(query_text, language, result)
+    return result
+
+def fallback_verdict(query_text: str) -> AnalyzeResponse:
+    return AnalyzeResponse(
+        isFake=False,
+        confidence=0.0,
+        originalText=query_text,
+        explanation=Explanation(highlightedWords=[], reason="Error connecting to AI verification service."),
+        contextLinks=[]
+    )
+
+@app.post("/analyze", response_model=AnalyzeResponse)
+async def analyze_rumor(request: AnalyzeRequest):
+    query_text = request.text
+    print(f"Analyzing with Groq: {query_text}")
+
+    cached = lookup_verdict(query_text, request.language)
+    if cached is not None:
+        return cached
+
+    if not GROQ_API_KEY:
+        raise HTTPException(status_code=500, detail="Server Error: Groq API Key not configured.")
 
+    try:
+        result = await verdict_flight.do(
+            claim_key(query_text, request.language),
+            lambda: fetch_verdict(query_text, request.language),
+        )
+        return result.model_copy(update={"originalText": query_text})
     except Exception as e:
         print(f"Groq Error: {e}")
-        return AnalyzeResponse(
-            isFake=False,
-            confidence=0.0,
-            originalText=query_text,
-            explanation=Explanation(highlightedWords=[], reason="Error connecting to AI verification service."),
-            contextLinks=[]
-        )
+        return fallback_verdict(query_text)
 
-@app.post("/chat-constitutional", response_model=ConstitutionalResponse)
-async def chat_constitutional(request: ConstitutionalRequest):
-    print(f"Constitutional Query: {request.query}")
-    try:
-        system_prompt = """You are a Neutral Constitutional Expert operating under a 'Veil of Ignorance' (Rawlsian Fairness).
+REQUIRED_VERDICT_FIELDS = ("isFake", "confidence", "explanation")
+
+def verdict_events(key: str, fields: dict):
+    """Maps a completed top-level field of the verdict JSON to the SSE events it unlocks."""
+    if key in ("isFake", "confidence") and "isFake" in fields and "confidence" in fields:
+        yield sse_event("verdict", {"isFake": fields["isFake"], "confidence": fields["confidence"]})
+    elif key == "explanation":
+        yield sse_event("explanation", fields["explanation"])
+    elif key == "contextLinks":
+        yield sse_event("links", fields["contextLinks"])
+
+@app.post("/analyze/stream")
+async def analyze_rumor_stream(request: AnalyzeRequest):
+    """
+    Server-Sent Events variant of /analyze.
+    Emits `verdict`, `explanation` and `links` as soon as the model has produced
+    each field, then a final `result` event carrying the usual AnalyzeResponse.
+    """
+    query_text = request.text
+    print(f"Analyzing with Groq (stream): {query_text}")
+
+    async def events():
+        cached = lookup_verdict(query_text, request.language)
+        if cached is not None:
+            data = cached.model_dump()
+            for key in ("confidence", "explanation", "contextLinks"):
+                for event in verdict_events(key, data):
+                    yield event
+            yield sse_event("result", data)
+            return
+
+        if not GROQ_API_KEY:
+            yield sse_event("error", {"detail": "Server Error: Groq API Key not configured."})
+            return
+
+        try:
+            # JSON mode cannot be combined with streaming; the system prompt already demands bare JSON
+            stream = await groq_client.chat.completions.create(
+                model="llama-3.3-70b-versatile",
+                messages=analyze_messages(query_text),
+                temperature=0.2,
+                max_tokens=2048,
+                stream=True
+            )
+            parser = JsonFieldStream()
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                for key, _ in parser.feed(delta):
+                    for event in verdict_events(key, parser.fields):
+                        yield event
+
+            # A cut-off or unparseable stream must not be filled with defaults and cached
+            missing = [key for key in REQUIRED_VERDICT_FIELDS if key not in parser.fields]
+            if missing:
+                raise ValueError(f"Incomplete verdict stream, missing {', '.join(missing)}")
+            result = build_verdict(query_text, parser.fields)
+            store_verdict(query_text, request.language, result)
+            yield sse_event("result", result.model_dump())
+        except Exception as e:
+            print(f"Groq Stream Error: {e}")
+            yield sse_event("error", {"detail": "Error connecting to AI verification service."})
+            yield sse_event("result", fallback_verdict(query_text).model_dump())
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@app.post("/analyze-batch")
+async def analyze_batch(request: BatchAnalyzeRequest):
+    """
+    Verifies many claims in one call.
+    Duplicate claims are verified once, cache hits are answered immediately and
+    the remaining claims fan out to the LLM under a concurrency limit.
+    With stream=true, items are written as NDJSON in completion order.
+    """
+    if len(request.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {BATCH_MAX_ITEMS} items).")
+
+    concurrency = max(1, min(request.concurrency or BATCH_DEFAULT_CONCURRENCY, BATCH_MAX_CONCURRENCY))
+    print(f"Batch Analyze: {len(request.items)} items (concurrency {concurrency})")
+
+    # Group item indices by normalized claim so each distinct claim is verified once
+    groups = {}
+    for index, item in enumerate(request.items):
+        groups.setdefault(claim_key(item.text, item.language), []).append(index)
+
+    def expand(indices, result=None, error=None, cached=False):
+        return [
+            BatchAnalyzeItem(
+                index=i,
+                result=result.model_copy(update={"originalText": request.items[i].text}) if result else None,
+                error=error,
+                cached=cached,
+            )
+            for i in indices
+        ]
+
+    immediate, pending = [], []
+    for indices in groups.values():
+        first = request.items[indices[0]]
+        cached = lookup_verdict(first.text, first.language)
+        if cached is not None:
+            immediate.extend(expand(indices, result=cached, cached=True))
+        else:
+            pending.append(indices)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def verify(indices):
+        first = request.items[indices[0]]
+        if not GROQ_API_KEY:
+            return expand(indices, error="Groq API Key not configured.")
+        async with semaphore:
+            try:
+                result = await verdict_flight.do(
+                    claim_key(first.text, first.language),
+                    lambda: fetch_verdict(first.text, first.language),
+                )
+                return expand(indices, result=result)
+            except Exception as e:
+                print(f"Batch Groq Error: {e}")
+                return expand(indices, error=str(e))
+
+    tasks = [asyncio.ensure_future(verify(indices)) for indices in pending]
+
+    if request.stream:
+        async def ndjson():
+            try:
+                for item in immediate:
+                    yield item.model_dump_json() + "\n"
+                for next_done in asyncio.as_completed(tasks):
+                    for item in await next_done:
+                        yield item.model_dump_json() + "\n"
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    results = list(immediate)
+    for items in await asyncio.gather(*tasks):
+        results.extend(items)
+    results.sort(key=lambda item: item.index)
+    return BatchAnalyzeResponse(results=results)
+
+@app.get("/analyze/cache/stats")
+def verdict_cache_stats():
+    return {"verdicts": verdict_cache.stats(), "rumor_index": rumor_index.stats()}
+
+@app.post("/analyze/cache/purge")
+def purge_verdict(request: AnalyzeRequest, x_admin_token: Optional[str] = Header(None)):
+    """Drops the cached verdict for a claim, e.g. after a fact-check correction."""
+    require_admin(x_admin_token)
+    purged = verdict_cache.delete(claim_key(request.text, request.language))
+    unindexed = rumor_index.remove(request.text, request.language)
+    return {"purged": purged or unindexed}
+
+@app.get("/coalescing/stats")
+def coalescing_stats():
+    return {"analyze": verdict_flight.stats(), "chat_constitutional": constitutional_flight.stats()}
+
+CONSTITUTIONAL_SYSTEM_PROMPT = """You are a Neutral Constitutional Expert operating under a 'Veil of Ignorance' (Rawlsian Fairness).
 Your goal is to provide a perfectly symmetrical analysis of political topics like 'One Nation One Election' (ONOE).
 
 RULES:
@@ -201,34 +571,193 @@ OUTPUT SCHEMA (JSON):
     "citations": ["Kovind Report Pg 45", "Article 83(2)", "ECI Notification 2024"]
 }"""
 
-        response = groq_client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
+def constitutional_messages(query: str, language: Optional[str]) -> List[dict]:
+    return [
+        {"role": "system", "content": CONSTITUTIONAL_SYSTEM_PROMPT},
+        {"role": "user", "content": f"Analyze this topic: '{query}'. Language: {language}"}
+    ]
+
+def build_constitutional(data: dict) -> ConstitutionalResponse:
+    return ConstitutionalResponse(
+        pro_argument=data.get("pro_argument", ""),
+        con_argument=data.get("con_argument", ""),
+        neutral_summation=data.get("neutral_summation", ""),
+        citations=data.get("citations", [])
+    )
+
+async def fetch_constitutional(query: str, language: Optional[str]) -> ConstitutionalResponse:
+    response = await groq_client.chat.completions.create(
+        model="llama-3.3-70b-versatile",
+        messages=constitutional_messages(query, language),
+        temperature=0.2,
+        max_tokens=4096,
+        response_format={"type": "json_object"}
+    )
+    
+    text = response.choices[0].message.content
+    data = json.loads(text)
+    
+    return build_constitutional(data)
+
+def fallback_constitutional() -> ConstitutionalResponse:
+    return ConstitutionalResponse(
+        pro_argument="Error generating analysis.",
+        con_argument="Error generating analysis.",
+        neutral_summation="Please try again.",
+        citations=[]
+    )
+
+@app.post("/chat-constitutional", response_model=ConstitutionalResponse)
+async def chat_constitutional(request: ConstitutionalRequest):
+    print(f"Constitutional Query: {request.query}")
+    try:
+        return await constitutional_flight.do(
+            make_key(normalize_text(request.query), request.language),
+            lambda: fetch_constitutional(request.query, request.language),
+        )
+    except Exception as e:
+        print(f"Constitutional Error: {e}")
+        return fallback_constitutional()
+
+@app.post("/chat-constitutional/stream")
+async def chat_constitutional_stream(request: ConstitutionalRequest):
+    """
+    Server-Sent Events variant of /chat-constitutional.
+    Emits one event per field (pro_argument, con_argument, neutral_summation,
+    citations) as it completes, then a final `result` ConstitutionalResponse.
+    """
+    print(f"Constitutional Query (stream): {request.query}")
+
+    async def events():
+        try:
+            # JSON mode cannot be combined with streaming; the system prompt already demands bare JSON
+            stream = await groq_client.chat.completions.create(
+                model="llama-3.3-70b-versatile",
+                messages=constitutional_messages(request.query, request.language),
+                temperature=0.2,
+                max_tokens=4096,
+                stream=True
+            )
+            parser = JsonFieldStream()
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                for key, value in parser.feed(delta):
+                    if key in ConstitutionalResponse.model_fields:
+                        yield sse_event(key, value)
+
+            if not any(key in parser.fields for key in ConstitutionalResponse.model_fields):
+                raise ValueError("Unparseable constitutional stream")
+            yield sse_event("result", build_constitutional(parser.fields).model_dump())
+        except Exception as e:
+            print(f"Constitutional Stream Error: {e}")
+            yield sse_event("error", {"detail": "Error generating analysis."})
+            yield sse_event("result", fallback_constitutional().model_dump())
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+# --- Batched Translation (UI strings) ---
+
+TRANSLATE_SYSTEM_PROMPT = """You are 'BharatGen', India's sovereign AI translator.
+You receive a JSON array of UI strings. Translate every string into the target Indian language accurately, preserving nuance, placeholders and punctuation.
+Return JSON: { "translations": ["...", "..."] } with exactly one translation per input string, in the same order."""
+
+# Persistent translation memory: UI strings repeat on every page load, so each
+# (source text, target language) pair should only ever be translated once.
+translation_memory = TwoTierCache(
+    "translations",
+    path=os.getenv("TRANSLATION_MEMORY_PATH"),
+    ttl_seconds=float(os.getenv("TRANSLATION_MEMORY_TTL_SECONDS", 90 * 24 * 3600)),
+    max_memory_entries=int(os.getenv("TRANSLATION_MEMORY_ENTRIES", "20000")),
+    max_disk_entries=int(os.getenv("TRANSLATION_MEMORY_DISK_ENTRIES", "500000")),
+)
+
+# Limits for packing cache misses into one Groq call
+TRANSLATE_BATCH_MAX_TEXTS = int(os.getenv("TRANSLATE_BATCH_MAX_TEXTS", "500"))
+TRANSLATE_CHUNK_MAX_ITEMS = int(os.getenv("TRANSLATE_CHUNK_MAX_ITEMS", "60"))
+TRANSLATE_CHUNK_MAX_CHARS = int(os.getenv("TRANSLATE_CHUNK_MAX_CHARS", "6000"))
+
+def is_english(target_language):
+    return target_language.lower() in ("en", "english")
+
+def translation_key(text, target_language):
+    return make_key(text, target_language.lower())
+
+def translation_chunks(texts):
+    """Splits texts into chunks bounded by item count and total characters."""
+    chunk, size = [], 0
+    for text in texts:
+        if chunk and (len(chunk) >= TRANSLATE_CHUNK_MAX_ITEMS or size + len(text) > TRANSLATE_CHUNK_MAX_CHARS):
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(text)
+        size += len(text)
+    if chunk:
+        yield chunk
+
+async def translate_chunk(texts, target_language):
+    """Translates a list of strings in one Groq call. Returns None if the reply does not line up."""
+    try:
+        response = await groq_client.chat.completions.create(
+            model="llama-3.1-8b-instant",
             messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Analyze this topic: '{request.query}'. Language: {request.language}"}
+                {"role": "system", "content": TRANSLATE_SYSTEM_PROMPT},
+                {"role": "user", "content": f"Target language: {target_language}\nStrings: {json.dumps(texts, ensure_ascii=False)}"}
             ],
-            temperature=0.2,
+            temperature=0.3,
             max_tokens=4096,
             response_format={"type": "json_object"}
         )
-        
-        text = response.choices[0].message.content
-        data = json.loads(text)
-        
-        return ConstitutionalResponse(
-            pro_argument=data.get("pro_argument", ""),
-            con_argument=data.get("con_argument", ""),
-            neutral_summation=data.get("neutral_summation", ""),
-            citations=data.get("citations", [])
-        )
+        translations = json.loads(response.choices[0].message.content).get("translations")
+        if isinstance(translations, list) and len(translations) == len(texts) \
+                and all(isinstance(t, str) for t in translations):
+            return translations
+        print(f"Translation batch mismatch: sent {len(texts)}, got {len(translations or [])}")
     except Exception as e:
-        print(f"Constitutional Error: {e}")
-        return ConstitutionalResponse(
-            pro_argument="Error generating analysis.",
-            con_argument="Error generating analysis.",
-            neutral_summation="Please try again.",
-            citations=[]
-        )
+        print(f"Translation Batch Error: {e}")
+    return None
+
+@app.post("/translate-batch", response_model=TranslateBatchResponse)
+async def translate_batch(request: TranslateBatchRequest):
+    """
+    Translates many strings into one target language.
+    Hits come from the translation memory; the distinct misses are packed into
+    as few Groq calls as the chunk limits allow. Strings that fail to
+    translate come back unchanged and are not remembered.
+    """
+    if len(request.texts) > TRANSLATE_BATCH_MAX_TEXTS:
+        raise HTTPException(status_code=413, detail=f"At most {TRANSLATE_BATCH_MAX_TEXTS} texts per batch")
+    if is_english(request.target_language) or not GROQ_API_KEY:
+        return TranslateBatchResponse(translations=request.texts, cached=0, llm_calls=0)
+
+    translated = {}
+    misses = []
+    for text in dict.fromkeys(request.texts):
+        cached = translation_memory.get(translation_key(text, request.target_language)) if text.strip() else text
+        if cached is not None:
+            translated[text] = cached
+        else:
+            misses.append(text)
+
+    missed = set(misses)
+    chunks = list(translation_chunks(misses))
+    results = await asyncio.gather(*(translate_chunk(chunk, request.target_language) for chunk in chunks))
+    for chunk, translations in zip(chunks, results):
+        for text, translation in zip(chunk, translations or chunk):
+            translated[text] = translation
+            if translations is not None:
+                translation_memory.set(translation_key(text, request.target_language), translation)
+
+    return TranslateBatchResponse(
+        translations=[translated[text] for text in request.texts],
+        cached=sum(1 for text in request.texts if text not in missed),
+        llm_calls=len(chunks),
+    )
+
+@app.get("/translate/memory/stats")
+def translation_memory_stats():
+    return translation_memory.stats()
 
 @app.post("/analyze-image", response_model=AnalyzeResponse)
 async def analyze_image(file: UploadFile = File(...)):
@@ -247,26 +776,39 @@ async def analyze_image(file: UploadFile = File(...)):
         contextLinks=[]
     )
 
+def resolve_profile(profile):
+    try:
+        return get_profile(profile)[0]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.post("/detect-deepfake")
-async def detect_deepfake(file: UploadFile = File(...)):
-    print(f"Deepfake Analysis Request: {file.filename}")
+async def detect_deepfake(file: UploadFile = File(...), profile: Optional[str] = None):
+    """profile: fast | balanced | thorough (query parameter); see /detect-deepfake/profiles."""
+    profile = resolve_profile(profile)
+    print(f"Deepfake Analysis Request: {file.filename} (profile: {profile})")
     
-    suffix = f".{file.filename.split('.')[-1]}" if "." in file.filename else ".mp4"
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        tmp.write(await file.read())
-        tmp_path = tmp.name
+    tmp_path, sha256, _ = await save_upload(file, MAX_VIDEO_UPLOAD_BYTES, suffix=upload_suffix(file.filename, ".mp4"))
         
     try:
-        if not deepfake_detector:
-            raise HTTPException(status_code=500, detail="Deepfake Detector not initialized.")
-
-        result = deepfake_detector.detect(tmp_path)
+        result = deepfake_result_cache.get(deepfake_result_key(sha256, profile))
+        if result is None:
+            result = await analyze_upload(tmp_path, sha256, profile)
         
         if "error" in result:
             raise HTTPException(status_code=400, detail=result["error"])
             
         return result
 
+    except HTTPException:
+        raise
+    except PoolBusyError as e:
+        return JSONResponse(status_code=503, content={"detail": str(e)}, headers={"Retry-After": "10"})
+    except DetectionTimeoutError as e:
+        return JSONResponse(status_code=504, content={"detail": str(e)})
+    except WorkerCrashedError as e:
+        print(f"Deepfake Error: {e}")
+        return JSONResponse(status_code=500, content={"detail": str(e)})
     except Exception as e:
         print(f"Deepfake Error: {e}")
         return JSONResponse(status_code=500, content={"detail": str(e)})
@@ -275,11 +817,229 @@ async def detect_deepfake(file: UploadFile = File(...)):
         if os.path.exists(tmp_path):
             os.remove(tmp_path)
 
-@app.post("/latest-news")
-async def latest_news(request: NewsRequest):
-    print(f"News Request: {request.language}")
+@app.post("/detect-deepfake-image")
+async def detect_deepfake_image(file: UploadFile = File(...), profile: Optional[str] = None):
+    """Still-image deepfake check; the upload is decoded in memory, never written to disk."""
+    profile = resolve_profile(profile)
+    print(f"Deepfake Image Request: {file.filename} (profile: {profile})")
+
+    image_bytes, sha256 = await read_upload(file, MAX_IMAGE_UPLOAD_BYTES)
+    cache_key = deepfake_result_key(sha256, profile, kind="deepfake-image")
+    try:
+        result = deepfake_result_cache.get(cache_key)
+        if result is None:
+            result = await deepfake_pool.detect_image(image_bytes, profile=profile)
+            deepfake_result_cache.set(cache_key, result)
+    except PoolBusyError as e:
+        return JSONResponse(status_code=503, content={"detail": str(e)}, headers={"Retry-After": "10"})
+    except DetectionTimeoutError as e:
+        return JSONResponse(status_code=504, content={"detail": str(e)})
+    except Exception as e:
+        print(f"Deepfake Image Error: {e}")
+        return JSONResponse(status_code=500, content={"detail": str(e)})
+
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+    return result
+
+@app.get("/detect-deepfake/profiles")
+def deepfake_profiles():
+    return {"default": DEFAULT_PROFILE, "profiles": PROFILES}
+
+@app.get("/detect-deepfake/cache/stats")
+def deepfake_cache_stats():
+    return deepfake_result_cache.stats()
+
+@app.post("/detect-deepfake/cache/purge")
+def purge_deepfake_result(sha256: str, profile: Optional[str] = None, x_admin_token: Optional[str] = Header(None)):
+    """Drops cached results for an upload's SHA-256 (all profiles unless one is given)."""
+    require_admin(x_admin_token)
+    profiles = [resolve_profile(profile)] if profile else list(PROFILES)
+    purged = [
+        name for name in profiles
+        # | rather than "or": both the video and the image result are dropped
+        if deepfake_result_cache.delete(deepfake_result_key(sha256.lower(), name))
+        | deepfake_result_cache.delete(deepfake_result_key(sha256.lower(), name, kind="deepfake-image"))
+    ]
+    return {"purged": purged}
+
+@app.post("/detect-deepfake/fingerprints")
+async def register_known_deepfake(
+    file: UploadFile = File(...), note: Optional[str] = None, x_admin_token: Optional[str] = Header(None)
+):
+    """Adds a known deepfake to the fingerprint index; re-encoded copies of it are then flagged without analysis."""
+    require_admin(x_admin_token)
+    tmp_path, sha256, _ = await save_upload(file, MAX_VIDEO_UPLOAD_BYTES, suffix=upload_suffix(file.filename, ".mp4"))
+    try:
+        fingerprint = await asyncio.to_thread(video_fingerprint, tmp_path)
+    finally:
+        os.remove(tmp_path)
+    result = {"isFake": True, "confidence": 1.0, "heatmap": None, "processed_frames": 0}
+    if not video_index.add(sha256, fingerprint, result, label="known_deepfake", note=note or file.filename):
+        raise HTTPException(status_code=400, detail="Too few distinct frames to fingerprint this video.")
+    return {"key": sha256, "frames": len(fingerprint)}
+
+@app.delete("/detect-deepfake/fingerprints/{key}")
+def remove_fingerprint(key: str, x_admin_token: Optional[str] = Header(None)):
+    require_admin(x_admin_token)
+    return {"removed": video_index.remove(key)}
+
+@app.get("/detect-deepfake/fingerprints/stats")
+def fingerprint_stats():
+    return video_index.stats()
+
+@app.get("/detect-deepfake/pool-stats")
+def deepfake_pool_stats():
+    return {**deepfake_pool.stats(), "jobs": job_store.stats()}
+
+def finish_deepfake_job(job_id, result):
+    if "error" in result:
+        job_store.update(job_id, status=FAILED, error=result["error"], error_status=400)
+    else:
+        job_store.update(job_id, status=DONE, result=result, progress={"stage": "done"})
+
+async def run_deepfake_job(job_id, video_path, sha256, profile=None):
     try:
-        system_prompt = """You are an unbiased news aggregator for Indian Elections.
+        finish_deepfake_job(job_id, await analyze_upload(video_path, sha256, profile, job_id=job_id))
+    except PoolBusyError as e:
+        job_store.update(job_id, status=FAILED, error=str(e), error_status=503)
+    except DetectionTimeoutError as e:
+        job_store.update(job_id, status=FAILED, error=str(e), error_status=504)
+    except Exception as e:
+        print(f"Deepfake Job Error ({job_id}): {e}")
+        job_store.update(job_id, status=FAILED, error=str(e), error_status=500)
+    finally:
+        if os.path.exists(video_path):
+            os.remove(video_path)
+
+async def purge_deepfake_jobs():
+    while True:
+        for meta in job_store.purge_expired():
+            # Uploads of jobs that never ran (e.g. lost in a restart)
+            if meta.get("path") and os.path.exists(meta["path"]):
+                os.remove(meta["path"])
+        await asyncio.sleep(DEEPFAKE_JOB_PURGE_SECONDS)
+
+def job_status(job):
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "progress": job["progress"],
+        "error": job["error"],
+        "created": job["created"],
+        "updated": job["updated"],
+    }
+
+@app.post("/detect-deepfake/jobs", status_code=202)
+async def submit_deepfake_job(file: UploadFile = File(...), profile: Optional[str] = None):
+    """Queues a video for analysis and returns a job id immediately; poll the status/result URLs."""
+    profile = resolve_profile(profile)
+    print(f"Deepfake Job Request: {file.filename} (profile: {profile})")
+    if deepfake_pool.is_full():
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Deepfake analysis queue is full. Please retry shortly."},
+            headers={"Retry-After": "10"},
+        )
+
+    tmp_path, sha256, _ = await save_upload(
+        file, MAX_VIDEO_UPLOAD_BYTES, suffix=upload_suffix(file.filename, ".mp4"), dir=DEEPFAKE_JOB_DIR
+    )
+
+    job_id = job_store.create(filename=file.filename, path=tmp_path, profile=profile, sha256=sha256)
+    cached = deepfake_result_cache.get(deepfake_result_key(sha256, profile))
+    if cached is not None:
+        # Seen this exact upload before: the job is finished on arrival
+        os.remove(tmp_path)
+        finish_deepfake_job(job_id, cached)
+    else:
+        task = asyncio.create_task(run_deepfake_job(job_id, tmp_path, sha256, profile))
+        deepfake_jobs.add(task)
+        task.add_done_callback(deepfake_jobs.discard)
+    return {
+        "job_id": job_id,
+        "status": job_store.get(job_id)["status"],
+        "status_url": f"/detect-deepfake/jobs/{job_id}",
+        "result_url": f"/detect-deepfake/jobs/{job_id}/result",
+    }
+
+@app.get("/detect-deepfake/jobs/{job_id}")
+def get_deepfake_job(job_id: str):
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired.")
+    return job_status(job)
+
+@app.get("/detect-deepfake/jobs/{job_id}/result")
+def get_deepfake_job_result(job_id: str):
+    """The detection result once done; 202 with the job status while it is still pending."""
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired.")
+    if job["status"] == DONE:
+        return job["result"]
+    if job["status"] == FAILED:
+        return JSONResponse(status_code=job["error_status"] or 500, content={"detail": job["error"]})
+    return JSONResponse(status_code=202, content=job_status(job))
+
+# --- YouTube Deepfake Check (browser extension) ---
+# Only a bounded, low-resolution slice of the video is fetched; results are
+# cached per video id and concurrent checks of one video share a single fetch.
+youtube_fetcher = YouTubeFetcher()
+youtube_flight = SingleFlight("detect-youtube")
+
+class YouTubeRequest(BaseModel):
+    url: str
+    profile: Optional[str] = None
+
+def youtube_result_key(video_id, profile):
+    return make_key("youtube", DETECTOR_VERSION, profile, json.dumps(PROFILES[profile], sort_keys=True), video_id)
+
+async def analyze_youtube(url, video_id, profile):
+    path, media = await youtube_fetcher.fetch(url, dir=DEEPFAKE_JOB_DIR)
+    try:
+        result = await deepfake_pool.detect(path, profile=profile)
+    finally:
+        os.remove(path)
+    result = {**result, "videoId": video_id, "sliceBytes": media["bytes"]}
+    deepfake_result_cache.set(youtube_result_key(video_id, profile), result)
+    return result
+
+@app.post("/detect-youtube")
+async def detect_youtube(request: YouTubeRequest):
+    """Deepfake check of a YouTube video from its opening seconds, at low resolution."""
+    profile = resolve_profile(request.profile)
+    try:
+        video_id = youtube_video_id(request.url)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    print(f"YouTube Deepfake Request: {video_id} (profile: {profile})")
+
+    key = youtube_result_key(video_id, profile)
+    result = deepfake_result_cache.get(key)
+    try:
+        if result is None:
+            result = await youtube_flight.do(key, lambda: analyze_youtube(request.url, video_id, profile))
+    except YouTubeFetchError as e:
+        print(f"YouTube Fetch Error ({video_id}): {e}")
+        return JSONResponse(status_code=502, content={"detail": str(e)})
+    except PoolBusyError as e:
+        return JSONResponse(status_code=503, content={"detail": str(e)}, headers={"Retry-After": "10"})
+    except DetectionTimeoutError as e:
+        return JSONResponse(status_code=504, content={"detail": str(e)})
+    except Exception as e:
+        print(f"YouTube Deepfake Error ({video_id}): {e}")
+        return JSONResponse(status_code=500, content={"detail": str(e)})
+
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+    return result
+
+@app.get("/detect-youtube/stats")
+def detect_youtube_stats():
+    return {"fetcher": youtube_fetcher.stats(), "flight": youtube_flight.stats()}
+
+NEWS_SYSTEM_PROMPT = """You are an unbiased news aggregator for Indian Elections.
 Generate 6 latest distinct fictional but realistic news headlines and summaries about Indian Elections.
 
 CRITICAL: You MUST return a JSON object with a "news" key containing an array of 6 news items.
@@ -296,99 +1056,107 @@ OUTPUT SCHEMA (JSON):
     }
   ]
 }"""
-        
-        response = groq_client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Generate 6 latest election news items in {request.language} language. Return JSON with 'news' array."}
-            ],
-            temperature=0.7,
-            max_tokens=4096,
-            response_format={"type": "json_object"}
-        )
-        
-        text = response.choices[0].message.content
-        print(f"News API Response: {text[:200]}...")  # Debug log
-        data = json.loads(text)
-        
-        # Handle if response is wrapped in an object
-        news_items = []
-        if isinstance(data, dict) and "news" in data:
-            news_items = data["news"]
-        elif isinstance(data, dict) and "items" in data:
-            news_items = data["items"]
-        elif isinstance(data, dict) and "articles" in data:
-            news_items = data["articles"]
-        elif isinstance(data, list):
-            news_items = data
-        else:
-            print(f"Unexpected news response format: {list(data.keys())}")
-            return []
-        
-        # Add relevant images based on category
-        category_images = {
-            "Official": "https://images.pexels.com/photos/8828474/pexels-photo-8828474.jpeg?auto=compress&cs=tinysrgb&w=400&h=300&fit=crop",
-            "Updates": "https://images.pexels.com/photos/6953876/pexels-photo-6953876.jpeg?auto=compress&cs=tinysrgb&w=400&h=300&fit=crop",
-            "Policy": "https://images.pexels.com/photos/6077326/pexels-photo-6077326.jpeg?auto=compress&cs=tinysrgb&w=400&h=300&fit=crop",
-            "Legal": "https://images.pexels.com/photos/8111769/pexels-photo-8111769.jpeg?auto=compress&cs=tinysrgb&w=400&h=300&fit=crop",
-            "Technology": "https://images.pexels.com/photos/5380642/pexels-photo-5380642.jpeg?auto=compress&cs=tinysrgb&w=400&h=300&fit=crop",
-            "Environment": "https://images.pexels.com/photos/1108572/pexels-photo-1108572.jpeg?auto=compress&cs=tinysrgb&w=400&h=300&fit=crop"
-        }
-        
-        # Add image_url to each news item based on category
-        for item in news_items:
-            category = item.get("category", "Official")
-            item["image_url"] = category_images.get(category, category_images["Official"])
-        
-        return news_items
 
+# Add relevant images based on category
+NEWS_CATEGORY_IMAGES = {
+    "Official": "https://images.pexels.com/photos/8828474/pexels-photo-8828474.jpeg?auto=compress&cs=tinysrgb&w=400&h=300&fit=crop",
+    "Updates": "https://images.pexels.com/photos/6953876/pexels-photo-6953876.jpeg?auto=compress&cs=tinysrgb&w=400&h=300&fit=crop",
+    "Policy": "https://images.pexels.com/photos/6077326/pexels-photo-6077326.jpeg?auto=compress&cs=tinysrgb&w=400&h=300&fit=crop",
+    "Legal": "https://images.pexels.com/photos/8111769/pexels-photo-8111769.jpeg?auto=compress&cs=tinysrgb&w=400&h=300&fit=crop",
+    "Technology": "https://images.pexels.com/photos/5380642/pexels-photo-5380642.jpeg?auto=compress&cs=tinysrgb&w=400&h=300&fit=crop",
+    "Environment": "https://images.pexels.com/photos/1108572/pexels-photo-1108572.jpeg?auto=compress&cs=tinysrgb&w=400&h=300&fit=crop"
+}
+
+async def fetch_news(language):
+    """Generates a fresh news set for one language. Raises on LLM or format errors."""
+    response = await groq_client.chat.completions.create(
+        model="llama-3.3-70b-versatile",
+        messages=[
+            {"role": "system", "content": NEWS_SYSTEM_PROMPT},
+            {"role": "user", "content": f"Generate 6 latest election news items in {language} language. Return JSON with 'news' array."}
+        ],
+        temperature=0.7,
+        max_tokens=4096,
+        response_format={"type": "json_object"}
+    )
+    
+    text = response.choices[0].message.content
+    print(f"News API Response ({language}): {text[:200]}...")  # Debug log
+    data = json.loads(text)
+    
+    # Handle if response is wrapped in an object
+    if isinstance(data, dict) and "news" in data:
+        news_items = data["news"]
+    elif isinstance(data, dict) and "items" in data:
+        news_items = data["items"]
+    elif isinstance(data, dict) and "articles" in data:
+        news_items = data["articles"]
+    elif isinstance(data, list):
+        news_items = data
+    else:
+        raise ValueError(f"Unexpected news response format: {list(data.keys())}")
+    if not news_items:
+        raise ValueError("Empty news response")
+    
+    # Add image_url to each news item based on category
+    for item in news_items:
+        category = item.get("category", "Official")
+        item["image_url"] = NEWS_CATEGORY_IMAGES.get(category, NEWS_CATEGORY_IMAGES["Official"])
+    
+    return news_items
+
+def news_language(language):
+    """Canonical key so 'hindi', 'Hindi ' and 'HINDI' share one news set."""
+    return (language or "English").strip().title() or "English"
+
+# Languages regenerated by the background refresher and the only ones served:
+# each distinct language costs an LLM generation and a refresher status entry,
+# so anything else falls back to the first configured language.
+NEWS_LANGUAGES = [
+    news_language(lang) for lang in os.getenv(
+        "NEWS_LANGUAGES",
+        "English,Hindi,Bengali,Telugu,Tamil,Marathi,Gujarati,Kannada,Malayalam,Punjabi,Odia,Assamese",
+    ).split(",") if lang.strip()
+]
+NEWS_REFRESH_ENABLED = os.getenv("NEWS_REFRESH_ENABLED", "1") == "1"
+
+def served_news_language(language):
+    """Canonical key of a configured news language; unknown ones get the default."""
+    language = news_language(language)
+    return language if language in NEWS_LANGUAGES else NEWS_LANGUAGES[0]
+
+news_refresher = BackgroundRefresher(
+    "news",
+    fetch_news,
+    NEWS_LANGUAGES,
+    refresh_interval_seconds=float(os.getenv("NEWS_REFRESH_SECONDS", 3600)),
+    check_interval_seconds=float(os.getenv("NEWS_REFRESH_CHECK_SECONDS", 60)),
+    max_stale_seconds=float(os.getenv("NEWS_MAX_STALE_SECONDS", 7 * 24 * 3600)),
+    path=os.getenv("NEWS_CACHE_PATH"),
+)
+
+@app.post("/latest-news")
+async def latest_news(request: NewsRequest):
+    """Serves the cached news set for the language (stale-while-revalidate)."""
+    try:
+        return await news_refresher.get(served_news_language(request.language))
     except Exception as e:
         print(f"News Error: {e}")
         return []
 
-@app.post("/voice/chat", response_model=VoiceChatResponse)
-async def voice_chat(request: VoiceChatRequest):
-    """
-    Complete voice interaction: Sarvam STT -> Groq Response -> Sarvam TTS
-    """
-    try:
-        if not SARVAM_API_KEY:
-            return JSONResponse({"error": "Sarvam API Key not configured"}, status_code=500)
+@app.get("/latest-news/status")
+def latest_news_status():
+    return news_refresher.status()
 
-        # 1. Speech-to-Text via Sarvam AI
-        audio_content = base64.b64decode(request.audio_base64)
-        
-        async with httpx.AsyncClient() as client:
-            # Sarvam STT takes multipart/form-data
-            files = {"file": ("audio.webm", audio_content, "audio/webm")}
-            headers = {"api-subscription-key": SARVAM_API_KEY}
-            
-            stt_response = await client.post(
-                SARVAM_STT_URL,
-                headers=headers,
-                files=files,
-                data={"model": "saaras:v3"}
-            )
-            
-            if stt_response.status_code != 200:
-                print(f"Sarvam STT Error: {stt_response.text}")
-                return JSONResponse({"error": "Speech-to-Text failed"}, status_code=500)
-            
-            stt_data = stt_response.json()
-            detected_text = stt_data.get("transcript", "")
-            detected_lang = stt_data.get("language_code", "en-IN")
-
-        if not detected_text:
-            return JSONResponse({"error": "No speech detected"}, status_code=400)
+@app.get("/voice/pool-stats")
+def voice_pool_stats():
+    return sarvam.pool_stats()
 
-        print(f"STT: {detected_text} ({detected_lang})")
+@app.get("/voice/tts-cache/stats")
+def voice_tts_cache_stats():
+    return sarvam.tts_cache.stats()
 
-        # 2. Build conversation context and Generate AI response with Groq
-        conversation_messages = [
-            {
-                "role": "system",
-                "content": """You are S.A.T.Y.A. Assistant, a multilingual voice assistant for Indian elections and governance.
+VOICE_SYSTEM_PROMPT = """You are S.A.T.Y.A. Assistant, a multilingual voice assistant for Indian elections and governance.
 
 CORE CAPABILITIES:
 - Support all 22 scheduled Indian languages
@@ -401,26 +1169,72 @@ RESPONSE GUIDELINES:
 - Avoid bullet points, lists, or formatting
 - Use simple, clear language in ENGLISH
 - Provide specific facts with sources when possible"""
-            }
-        ]
-        
-        # Add conversation history
-        for msg in request.conversation_history[-5:]:
-            conversation_messages.append({
-                "role": msg.get("role", "user"),
-                "content": msg.get("content", "")
-            })
-        
-        # Add current user query
+
+# Sentences synthesized concurrently in the streaming voice mode
+VOICE_TTS_CONCURRENCY = int(os.getenv("VOICE_TTS_CONCURRENCY", "4"))
+
+async def speech_to_text(audio_content: bytes):
+    """Transcribes audio with Sarvam STT. Returns (text, language_code); raises SarvamError."""
+    # Sarvam STT takes multipart/form-data
+    files = {"file": ("audio.webm", audio_content, "audio/webm")}
+    headers = {"api-subscription-key": sarvam.get_api_key()}
+    
+    stt_response = await sarvam.post(
+        sarvam.endpoint("speech-to-text"),
+        headers=headers,
+        files=files,
+        data={"model": "saaras:v3"}
+    )
+    
+    if stt_response.status_code != 200:
+        raise sarvam.SarvamError(stt_response.status_code, stt_response.text)
+    
+    stt_data = stt_response.json()
+    return stt_data.get("transcript", ""), stt_data.get("language_code", "en-IN")
+
+def voice_messages(request: VoiceChatRequest, detected_text: str, detected_lang: str) -> List[dict]:
+    conversation_messages = [{"role": "system", "content": VOICE_SYSTEM_PROMPT}]
+    
+    # Add conversation history
+    for msg in request.conversation_history[-5:]:
         conversation_messages.append({
-            "role": "user",
-            "content": f"User asked in {detected_lang}: {detected_text}"
+            "role": msg.get("role", "user"),
+            "content": msg.get("content", "")
         })
-        
-        # Generate response with Groq (using dedicated voice client)
-        ai_response = voice_groq_client.chat.completions.create(
+    
+    # Add current user query
+    conversation_messages.append({
+        "role": "user",
+        "content": f"User asked in {detected_lang}: {detected_text}"
+    })
+    return conversation_messages
+
+@app.post("/voice/chat", response_model=VoiceChatResponse)
+async def voice_chat(request: VoiceChatRequest):
+    """
+    Complete voice interaction: Sarvam STT -> Groq Response -> Sarvam TTS
+    """
+    try:
+        if not sarvam.get_api_key():
+            return JSONResponse({"error": "Sarvam API Key not configured"}, status_code=500)
+
+        # 1. Speech-to-Text via Sarvam AI
+        audio_content = base64.b64decode(request.audio_base64)
+        try:
+            detected_text, detected_lang = await speech_to_text(audio_content)
+        except sarvam.SarvamError as e:
+            print(f"Sarvam STT Error: {e.text}")
+            return JSONResponse({"error": "Speech-to-Text failed"}, status_code=500)
+
+        if not detected_text:
+            return JSONResponse({"error": "No speech detected"}, status_code=400)
+
+        print(f"STT: {detected_text} ({detected_lang})")
+
+        # 2. Generate response with Groq (using dedicated voice client)
+        ai_response = await voice_groq_client.chat.completions.create(
             model="llama-3.3-70b-versatile",
-            messages=conversation_messages,
+            messages=voice_messages(request, detected_text, detected_lang),
             temperature=0.7,
             max_tokens=512
         )
@@ -429,31 +1243,11 @@ RESPONSE GUIDELINES:
         print(f"AI: {response_text}")
 
         # 3. Text-to-Speech via Sarvam AI (Bulbul)
-        async with httpx.AsyncClient() as client:
-            tts_payload = {
-                "inputs": [response_text],
-                "target_language_code": detected_lang,
-                "speaker": "anushka",
-                "model": "bulbul:v2"
-            }
-            
-            headers = {
-                "api-subscription-key": SARVAM_API_KEY,
-                "Content-Type": "application/json"
-            }
-            
-            tts_response = await client.post(
-                SARVAM_TTS_URL,
-                headers=headers,
-                json=tts_payload
-            )
-            
-            if tts_response.status_code != 200:
-                print(f"Sarvam TTS Error: {tts_response.text}")
-                return JSONResponse({"error": "Text-to-Speech failed"}, status_code=500)
-            
-            tts_data = tts_response.json()
-            audio_base64 = tts_data.get("audios", [""])[0]
+        try:
+            audio_base64 = await sarvam.text_to_speech(response_text, detected_lang)
+        except sarvam.SarvamError as e:
+            print(f"Sarvam TTS Error: {e.text}")
+            return JSONResponse({"error": "Text-to-Speech failed"}, status_code=500)
 
         return VoiceChatResponse(
             text_query=detected_text,
@@ -466,6 +1260,76 @@ RESPONSE GUIDELINES:
         print(f"Voice Chat Exception: {str(e)}")
         return JSONResponse({"error": str(e)}, status_code=500)
 
+@app.post("/voice/chat-stream")
+async def voice_chat_stream(request: VoiceChatRequest):
+    """
+    Pipelined voice interaction over Server-Sent Events.
+    The Groq reply is streamed and cut at sentence boundaries; every sentence
+    goes to Sarvam TTS as soon as it is complete, and `audio` events are sent
+    in sentence order as each clip is ready. A final `metrics` event reports
+    stt_ms, first_token_ms and first_audio_ms (from request start).
+    """
+    if not sarvam.get_api_key():
+        return JSONResponse({"error": "Sarvam API Key not configured"}, status_code=500)
+
+    started = time.perf_counter()
+
+    def elapsed_ms():
+        return round((time.perf_counter() - started) * 1000, 1)
+
+    async def events():
+        metrics = {}
+        try:
+            audio_content = base64.b64decode(request.audio_base64)
+            try:
+                detected_text, detected_lang = await speech_to_text(audio_content)
+            except sarvam.SarvamError as e:
+                print(f"Sarvam STT Error: {e.text}")
+                yield sse_event("error", {"error": "Speech-to-Text failed"})
+                return
+            metrics["stt_ms"] = elapsed_ms()
+
+            if not detected_text:
+                yield sse_event("error", {"error": "No speech detected"})
+                return
+            yield sse_event("transcript", {"text_query": detected_text, "detected_language": detected_lang})
+
+            stream = await voice_groq_client.chat.completions.create(
+                model="llama-3.3-70b-versatile",
+                messages=voice_messages(request, detected_text, detected_lang),
+                temperature=0.7,
+                max_tokens=512,
+                stream=True
+            )
+
+            async def llm_text():
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        metrics.setdefault("first_token_ms", elapsed_ms())
+                        yield delta
+
+            async def synthesize(sentence):
+                return await sarvam.text_to_speech(sentence, detected_lang)
+
+            spoken = []
+            pipeline = synthesize_in_order(sentences_from(llm_text()), synthesize, VOICE_TTS_CONCURRENCY)
+            async for sentence, audio_base64 in pipeline:
+                metrics.setdefault("first_audio_ms", elapsed_ms())
+                yield sse_event("audio", {"index": len(spoken), "text": sentence, "audio_base64": audio_base64})
+                spoken.append(sentence)
+
+            metrics["total_ms"] = elapsed_ms()
+            print(f"Voice stream metrics: {metrics}")
+            yield sse_event("metrics", metrics)
+            yield sse_event("done", {"text_response": " ".join(spoken)})
+
+        except Exception as e:
+            print(f"Voice Stream Exception: {str(e)}")
+            yield sse_event("error", {"error": str(e)})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
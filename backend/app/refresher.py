@@ -0,0 +1,134 @@
+import time
+import asyncio
+try:
+    from .cache import TwoTierCache
+    from .singleflight import SingleFlight
+except ImportError:
+    from cache import TwoTierCache
+    from singleflight import SingleFlight
+
+# Background-refreshed cache with stale-while-revalidate reads.
+# A loop regenerates each configured key once its value is older than the
+# refresh interval; readers always get the cached value immediately (fresh or
+# stale) and only wait on upstream for a key that has never been generated.
+
+class BackgroundRefresher:
+    def __init__(self, name, fetch, keys, refresh_interval_seconds=3600, check_interval_seconds=60,
+                 max_stale_seconds=7 * 24 * 3600, path=None):
+        """
+        fetch: async fn(key) -> JSON-serializable value; raising keeps the old value.
+        keys: keys refreshed by the background loop. Other keys are fetched on
+        first request and then revalidated on read.
+        """
+        self.name = name
+        self.fetch = fetch
+        self.keys = list(keys)
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.check_interval_seconds = check_interval_seconds
+        # Entries older than this are dropped entirely rather than served stale
+        self.cache = TwoTierCache(name, path=path, ttl_seconds=max_stale_seconds)
+        self._flight = SingleFlight(name)
+        self._task = None
+        self._revalidations = set()
+        self._status = {}
+
+    def _key_status(self, key):
+        return self._status.setdefault(key, {
+            "refreshes": 0,
+            "failures": 0,
+            "last_error": None,
+            "last_refresh_ms": None,
+            "stale_reads": 0,
+            "updated_at": None,
+        })
+
+    async def refresh(self, key):
+        """Regenerates one key now (coalesced with any refresh already running) and returns the entry."""
+        return await self._flight.do(key, lambda: self._refresh(key))
+
+    async def _refresh(self, key):
+        status = self._key_status(key)
+        start = time.perf_counter()
+        try:
+            value = await self.fetch(key)
+        except Exception as e:
+            status["failures"] += 1
+            status["last_error"] = str(e)[:200]
+            print(f"Refresh '{self.name}' failed for {key}: {e}")
+            raise
+        finally:
+            status["last_refresh_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        entry = {"value": value, "updated": time.time()}
+        self.cache.set(key, entry)
+        status["updated_at"] = entry["updated"]
+        status["refreshes"] += 1
+        status["last_error"] = None
+        return entry
+
+    def _is_stale(self, entry):
+        return time.time() - entry["updated"] >= self.refresh_interval_seconds
+
+    async def get(self, key):
+        """Returns the cached value, revalidating in the background when stale."""
+        entry = self.cache.get(key)
+        if entry is None:
+            return (await self.refresh(key))["value"]
+        status = self._key_status(key)
+        status["updated_at"] = entry["updated"]
+        if self._is_stale(entry):
+            status["stale_reads"] += 1
+            task = asyncio.ensure_future(self._revalidate(key))
+            self._revalidations.add(task)
+            task.add_done_callback(self._revalidations.discard)
+        return entry["value"]
+
+    async def _revalidate(self, key):
+        try:
+            await self.refresh(key)
+        except Exception:
+            pass  # already recorded in the key status; the stale value stays
+
+    async def _run(self):
+        while True:
+            for key in self.keys:
+                entry = self.cache.get(key)
+                if entry is not None:
+                    self._key_status(key)["updated_at"] = entry["updated"]
+                if entry is None or self._is_stale(entry):
+                    await self._revalidate(key)
+            await asyncio.sleep(self.check_interval_seconds)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._revalidations):
+            task.cancel()
+
+    def status(self):
+        now = time.time()
+        keys = {}
+        for key in dict.fromkeys(self.keys + list(self._status)):
+            status = self._key_status(key)
+            updated = status["updated_at"]
+            keys[key] = {
+                **status,
+                "age_seconds": round(now - updated, 1) if updated else None,
+                "stale": now - updated >= self.refresh_interval_seconds if updated else None,
+            }
+        return {
+            "name": self.name,
+            "running": self._task is not None and not self._task.done(),
+            "refresh_interval_seconds": self.refresh_interval_seconds,
+            "check_interval_seconds": self.check_interval_seconds,
+            "keys": keys,
+            "cache": self.cache.stats(),
+        }
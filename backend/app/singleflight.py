@@ -0,0 +1,44 @@
+import asyncio
+
+# Single-flight request coalescing.
+# When identical requests arrive together (a viral rumor), only the first one
+# (the leader) calls upstream; the rest (followers) await the leader's future.
+
+class SingleFlight:
+    def __init__(self, name):
+        self.name = name
+        self._inflight = {}
+        self._counters = {"leaders": 0, "followers": 0, "errors": 0}
+
+    async def do(self, key, fn):
+        """
+        Runs fn() once per key among concurrent callers and returns its result
+        (or raises its exception) to every caller.
+        The upstream call runs in its own task and each caller awaits it through
+        asyncio.shield, so a cancelled caller - leader included - never cancels
+        the call the other callers are waiting on.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._finish(key, done))
+            self._counters["leaders"] += 1
+        else:
+            self._counters["followers"] += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            self._counters["errors"] += 1
+
+    def stats(self):
+        return {
+            "name": self.name,
+            "in_flight": len(self._inflight),
+            "upstream_calls": self._counters["leaders"],
+            "saved_calls": self._counters["followers"],
+            "errors": self._counters["errors"],
+        }
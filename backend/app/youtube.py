@@ -0,0 +1,147 @@
+import os
+import time
+import asyncio
+import tempfile
+from urllib.parse import urlparse, parse_qs
+import httpx
+
+# Bounded media fetching for YouTube deepfake checks.
+# yt-dlp only resolves a low-resolution media URL (no download); then just the
+# first YOUTUBE_SLICE_MB of that stream is fetched with a Range request. A
+# progressive/fragmented MP4 starts with its index, so the slice is a playable
+# clip of the opening seconds that the detector's frame sampler reads as is.
+
+YOUTUBE_MAX_HEIGHT = int(os.getenv("YOUTUBE_MAX_HEIGHT", "360"))
+YOUTUBE_SLICE_BYTES = int(float(os.getenv("YOUTUBE_SLICE_MB", "4")) * 1024 * 1024)
+YOUTUBE_TIMEOUT_SECONDS = float(os.getenv("YOUTUBE_TIMEOUT_SECONDS", "30"))
+# e.g. "http://127.0.0.1:8000/{id}.mp4": serve clips from a local file server instead of YouTube (tests)
+YOUTUBE_MEDIA_URL_TEMPLATE = os.getenv("YOUTUBE_MEDIA_URL_TEMPLATE")
+
+YOUTUBE_HOSTS = ("youtube.com", "www.youtube.com", "m.youtube.com", "music.youtube.com", "youtu.be", "www.youtube-nocookie.com")
+
+class YouTubeFetchError(Exception):
+    pass
+
+def youtube_video_id(url):
+    """Extracts the 11-character video id from watch, youtu.be, shorts, embed and live URLs; raises ValueError."""
+    parsed = urlparse(url if "://" in url else f"https://{url}")
+    host = (parsed.hostname or "").lower()
+    if host not in YOUTUBE_HOSTS:
+        raise ValueError("Not a YouTube URL.")
+    parts = [p for p in parsed.path.split("/") if p]
+    if host == "youtu.be":
+        candidate = parts[0] if parts else ""
+    elif parts[:1] in (["shorts"], ["embed"], ["live"], ["v"]):
+        candidate = parts[1] if len(parts) > 1 else ""
+    else:
+        candidate = parse_qs(parsed.query).get("v", [""])[0]
+    if len(candidate) != 11 or not all(c.isalnum() or c in "-_" for c in candidate):
+        raise ValueError("Could not find a YouTube video id in the URL.")
+    return candidate
+
+def resolve_with_ytdlp(url, max_height):
+    """Resolves the media URL (and the headers it must be fetched with) of a small MP4 rendition. Blocking."""
+    import yt_dlp
+    options = {
+        "quiet": True,
+        "no_warnings": True,
+        "skip_download": True,
+        "noplaylist": True,
+        # Progressive MP4 if small enough, else video-only MP4; audio is not analyzed
+        "format": f"best[height<={max_height}][ext=mp4][vcodec!=none]/bestvideo[height<={max_height}][ext=mp4]/worst[ext=mp4]/worst",
+    }
+    try:
+        with yt_dlp.YoutubeDL(options) as ydl:
+            info = ydl.extract_info(url, download=False)
+    except Exception as e:
+        raise YouTubeFetchError(f"Could not resolve the video: {e}")
+    media_url = info.get("url") or (info.get("requested_formats") or [{}])[0].get("url")
+    if not media_url:
+        raise YouTubeFetchError("No downloadable rendition found for this video.")
+    return {
+        "url": media_url,
+        "http_headers": info.get("http_headers") or {},
+        "format_id": info.get("format_id"),
+        "height": info.get("height"),
+        "duration": info.get("duration"),
+    }
+
+def template_resolver(template):
+    """Resolver that maps a video id onto a fixed URL template, e.g. a local file server."""
+    def resolve(url, max_height):
+        return {"url": template.format(id=youtube_video_id(url)), "http_headers": {}}
+    return resolve
+
+class YouTubeFetcher:
+    def __init__(self, resolve=None, max_height=YOUTUBE_MAX_HEIGHT, max_bytes=YOUTUBE_SLICE_BYTES,
+                 timeout_seconds=YOUTUBE_TIMEOUT_SECONDS):
+        """resolve: fn(url, max_height) -> {"url", "http_headers", ...}; blocking, run in a thread."""
+        if resolve is None:
+            resolve = template_resolver(YOUTUBE_MEDIA_URL_TEMPLATE) if YOUTUBE_MEDIA_URL_TEMPLATE else resolve_with_ytdlp
+        self.resolve = resolve
+        self.max_height = max_height
+        self.max_bytes = max_bytes
+        self.timeout_seconds = timeout_seconds
+        self._counters = {"fetches": 0, "errors": 0, "bytes": 0, "resolve_ms": 0.0, "download_ms": 0.0}
+
+    async def fetch(self, url, dir=None):
+        """
+        Resolves url and saves at most max_bytes of the media to a temp file.
+        Returns (path, media info). Raises YouTubeFetchError.
+        """
+        try:
+            start = time.perf_counter()
+            media = await asyncio.to_thread(self.resolve, url, self.max_height)
+            self._counters["resolve_ms"] += (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            path, size = await self._download(media["url"], media.get("http_headers") or {}, dir)
+            self._counters["download_ms"] += (time.perf_counter() - start) * 1000
+        except YouTubeFetchError:
+            self._counters["errors"] += 1
+            raise
+        except Exception as e:
+            self._counters["errors"] += 1
+            raise YouTubeFetchError(f"Could not fetch the video: {e}")
+        self._counters["fetches"] += 1
+        self._counters["bytes"] += size
+        return path, {**media, "bytes": size}
+
+    async def _download(self, media_url, headers, dir=None):
+        headers = {**headers, "Range": f"bytes=0-{self.max_bytes - 1}"}
+        size = 0
+        if dir:
+            os.makedirs(dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4", dir=dir) as tmp:
+            try:
+                timeout = httpx.Timeout(self.timeout_seconds, connect=10.0)
+                async with httpx.AsyncClient(follow_redirects=True, timeout=timeout) as client:
+                    async with client.stream("GET", media_url, headers=headers) as response:
+                        response.raise_for_status()
+                        # A server that ignores Range sends the whole file: stop reading at the budget
+                        async for chunk in response.aiter_bytes():
+                            chunk = chunk[:self.max_bytes - size]
+                            await asyncio.to_thread(tmp.write, chunk)
+                            size += len(chunk)
+                            if size >= self.max_bytes:
+                                break
+            except BaseException:
+                tmp.close()
+                os.remove(tmp.name)
+                raise
+        if size == 0:
+            os.remove(tmp.name)
+            raise YouTubeFetchError("The media server returned no data.")
+        return tmp.name, size
+
+    def stats(self):
+        fetches = self._counters["fetches"]
+        return {
+            "max_height": self.max_height,
+            "max_bytes": self.max_bytes,
+            "fetches": fetches,
+            "errors": self._counters["errors"],
+            "bytes": self._counters["bytes"],
+            "avg_resolve_ms": round(self._counters["resolve_ms"] / fetches, 1) if fetches else 0.0,
+            "avg_download_ms": round(self._counters["download_ms"] / fetches, 1) if fetches else 0.0,
+        }
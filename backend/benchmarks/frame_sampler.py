@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import cv2
+import numpy as np
+
+# Decode-time benchmark for the deepfake frame samplers.
+# Usage (from backend/): python benchmarks/frame_sampler.py [video ...] [--stride 10]
+# Without a video a synthetic 60 s clip is generated. Reports decode time per
+# minute of video for each strategy; MTCNN/EfficientNet are not involved.
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from app.deepfake_detection import sample_frames
+
+def synthetic_video(path, seconds=60, fps=30, size=(640, 360)):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8)
+    for i in range(seconds * fps):
+        writer.write(np.roll(base, i * 4, axis=1))
+    writer.release()
+
+def video_minutes(path):
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+    cap.release()
+    return frames / fps / 60 if frames > 0 else None
+
+def bench(path, stride, strategy, repeats):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        count = sum(1 for _ in sample_frames(path, stride, strategy))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, count
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("videos", nargs="*")
+    parser.add_argument("--stride", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    videos = args.videos
+    if not videos:
+        path = os.path.join(tempfile.gettempdir(), "satya_sampler_bench.mp4")
+        if not os.path.exists(path):
+            print("Generating synthetic 60 s clip...")
+            synthetic_video(path)
+        videos = [path]
+
+    for path in videos:
+        minutes = video_minutes(path)
+        print(f"\n{path} ({minutes * 60:.1f} s, stride {args.stride})" if minutes else f"\n{path} (unknown length)")
+        for strategy in ("sequential", "seek"):
+            elapsed, count = bench(path, args.stride, strategy, args.repeats)
+            per_minute = f"{elapsed / minutes:.3f} s/min of video" if minutes else "n/a"
+            print(f"  {strategy:<10} {count:>5} frames  {elapsed:.3f} s  {per_minute}")
+
+if __name__ == "__main__":
+    main()
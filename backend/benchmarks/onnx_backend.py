@@ -0,0 +1,74 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import torch
+
+# Visual backend benchmark: the profile's EfficientNet in PyTorch vs the ONNX Runtime
+# export (fp32 and dynamically quantized int8), on the same weights.
+# Usage (from backend/): python benchmarks/onnx_backend.py [--faces 5] [--tolerance 1e-4] [--profile balanced]
+# Reports CPU latency of DeepfakeDetector.visual_probs and the largest
+# probability and fused-score difference per backend; exits non-zero when the
+# fp32 ONNX export differs from PyTorch by more than --tolerance.
+# Needs onnxruntime and onnx.
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from app.deepfake_detection import DeepfakeDetector, OnnxVisualModel
+
+def timed(fn, repeats):
+    best, result = None, None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--faces", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=1e-4)
+    parser.add_argument("--profile", default="balanced")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    faces = [
+        rng.integers(0, 255, (int(rng.integers(80, 260)), int(rng.integers(80, 260)), 3), dtype=np.uint8)
+        for _ in range(args.faces)
+    ]
+    detector = DeepfakeDetector(visual_backend="torch", profile=args.profile)
+    stream = detector.visual_stream()
+    _, input_tensor = detector.score_faces(faces)
+
+    runtimes = {"torch": None}
+    for backend in ("onnx", "onnx-int8"):
+        start = time.perf_counter()
+        runtimes[backend] = OnnxVisualModel(stream.model, stream.input_size, quantize=backend == "onnx-int8")
+        print(f"{backend} export: {time.perf_counter() - start:.1f} s")
+
+    print(f"{args.faces} faces, {stream.backbone} at {stream.input_size}, torch threads {torch.get_num_threads()}")
+    results = {}
+    for backend, runtime in runtimes.items():
+        stream.onnx = runtime
+        detector.visual_probs(input_tensor[:1])  # warm-up
+        elapsed, probs = timed(lambda: detector.visual_probs(input_tensor), args.repeats)
+        scores, _ = detector.score_faces(faces)
+        results[backend] = (elapsed, probs, scores)
+
+    _, reference_probs, reference_scores = results["torch"]
+    for backend, (elapsed, probs, scores) in results.items():
+        print(
+            f"  {backend:10s} {elapsed * 1000:8.1f} ms  "
+            f"max |prob diff| {np.abs(probs - reference_probs).max():.2e}  "
+            f"max |score diff| {np.abs(scores - reference_scores).max():.2e}"
+        )
+
+    drift = np.abs(results["onnx"][1] - reference_probs).max()
+    if drift > args.tolerance:
+        print(f"FAIL: onnx differs from torch by {drift:.2e} (> {args.tolerance:g})")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
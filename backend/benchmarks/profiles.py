@@ -0,0 +1,44 @@
+import os
+import sys
+import time
+import argparse
+import torch
+
+# Deepfake profile benchmark: end-to-end DeepfakeDetector.detect latency per
+# profile (fast / balanced / thorough) on the same video.
+# Usage (from backend/): python benchmarks/profiles.py path/to/video.mp4 [--repeats 3]
+# The first run of each profile loads its backbone and is not timed.
+# Reports the best-of-N latency, faces used and the resulting confidence.
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from app.deepfake_detection import DeepfakeDetector
+from app.deepfake_profiles import PROFILES
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("video")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES))
+    args = parser.parse_args()
+
+    detector = DeepfakeDetector()
+    print(f"{args.video}, device {detector.device}, torch threads {torch.get_num_threads()}")
+    for name in args.profiles:
+        settings = PROFILES[name]
+        start = time.perf_counter()
+        detector.detect(args.video, profile=name)  # loads the stream, warm-up
+        first = time.perf_counter() - start
+        best, result = None, None
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            result = detector.detect(args.video, profile=name)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print(
+            f"  {name:9s} {settings['backbone']}@{settings['input_size']} stride {settings['stride']:2d}  "
+            f"{best * 1000:8.1f} ms (first {first * 1000:.0f} ms)  "
+            f"faces {result.get('processed_frames', 0)}  confidence {result.get('confidence', result.get('error'))}"
+        )
+
+if __name__ == "__main__":
+    main()
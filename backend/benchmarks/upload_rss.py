@@ -0,0 +1,95 @@
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import subprocess
+import httpx
+
+# Peak server RSS under N concurrent uploads: reading the whole upload into
+# memory (the previous implementation) vs uploads.save_upload.
+# Usage (from backend/): python benchmarks/upload_rss.py [--uploads 4] [--size-mb 100]
+# Each mode runs in its own uvicorn process; peak RSS is read from
+# /proc/<pid>/status (VmHWM), so this needs Linux.
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+def build_app(mode):
+    from fastapi import FastAPI, File, UploadFile
+    from app.uploads import save_upload
+
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        if mode == "read":
+            with tempfile.NamedTemporaryFile(delete=False) as tmp:
+                tmp.write(await file.read())
+                path = tmp.name
+        else:
+            path, _, _ = await save_upload(file, 10 * 1024 ** 3)
+        os.remove(path)
+        return {"ok": True}
+
+    return app
+
+def peak_rss_mb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+
+async def run_uploads(port, path, count):
+    async with httpx.AsyncClient(timeout=600) as client:
+        async def one():
+            with open(path, "rb") as f:
+                response = await client.post(f"http://127.0.0.1:{port}/upload", files={"file": ("v.mp4", f, "video/mp4")})
+                response.raise_for_status()
+        await asyncio.gather(*(one() for _ in range(count)))
+
+def bench(mode, port, path, count):
+    server = subprocess.Popen([sys.executable, __file__, "--serve", mode, "--port", str(port)])
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/docs")
+                break
+            except httpx.TransportError:
+                time.sleep(0.2)
+        idle = peak_rss_mb(server.pid)
+        start = time.perf_counter()
+        asyncio.run(run_uploads(port, path, count))
+        elapsed = time.perf_counter() - start
+        return idle, peak_rss_mb(server.pid), elapsed
+    finally:
+        server.terminate()
+        server.wait()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uploads", type=int, default=4)
+    parser.add_argument("--size-mb", type=int, default=100)
+    parser.add_argument("--serve")
+    parser.add_argument("--port", type=int, default=8790)
+    args = parser.parse_args()
+
+    if args.serve:
+        import uvicorn
+        uvicorn.run(build_app(args.serve), host="127.0.0.1", port=args.port, log_level="warning")
+        return
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".bin") as f:
+        for _ in range(args.size_mb):
+            f.write(os.urandom(1024 * 1024))
+        path = f.name
+    try:
+        print(f"{args.uploads} concurrent uploads of {args.size_mb} MB")
+        for mode in ("read", "stream"):
+            idle, peak, elapsed = bench(mode, args.port, path, args.uploads)
+            print(f"  {mode:<7} peak RSS {peak:7.1f} MB (idle {idle:.1f} MB)  {elapsed:.2f} s")
+    finally:
+        os.remove(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import torch
+from PIL import Image
+
+# Face scoring benchmark: one EfficientNet forward pass per face (the previous
+# implementation) vs DeepfakeDetector.score_faces over the stacked crops.
+# Usage (from backend/): python benchmarks/visual_batch.py [--faces 5]
+# Uses random crops of varying size; reports CPU latency and the largest
+# per-face score difference. score_faces only stacks faces into one pass from
+# DEEPFAKE_BATCH_MIN_THREADS torch threads up; set it to 1 to time batching anyway.
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import cv2
+from app.deepfake_detection import DeepfakeDetector, visual_chunk_size
+
+def per_face(detector, faces):
+    scores = []
+    with torch.no_grad():
+        for face in faces:
+            input_tensor = detector.transform(Image.fromarray(face)).unsqueeze(0).to(detector.device)
+            face_var = cv2.Laplacian(cv2.cvtColor(face, cv2.COLOR_RGB2GRAY), cv2.CV_64F).var()
+            heuristic_score = 1.0 / (1.0 + np.exp((face_var - 150) / 50))
+            visual_prob = torch.sigmoid(detector.visual_model(input_tensor)).item()
+            scores.append((heuristic_score * 0.8) + (visual_prob * 0.2))
+    return np.array(scores)
+
+def timed(fn, repeats):
+    best, result = None, None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--faces", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    faces = [
+        rng.integers(0, 255, (int(rng.integers(80, 260)), int(rng.integers(80, 260)), 3), dtype=np.uint8)
+        for _ in range(args.faces)
+    ]
+    detector = DeepfakeDetector()
+    per_face(detector, faces[:1])  # warm-up
+
+    before, reference = timed(lambda: per_face(detector, faces), args.repeats)
+    after, (scores, _) = timed(lambda: detector.score_faces(faces), args.repeats)
+    print(f"{args.faces} faces on {detector.device}, torch threads {torch.get_num_threads()}")
+    print(f"  per-face  {before * 1000:8.1f} ms")
+    print(f"  batched   {after * 1000:8.1f} ms  ({visual_chunk_size(detector.visual_stream().batch_size)} faces per pass)")
+    print(f"  max |score difference| {np.abs(reference - scores).max():.2e}")
+
+if __name__ == "__main__":
+    main()
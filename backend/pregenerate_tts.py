@@ -0,0 +1,33 @@
+import sys
+import json
+import asyncio
+from dotenv import load_dotenv
+
+# Deploy-time warm-up of the TTS audio cache.
+# Usage (from backend/): python pregenerate_tts.py [phrases.json]
+# phrases.json maps language codes to lists of texts, e.g. {"hi-IN": ["..."]};
+# without it the built-in sarvam.COMMON_PHRASES are used. The server only serves the
+# audio when it runs with the same TTS_CACHE_DIR (the Dockerfile bakes it into the image).
+
+load_dotenv()
+
+from app import sarvam
+
+async def main():
+    if not sarvam.get_api_key():
+        print("TTS pregenerate skipped: SARVAM_AI_API_KEY is not set.")
+        return
+    print(f"TTS pregenerate into {sarvam.tts_cache.directory}")
+    phrases = None
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], encoding="utf-8") as f:
+            phrases = json.load(f)
+    try:
+        counts = await sarvam.pregenerate(phrases)
+    finally:
+        await sarvam.close_client()
+    print(f"TTS pregenerate: {counts}")
+    print(f"TTS cache: {sarvam.tts_cache.stats()}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
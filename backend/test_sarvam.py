@@ -0,0 +1,114 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import base64
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import httpx
+import pytest
+
+# Sarvam client tests against a local stub server.
+# Usage (from backend/): python -m pytest test_sarvam.py
+# The stub answers /speech-to-text and /text-to-speech like api.sarvam.ai;
+# a "fail" or "slow" marker in the request selects the error and timeout paths.
+
+os.environ["TTS_CACHE_DIR"] = tempfile.mkdtemp(prefix="sarvam_test_tts_")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from app import sarvam
+
+AUDIO = b"RIFF-fake-wav"
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is observable
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.requests.append((self.path, self.headers.get("api-subscription-key"), body))
+        if b"slow" in body:
+            time.sleep(1.0)
+        if b"fail" in body:
+            return self._reply(500, {"error": "stub failure"})
+        if self.path == "/speech-to-text":
+            return self._reply(200, {"transcript": "namaste", "language_code": "hi-IN"})
+        if self.path == "/text-to-speech":
+            return self._reply(200, {"audios": [base64.b64encode(AUDIO).decode("ascii")]})
+        self._reply(404, {"error": "not found"})
+
+    def _reply(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def stub(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    # Set after import on purpose: settings must be read when used, not at import
+    monkeypatch.setenv("SARVAM_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}/")
+    monkeypatch.setenv("SARVAM_AI_API_KEY", "stub-key")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def run(coro):
+    async def with_client():
+        try:
+            return await coro
+        finally:
+            await sarvam.close_client()  # the pooled client is bound to this event loop
+    return asyncio.run(with_client())
+
+async def stt(audio):
+    response = await sarvam.post(
+        sarvam.endpoint("speech-to-text"),
+        headers={"api-subscription-key": sarvam.get_api_key()},
+        files={"file": ("audio.webm", audio, "audio/webm")},
+        data={"model": "saaras:v3"},
+    )
+    if response.status_code != 200:
+        raise sarvam.SarvamError(response.status_code, response.text)
+    return response.json()
+
+def test_stt_and_tts_share_one_connection(stub):
+    async def scenario():
+        transcript = await stt(b"audio-bytes")
+        audio = await sarvam.text_to_speech("namaste duniya", "hi-IN")
+        return transcript, audio, sarvam.pool_stats()
+
+    transcript, audio, stats = run(scenario())
+    assert transcript == {"transcript": "namaste", "language_code": "hi-IN"}
+    assert base64.b64decode(audio) == AUDIO
+    assert [path for path, _, _ in stub.requests] == ["/speech-to-text", "/text-to-speech"]
+    assert all(key == "stub-key" for _, key, _ in stub.requests)
+    assert stats["open_connections"] == 1
+
+def test_tts_is_served_from_cache_on_repeat(stub):
+    first = run(sarvam.text_to_speech("dobara bolo", "hi-IN"))
+    second = run(sarvam.text_to_speech("dobara bolo", "hi-IN"))
+    assert first == second
+    assert len(stub.requests) == 1
+
+def test_error_status_raises_sarvam_error(stub):
+    with pytest.raises(sarvam.SarvamError) as error:
+        run(stt(b"fail"))
+    assert error.value.status_code == 500
+    with pytest.raises(sarvam.SarvamError):
+        run(sarvam.text_to_speech("fail", "en-IN"))
+
+def test_read_timeout(stub, monkeypatch):
+    monkeypatch.setenv("SARVAM_READ_TIMEOUT", "0.2")
+    errors = sarvam.pool_stats()["errors"]
+    with pytest.raises(httpx.ReadTimeout):
+        run(sarvam.text_to_speech("slow", "en-IN"))
+    assert sarvam.pool_stats()["errors"] == errors + 1
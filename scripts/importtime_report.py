@@ -0,0 +1,70 @@
+import os
+import sys
+import argparse
+import subprocess
+from collections import defaultdict
+
+# Cold-start report: imports a module under `python -X importtime` and
+# summarizes where the time goes, so import-time regressions are caught.
+# Usage (from the repo root):
+#   python scripts/importtime_report.py                  # api.index
+#   python scripts/importtime_report.py app.main --cwd backend
+#   python scripts/importtime_report.py --max-ms 2500    # exit 1 if slower
+# Times vary run to run; the median of --runs imports is reported.
+
+def run_importtime(module, cwd):
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    env.setdefault("GEMINI_API_KEY", "importtime-report")
+    env.setdefault("GROQ_API_KEY", "importtime-report")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        sys.exit(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # header line
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+def summarize(entries, module):
+    total_us = next((cumulative for name, _, cumulative, _ in entries if name == module), 0)
+    by_package = defaultdict(int)
+    for name, self_us, _, _ in entries:
+        by_package[name.split(".")[0]] += self_us
+    direct = [(name, cumulative) for name, _, cumulative, depth in entries if depth == 1]
+    return total_us, by_package, direct
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("module", nargs="?", default="api.index")
+    parser.add_argument("--cwd", default=".")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--max-ms", type=float, help="fail if the median import time exceeds this")
+    args = parser.parse_args()
+
+    runs = sorted((summarize(run_importtime(args.module, args.cwd), args.module) for _ in range(args.runs)),
+                  key=lambda summary: summary[0])
+    total_us, by_package, direct = runs[len(runs) // 2]
+
+    print(f"import {args.module}: {total_us / 1000:.0f} ms (median of {args.runs})")
+    print("\nDirect imports by cumulative time:")
+    for name, cumulative in sorted(direct, key=lambda item: -item[1])[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+    print("\nTop-level packages by self time:")
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {package}")
+
+    if args.max_ms is not None and total_us / 1000 > args.max_ms:
+        print(f"\nFAIL: {total_us / 1000:.0f} ms exceeds the {args.max_ms:.0f} ms budget")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
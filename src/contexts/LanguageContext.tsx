@@ -1,6 +1,6 @@
 "use client";
 
-import React, { createContext, useContext, useState, useEffect, ReactNode } from 'react';
+import React, { createContext, useContext, useState, useEffect, useCallback, useRef, ReactNode } from 'react';
 
 type LanguageContextType = {
     currentLanguage: string;
@@ -26,9 +26,37 @@ export const INDIAN_LANGUAGES = [
     { code: 'as', name: 'Assamese (অসমীয়া)' },
 ];
 
+// Strings requested within this window are sent to /translate-batch together,
+// so a page of <T> components costs one request instead of one per string.
+const BATCH_WINDOW_MS = 20;
+const BATCH_MAX_TEXTS = 200;
+
+type PendingTranslation = { resolve: (translated: string) => void };
+
+const API_URL =
+    process.env.NODE_ENV === "development"
+        ? "http://localhost:8000"
+        : (process.env.NEXT_PUBLIC_API_URL ?? "");
+
+// Per-string Next.js route (Groq), used only when the batch endpoint is unreachable
+async function translateOne(text: string, lang: string): Promise<string> {
+    const res = await fetch('/api/translate', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ text, target_language: lang })
+    });
+    if (!res.ok) throw new Error('Translation failed');
+    const data = await res.json();
+    return data.translated_text || text;
+}
+
 export function LanguageProvider({ children }: { children: ReactNode }) {
     const [currentLanguage, setCurrentLanguage] = useState('en');
-    const [translationCache, setTranslationCache] = useState<Record<string, Record<string, string>>>({});
+    // lang -> text -> translation; a ref, so filling it does not re-render every consumer
+    const translationCache = useRef<Record<string, Record<string, string>>>({});
+    // lang -> text -> callers waiting for the next batch
+    const pending = useRef<Record<string, Map<string, PendingTranslation[]>>>({});
+    const flushTimers = useRef<Record<string, ReturnType<typeof setTimeout>>>({});
 
     useEffect(() => {
         const saved = localStorage.getItem('satya_lang');
@@ -40,47 +68,63 @@ export function LanguageProvider({ children }: { children: ReactNode }) {
         localStorage.setItem('satya_lang', lang);
     };
 
-    const translateNow = async (text: string): Promise<string> => {
-        if (currentLanguage === 'en') return text;
-
-        // Check cache
-        if (translationCache[currentLanguage]?.[text]) {
-            return translationCache[currentLanguage][text];
-        }
+    const flush = useCallback(async (lang: string) => {
+        delete flushTimers.current[lang];
+        const batch = pending.current[lang];
+        delete pending.current[lang];
+        if (!batch || batch.size === 0) return;
 
+        const texts = Array.from(batch.keys());
+        let translations: string[];
         try {
-            // Use the Next.js API route (Groq-powered) — works in both dev and production
-            const res = await fetch('/api/translate', {
+            // Served from the server's translation memory; only unseen strings reach the LLM
+            const res = await fetch(`${API_URL}/translate-batch`, {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ text, target_language: currentLanguage })
+                body: JSON.stringify({ texts, target_language: lang })
             });
+            if (!res.ok) throw new Error(`Batch translation failed (${res.status})`);
+            translations = (await res.json()).translations;
+            if (!Array.isArray(translations) || translations.length !== texts.length) {
+                throw new Error('Batch translation returned a mismatched result');
+            }
+        } catch (e) {
+            console.error("Batch translation failed, falling back to per-string translation", e);
+            translations = await Promise.all(texts.map(text => translateOne(text, lang).catch(() => text)));
+        }
 
-            if (!res.ok) throw new Error('Translation failed');
+        const cache = (translationCache.current[lang] ??= {});
+        texts.forEach((text, i) => {
+            const translated = translations[i] ?? text;
+            if (translated !== text) cache[text] = translated;
+            batch.get(text)?.forEach(waiter => waiter.resolve(translated));
+        });
+    }, []);
 
-            const data = await res.json();
-            const translated = data.translated_text;
+    const translateNow = useCallback((text: string): Promise<string> => {
+        const lang = currentLanguage;
+        if (lang === 'en' || !text.trim()) return Promise.resolve(text);
 
-            // Update cache
-            setTranslationCache(prev => ({
-                ...prev,
-                [currentLanguage]: {
-                    ...(prev[currentLanguage] || {}),
-                    [text]: translated
-                }
-            }));
+        const cached = translationCache.current[lang]?.[text];
+        if (cached !== undefined) return Promise.resolve(cached);
 
-            return translated;
-        } catch (e) {
-            console.error("Translation failed", e);
-            return text;
-        }
-    };
+        return new Promise<string>(resolve => {
+            const batch = (pending.current[lang] ??= new Map());
+            const waiters = batch.get(text);
+            if (waiters) waiters.push({ resolve });
+            else batch.set(text, [{ resolve }]);
+
+            if (batch.size >= BATCH_MAX_TEXTS) {
+                clearTimeout(flushTimers.current[lang]);
+                flush(lang);
+            } else if (!flushTimers.current[lang]) {
+                flushTimers.current[lang] = setTimeout(() => flush(lang), BATCH_WINDOW_MS);
+            }
+        });
+    }, [currentLanguage, flush]);
 
     // 't' can be used for async translation in effects, but for immediate rendering verify use
-    const t = async (text: string) => {
-        return await translateNow(text);
-    };
+    const t = useCallback((text: string) => translateNow(text), [translateNow]);
 
     return (
         <LanguageContext.Provider value={{ currentLanguage, setLanguage, t, translateNow }}>
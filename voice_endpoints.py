@@ -1,6 +1,5 @@
 import base64
-import os
-import httpx
+from contextlib import asynccontextmanager
 from typing import List, Optional
 from pydantic import BaseModel
 from fastapi import FastAPI, UploadFile, File, Form
@@ -10,12 +9,16 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-app = FastAPI()
+from api import sarvam
 
-# Configure Sarvam AI
-SARVAM_API_KEY = os.getenv("SARVAM_AI_API_KEY")
-SARVAM_STT_URL = "https://api.sarvam.ai/speech-to-text"
-SARVAM_TTS_URL = "https://api.sarvam.ai/text-to-speech"
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await sarvam.close_client()
+
+app = FastAPI(lifespan=lifespan)
+
+# Sarvam AI: requests go through the pooled client in api/sarvam.py, which reads SARVAM_AI_API_KEY per call
 
 # Voice Models Configuration (Gemini)
 voice_model = genai.GenerativeModel(
@@ -57,31 +60,30 @@ async def voice_chat(request: VoiceChatRequest):
     Complete voice interaction: Sarvam STT -> Gemini Response -> Sarvam TTS
     """
     try:
-        if not SARVAM_API_KEY:
+        if not sarvam.get_api_key():
             return JSONResponse({"error": "Sarvam API Key not configured"}, status_code=500)
 
         # 1. Speech-to-Text via Sarvam AI
         audio_content = base64.b64decode(request.audio_base64)
         
-        async with httpx.AsyncClient() as client:
-            # Sarvam STT takes multipart/form-data
-            files = {"file": ("audio.webm", audio_content, "audio/webm")}
-            headers = {"api-subscription-key": SARVAM_API_KEY}
-            
-            stt_response = await client.post(
-                SARVAM_STT_URL,
-                headers=headers,
-                files=files,
-                data={"model": "saaras:v1"}
-            )
-            
-            if stt_response.status_code != 200:
-                print(f"Sarvam STT Error: {stt_response.text}")
-                return JSONResponse({"error": "Speech-to-Text failed"}, status_code=500)
-            
-            stt_data = stt_response.json()
-            detected_text = stt_data.get("transcript", "")
-            detected_lang = stt_data.get("language_code", "en-IN") # Sarvam returns language code
+        # Sarvam STT takes multipart/form-data
+        files = {"file": ("audio.webm", audio_content, "audio/webm")}
+        headers = {"api-subscription-key": sarvam.get_api_key()}
+        
+        stt_response = await sarvam.post(
+            sarvam.endpoint("speech-to-text"),
+            headers=headers,
+            files=files,
+            data={"model": "saaras:v1"}
+        )
+        
+        if stt_response.status_code != 200:
+            print(f"Sarvam STT Error: {stt_response.text}")
+            return JSONResponse({"error": "Speech-to-Text failed"}, status_code=500)
+        
+        stt_data = stt_response.json()
+        detected_text = stt_data.get("transcript", "")
+        detected_lang = stt_data.get("language_code", "en-IN") # Sarvam returns language code
 
         if not detected_text:
             return JSONResponse({"error": "No speech detected"}, status_code=400)
@@ -95,39 +97,18 @@ async def voice_chat(request: VoiceChatRequest):
             conversation_context += f"{role}: {msg.get('content', '')}\n"
         
         prompt = f"{conversation_context}\nUser ({detected_lang}): {detected_text}\nAssistant:"
-        ai_response = voice_model.generate_content(prompt)
+        ai_response = await voice_model.generate_content_async(prompt)
         response_text = ai_response.text.strip()
         
         print(f"AI: {response_text}")
 
         # 3. Text-to-Speech via Sarvam AI (Bulbul)
-        async with httpx.AsyncClient() as client:
-            tts_payload = {
-                "inputs": [response_text],
-                "target_language_code": detected_lang,
-                "speaker": "anushka", # Updated to a valid speaker
-                "model": "bulbul:v2"   # Updated to a valid model
-            }
-            
-            headers = {
-                "api-subscription-key": SARVAM_API_KEY,
-                "Content-Type": "application/json"
-            }
-            
-            tts_response = await client.post(
-                SARVAM_TTS_URL,
-                headers=headers,
-                json=tts_payload
-            )
-            
-            if tts_response.status_code != 200:
-                print(f"Sarvam TTS Error: {tts_response.text}")
-                # Fallback or error
-                return JSONResponse({"error": "Text-to-Speech failed"}, status_code=500)
-            
-            tts_data = tts_response.json()
-            # Sarvam returns an array of audios for each input string
-            audio_base64 = tts_data.get("audios", [""])[0]
+        try:
+            audio_base64 = await sarvam.text_to_speech(response_text, detected_lang)
+        except sarvam.SarvamError as e:
+            print(f"Sarvam TTS Error: {e.text}")
+            # Fallback or error
+            return JSONResponse({"error": "Text-to-Speech failed"}, status_code=500)
 
         return VoiceChatResponse(
             text_query=detected_text,